@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.core.rate_limiter import get_rate_limit_config, limiter
+from app.core.security import require_admin_key
+from app.schemas.response import StandardResponse
+from app.services.ai_planning_service import aiPlanningService
+
+# Routes d'administration (en-tête X-API-Key = ADMIN_API_KEY)
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Administration"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+@router.delete("/tournament/{tournament_id}/plannings", response_model=StandardResponse)
+@limiter.limit(get_rate_limit_config()["strict"])
+async def purge_tournament_plannings(request: Request, tournament_id: str):
+    """Supprime tous les plannings d'un tournoi (matchs et poules compris)"""
+    planningIds = aiPlanningService.purgeTournamentPlannings(tournament_id)
+
+    if planningIds is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur interne lors de la suppression des plannings",
+        )
+
+    return StandardResponse(
+        success=True,
+        message=f"{len(planningIds)} planning(s) supprimé(s)",
+        data={"tournament_id": tournament_id, "deleted_planning_ids": planningIds},
+    )
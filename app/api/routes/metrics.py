@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.core.database import getConnectionMetrics
+from app.core.metrics import metrics
+from app.core.rate_limiter import get_rate_limit_config, limiter
+from app.core.security import require_admin_key
+from app.schemas.response import StandardResponse
+
+# Métriques internes: mêmes accès que les routes d'administration (X-API-Key)
+router = APIRouter(
+    prefix="/api/metrics",
+    tags=["Monitoring"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+@router.get("", response_model=StandardResponse)
+@limiter.limit(get_rate_limit_config()["default"])
+async def get_metrics(request: Request):
+    """Métriques du processus (pool Supabase et compteurs internes)"""
+    return StandardResponse(
+        success=True,
+        message="Métriques récupérées avec succès",
+        data={"supabase": getConnectionMetrics(), "counters": metrics.snapshot()},
+    )
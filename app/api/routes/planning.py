@@ -1,14 +1,146 @@
-from fastapi import APIRouter, HTTPException, Request, status
+import asyncio
+from typing import Callable, List, Optional
 
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from app.core.compression import (
+    cached_compressed_response,
+    compressed_response,
+    encoded_etag,
+    negotiate_encoding,
+)
+from app.core.config import settings
+from app.core.http_cache import (
+    etag_matches,
+    not_modified_response,
+    planning_cache_headers,
+)
+from app.core.pagination import InvalidCursorError, decode_cursor
 from app.core.rate_limiter import get_rate_limit_config, limiter
-from app.schemas.requete import GeneratePlanningRequest
-from app.schemas.response import PlanningResponse, StatusResponse
+from app.core.responses import ndjson_line, planning_payload, planning_response
+from app.schemas.requete import (
+    BatchStatusRequest,
+    BulkGeneratePlanningRequest,
+    GeneratePlanningRequest,
+)
+from app.schemas.response import (
+    BatchStatusResponse,
+    MatchesPageResponse,
+    PlanningResponse,
+    StatusResponse,
+)
 from app.services.ai_planning_service import aiPlanningService
 from app.services.database_service import databaseService
+from app.services.live_feed_service import tournamentFeedHub
 
 # Router avec préfixe et tags
 router = APIRouter(prefix="/api/planning", tags=["AI Planning"])
 
+FIELDS_DESCRIPTION = (
+    "Colonnes à retourner, séparées par des virgules "
+    "(ex: status,total_matches,start_time,end_time)"
+)
+
+
+# Colonnes qu'un client peut demander avec fields= (les colonnes de stockage,
+# comme planning_data_compressed, n'en font pas partie)
+PUBLIC_PLANNING_FIELDS = (
+    "id",
+    "tournament_id",
+    "type_tournoi",
+    "status",
+    "planning_data",
+    "total_matches",
+    "start_time",
+    "end_time",
+    "ai_comments",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Valide le paramètre fields= (sparse fieldset) d'une lecture de planning"""
+    if not fields:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [f for f in requested if f not in PUBLIC_PLANNING_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Champs inconnus: {', '.join(unknown)}",
+        )
+    return requested or None
+
+
+def _cached_planning_response(
+    request: Request,
+    encoding: Optional[str],
+    selected_fields: Optional[List[str]],
+    get_version: Callable[[], Optional[dict]],
+) -> Optional[Response]:
+    """
+    Réponse servie sans charger planning_data: 304 si l'ETag du client est à jour,
+    ou corps compressé déjà en cache pour cette version du planning
+
+    Returns:
+        Response ou None s'il faut charger le planning
+    """
+    if_none_match = request.headers.get("if-none-match")
+    use_compressed_cache = encoding is not None and not selected_fields
+    if not if_none_match and not use_compressed_cache:
+        return None
+
+    # Lecture de version (id + updated_at) depuis le cache ou sans planning_data
+    version = get_version()
+    if not version:
+        return None
+
+    headers = planning_cache_headers(version)
+    etag = headers["ETag"]
+    if etag_matches(if_none_match, etag):
+        if encoding and encoded_etag(etag, encoding) in if_none_match:
+            return not_modified_response(encoded_etag(etag, encoding))
+        return not_modified_response(etag)
+
+    if use_compressed_cache:
+        return cached_compressed_response(etag, encoding, headers)
+    return None
+
+
+def _send_planning(
+    request: Request,
+    message: str,
+    planning,
+    status_code: int = status.HTTP_200_OK,
+    with_etag: bool = False,
+    cache_body: bool = False,
+) -> Response:
+    """
+    Encode un planning (orjson), puis le compresse selon Accept-Encoding
+
+    Args:
+        with_etag: Ajoute les en-têtes ETag et Cache-Control
+        cache_body: Garde le corps compressé en cache, par version du planning
+            (uniquement pour une représentation complète)
+    """
+    headers = planning_cache_headers(planning) if with_etag else None
+    response = planning_response(message, planning, status_code, headers=headers)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    cache_key = headers["ETag"] if with_etag and cache_body else None
+    return compressed_response(response, encoding, cache_key=cache_key)
+
 
 @router.post(
     "/generate", response_model=PlanningResponse, status_code=status.HTTP_201_CREATED
@@ -19,8 +151,11 @@ async def generate_planning(
 ):
     """Génère un planning IA pour un tournoi"""
     try:
-        # Appel du service AI Planning
-        planning = aiPlanningService.generatePlanning(planning_request.tournament_id)
+        # Appel du service AI Planning (accès Supabase asynchrones: la boucle
+        # reste libre pendant les lectures, l'appel OpenAI et la sauvegarde)
+        planning = await aiPlanningService.generatePlanningAsync(
+            planning_request.tournament_id
+        )
 
         if not planning:
             raise HTTPException(
@@ -28,8 +163,11 @@ async def generate_planning(
                 detail="Impossible de générer le planning. Vérifiez les données du tournoi.",
             )
 
-        return PlanningResponse(
-            success=True, message="Planning généré avec succès", data=planning
+        return _send_planning(
+            request,
+            "Planning généré avec succès",
+            planning,
+            status_code=status.HTTP_201_CREATED,
         )
 
     except HTTPException:
@@ -42,13 +180,81 @@ async def generate_planning(
         )
 
 
+@router.post(
+    "/generate:bulk",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+@limiter.limit(get_rate_limit_config()["strict"])
+async def generate_plannings_bulk(
+    request: Request, bulk_request: BulkGeneratePlanningRequest
+):
+    """
+    Génère les plannings de plusieurs tournois
+
+    Les résultats sont renvoyés en NDJSON (une ligne par tournoi),
+    au fur et à mesure de la fin de chaque génération.
+    """
+    # Dédoublonnage en conservant l'ordre
+    tournament_ids = list(dict.fromkeys(bulk_request.tournament_ids))
+
+    async def stream_results():
+        async for tournament_id, planning in aiPlanningService.generatePlannings(
+            tournament_ids, concurrency=settings.BULK_GENERATION_CONCURRENCY
+        ):
+            if planning:
+                yield ndjson_line(
+                    {
+                        "tournament_id": tournament_id,
+                        "success": True,
+                        "message": "Planning généré avec succès",
+                        "data": planning_payload(planning),
+                    }
+                )
+            else:
+                yield ndjson_line(
+                    {
+                        "tournament_id": tournament_id,
+                        "success": False,
+                        "message": "Impossible de générer le planning. Vérifiez les données du tournoi.",
+                        "data": None,
+                    }
+                )
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.get("/{planning_id}/status", response_model=StatusResponse)
 @limiter.limit(get_rate_limit_config()["default"])
-async def get_planning_status(request: Request, planning_id: str):
-    """Récupère le statut d'un planning"""
+async def get_planning_status(
+    request: Request,
+    planning_id: str,
+    wait: Optional[str] = Query(
+        None,
+        description="Statut connu du client: la réponse attend que le statut change",
+    ),
+    timeout: float = Query(
+        settings.STATUS_WAIT_DEFAULT_TIMEOUT,
+        gt=0,
+        le=settings.STATUS_WAIT_MAX_TIMEOUT,
+        description="Durée maximale d'attente en secondes (avec wait=)",
+    ),
+):
+    """
+    Récupère le statut d'un planning
+
+    Avec wait=<statut>, la requête est retenue (long polling) jusqu'à ce que le
+    statut diffère de celui fourni, ou jusqu'au timeout: le statut inchangé est
+    alors renvoyé.
+    """
     try:
         # Appel du service
-        status_value = aiPlanningService.getPlanningStatus(planning_id)
+        if wait is not None:
+            status_value = await aiPlanningService.waitForStatusChange(
+                planning_id, wait, timeout
+            )
+        else:
+            status_value = aiPlanningService.getPlanningStatus(planning_id)
 
         if status_value is None:
             raise HTTPException(
@@ -71,13 +277,35 @@ async def get_planning_status(request: Request, planning_id: str):
         )
 
 
+@router.post("/status/batch", response_model=BatchStatusResponse)
+@limiter.limit(get_rate_limit_config()["default"])
+async def get_planning_statuses(request: Request, status_request: BatchStatusRequest):
+    """Récupère le statut de plusieurs plannings en une seule requête"""
+    try:
+        statuses = aiPlanningService.getPlanningStatuses(status_request.planning_ids)
+
+        if statuses is None:
+            raise Exception("Erreur lors de la lecture des statuts")
+
+        return BatchStatusResponse(
+            success=True, message="Statuts récupérés avec succès", data=statuses
+        )
+
+    except Exception as e:
+        print(f"❌ Erreur récupération statuts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur interne lors de la récupération des statuts",
+        )
+
+
 @router.post("/{planning_id}/regenerate", response_model=PlanningResponse)
 @limiter.limit(get_rate_limit_config()["strict"])
 async def regenerate_planning(request: Request, planning_id: str):
     """Régénère un planning existant"""
     try:
-        # Appel du service
-        new_planning = aiPlanningService.regeneratePlanning(planning_id)
+        # Accès Supabase asynchrones: la boucle d'événements n'est pas bloquée
+        new_planning = await aiPlanningService.regeneratePlanningAsync(planning_id)
 
         if not new_planning:
             raise HTTPException(
@@ -85,9 +313,7 @@ async def regenerate_planning(request: Request, planning_id: str):
                 detail="Planning original non trouvé ou erreur lors de la régénération",
             )
 
-        return PlanningResponse(
-            success=True, message="Planning régénéré avec succès", data=new_planning
-        )
+        return _send_planning(request, "Planning régénéré avec succès", new_planning)
 
     except HTTPException:
         raise
@@ -99,13 +325,83 @@ async def regenerate_planning(request: Request, planning_id: str):
         )
 
 
+@router.get("/{planning_id}/matches", response_model=MatchesPageResponse)
+@limiter.limit(get_rate_limit_config()["default"])
+async def get_planning_matches(
+    request: Request,
+    planning_id: str,
+    limit: int = Query(50, ge=1, le=200, description="Taille de la page"),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante"),
+    phase: Optional[str] = Query(None, description="Phase du match"),
+    terrain: Optional[int] = Query(None, ge=1, description="Numéro de terrain"),
+    poule_id: Optional[str] = Query(None, description="ID de la poule"),
+    team: Optional[str] = Query(None, description="ID ou nom d'équipe"),
+):
+    """Liste paginée des matchs d'un planning"""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        page = databaseService.getMatchesPage(
+            planning_id,
+            limit=limit,
+            after=after,
+            phase=phase,
+            terrain=terrain,
+            pouleId=poule_id,
+            team=team,
+        )
+
+        if page is None:
+            raise Exception("Erreur lors de la lecture des matchs")
+
+        # Une première page vide peut signifier que le planning n'existe pas
+        if not page["items"] and after is None:
+            if not databaseService.getPlanningVersionByPlanningId(planning_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Planning non trouvé",
+                )
+
+        return MatchesPageResponse(
+            success=True, message="Matchs récupérés avec succès", data=page
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Erreur récupération matchs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur interne lors de la récupération des matchs",
+        )
+
+
 @router.get("/{planning_id}", response_model=PlanningResponse)
 @limiter.limit(get_rate_limit_config()["default"])
-async def get_planning_by_id(request: Request, planning_id: str):
-    """Récupère un planning complet par son ID"""
+async def get_planning_by_id(
+    request: Request,
+    planning_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Récupère un planning complet (ou les colonnes demandées) par son ID"""
+    selected_fields = _parse_fields(fields)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
     try:
+        # 304 ou corps compressé en cache, sans charger planning_data
+        cached = _cached_planning_response(
+            request,
+            encoding,
+            selected_fields,
+            lambda: databaseService.getPlanningVersionByPlanningId(planning_id),
+        )
+        if cached:
+            return cached
+
         planning_details = databaseService.getPlanningWithDetailsByPlanningId(
-            planning_id
+            planning_id, fields=selected_fields
         )
 
         if not planning_details:
@@ -113,8 +409,12 @@ async def get_planning_by_id(request: Request, planning_id: str):
                 status_code=status.HTTP_404_NOT_FOUND, detail="Planning non trouvé"
             )
 
-        return PlanningResponse(
-            success=True, message="Planning récupéré avec succès", data=planning_details
+        return _send_planning(
+            request,
+            "Planning récupéré avec succès",
+            planning_details,
+            with_etag=True,
+            cache_body=not selected_fields,
         )
 
     except HTTPException:
@@ -129,12 +429,28 @@ async def get_planning_by_id(request: Request, planning_id: str):
 
 @router.get("/tournament/{tournament_id}", response_model=PlanningResponse)
 @limiter.limit(get_rate_limit_config()["default"])
-async def get_planning_by_tournament_id(request: Request, tournament_id: str):
-    """Récupère un planning complet par l'ID du tournoi"""
+async def get_planning_by_tournament_id(
+    request: Request,
+    tournament_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Récupère un planning complet (ou les colonnes demandées) par l'ID du tournoi"""
+    selected_fields = _parse_fields(fields)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
     try:
+        # 304 ou corps compressé en cache, sans charger planning_data
+        cached = _cached_planning_response(
+            request,
+            encoding,
+            selected_fields,
+            lambda: databaseService.getPlanningVersionByTournamentId(tournament_id),
+        )
+        if cached:
+            return cached
+
         # Appel du service
         planning_details = databaseService.getPlanningWithDetailsByTournamentId(
-            tournament_id
+            tournament_id, fields=selected_fields
         )
 
         if not planning_details:
@@ -142,12 +458,69 @@ async def get_planning_by_tournament_id(request: Request, tournament_id: str):
                 status_code=status.HTTP_404_NOT_FOUND, detail="Planning non trouvé"
             )
 
-        return PlanningResponse(
-            success=True, message="Planning récupéré avec succès", data=planning_details
+        return _send_planning(
+            request,
+            "Planning récupéré avec succès",
+            planning_details,
+            with_etag=True,
+            cache_body=not selected_fields,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Erreur récupération planning: {tournament_id} {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erreur interne lors de la récupération du planning",
         )
+
+
+@router.websocket("/tournament/{tournament_id}/live")
+async def planning_live_feed(websocket: WebSocket, tournament_id: str):
+    """
+    Planning d'un tournoi en direct
+
+    Envoie un snapshot complet à la connexion, puis uniquement les différences
+    (statut, matchs, équipes résolues) à chaque modification du planning.
+    """
+    await websocket.accept()
+    try:
+        queue = await tournamentFeedHub.subscribe(tournament_id)
+    except Exception:
+        # Erreur déjà journalisée par le hub
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    async def forward_messages():
+        while True:
+            await websocket.send_text(await queue.get())
+
+    async def wait_disconnect():
+        # Les messages du client sont ignorés: on attend seulement la déconnexion
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    def report_sender_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            print(
+                f"❌ Erreur envoi du direct du tournoi {tournament_id}: "
+                f"{task.exception()}"
+            )
+
+    sender = asyncio.create_task(forward_messages())
+    sender.add_done_callback(report_sender_error)
+    receiver = asyncio.create_task(wait_disconnect())
+    try:
+        done, _ = await asyncio.wait(
+            {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if receiver not in done:
+            # Envoi en échec, client toujours connecté: on lui signale la fin du direct
+            try:
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            except Exception:
+                pass  # connexion déjà fermée
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        tournamentFeedHub.unsubscribe(tournament_id, queue)
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Sequence, TypeVar
+
+import httpx
+from postgrest.exceptions import APIError
+
+T = TypeVar("T")
+
+# Classes d'erreurs Postgres déterministes: relancer la requête ne sert à rien
+# (22: donnée invalide, 23: contrainte d'intégrité, 42: syntaxe/droits)
+NON_RETRYABLE_SQLSTATE_CLASSES = ("22", "23", "42")
+
+
+def chunked(items: Sequence[T], size: int) -> List[List[T]]:
+    """Découpe items en lots consécutifs d'au plus size éléments"""
+    return [list(items[start : start + size]) for start in range(0, len(items), size)]
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Indique si une requête PostgREST en échec peut être relancée
+
+    Les erreurs réseau et les timeouts sont transitoires; les erreurs de
+    données ou de contraintes renvoyées par Postgres ne le sont pas.
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, APIError):
+        code = str(error.code or "")
+        if len(code) == 3 and code.isdigit():
+            # Réponse sans erreur PostgREST lisible: code HTTP (passerelle, ...)
+            return int(code) >= 500
+        return not code.startswith(NON_RETRYABLE_SQLSTATE_CLASSES)
+    return False
+
+
+def call_with_retry(fn: Callable[[], T], retries: int, delay: float) -> T:
+    """
+    Appelle fn, avec jusqu'à retries nouvelles tentatives en cas d'erreur
+    transitoire (attente delay, doublée à chaque tentative)
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            print(f"⚠️ Tentative {attempt + 1} échouée, nouvel essai: {e}")
+            time.sleep(delay * 2**attempt)
+
+
+async def async_call_with_retry(
+    fn: Callable[[], Awaitable[T]], retries: int, delay: float
+) -> T:
+    """Variante asynchrone de call_with_retry"""
+    for attempt in range(retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            print(f"⚠️ Tentative {attempt + 1} échouée, nouvel essai: {e}")
+            await asyncio.sleep(delay * 2**attempt)
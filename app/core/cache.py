@@ -0,0 +1,299 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from app.core.metrics import metrics
+
+# Sentinelle pour distinguer "absent du cache" d'une valeur None mise en cache
+MISSING = object()
+
+# Registre de tous les caches créés (utilisé pour les vider en bloc)
+_registry: List[Any] = []
+
+
+class TTLCache:
+    """
+    Cache mémoire thread-safe, borné en taille (LRU) avec expiration (TTL)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        """
+        Args:
+            maxsize: Nombre maximum d'entrées (les moins récemment utilisées sont évincées)
+            ttl: Durée de vie par défaut d'une entrée en secondes (None = pas d'expiration)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Retourne la valeur associée à la clé, ou default si absente/expirée"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Retourne les entrées présentes pour les clés demandées"""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not MISSING:
+                found[key] = value
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = MISSING) -> None:
+        """Ajoute ou remplace une entrée"""
+        ttl = self.ttl if ttl is MISSING else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Supprime une entrée si elle existe"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Supprime toutes les entrées dont la clé satisfait le prédicat"""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Vide le cache"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Cache partagé entre les processus d'une machine (fichier SQLite local)
+
+    Sert de second niveau derrière les TTLCache de chaque worker: une écriture
+    ou une invalidation faite par un worker est vue par tous les autres.
+    Les valeurs sont sérialisées en JSON. Des compteurs de génération nommés
+    (table generation) permettent aux workers de savoir si leur premier
+    niveau est encore valable (voir TwoTierCache).
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 300.0):
+        """
+        Args:
+            path: Fichier SQLite (créé s'il n'existe pas)
+            ttl: Durée de vie par défaut d'une entrée en secondes (None = pas d'expiration)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        db = self._connection()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS generation "
+            "(name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        _registry.append(self)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion propre au thread courant (autocommit)"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            self._local.db = db
+        return db
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """Retourne la valeur associée à la clé, ou default si absente/expirée"""
+        row = (
+            self._connection()
+            .execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            return default
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return default
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = MISSING) -> None:
+        """Ajoute ou remplace une entrée"""
+        ttl = self.ttl if ttl is MISSING else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), expires_at),
+        )
+
+    def delete(self, key: str) -> None:
+        """Supprime une entrée si elle existe"""
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def generation(self, name: str) -> int:
+        """Valeur courante du compteur de génération name (0 s'il n'existe pas)"""
+        row = (
+            self._connection()
+            .execute("SELECT value FROM generation WHERE name = ?", (name,))
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def bump_generation(self, name: str) -> None:
+        """Incrémente le compteur de génération name (pour tous les processus)"""
+        self._connection().execute(
+            "INSERT INTO generation (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def clear(self) -> None:
+        """Vide le cache (pour tous les processus)"""
+        db = self._connection()
+        db.execute("DELETE FROM cache")
+        db.execute("UPDATE generation SET value = value + 1")
+
+
+class TwoTierCache:
+    """
+    Cache à deux niveaux: TTLCache du processus devant un SQLiteCache
+    partagé (optionnel)
+
+    Une lecture absente du premier niveau est cherchée dans le second puis
+    recopiée dans le premier. Les écritures et suppressions touchent les deux.
+
+    Avec un second niveau, chaque entrée du premier garde la génération
+    partagée (SQLiteCache.generation) lue à son écriture; une suppression
+    l'incrémente. Un succès local n'est servi que si la génération n'a pas
+    changé, sinon l'entrée est relue depuis le second niveau: une
+    invalidation faite par un worker est vue immédiatement par les autres,
+    au prix d'une lecture SQLite indexée par succès local.
+    Sans second niveau, les autres workers gardent leurs entrées jusqu'à
+    expiration du TTL du premier niveau.
+
+    Compteurs: cache.<name>.hits.local, cache.<name>.hits.shared,
+    cache.<name>.misses, cache.<name>.stale (entrées locales d'une génération
+    dépassée)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        local: TTLCache,
+        shared: Optional[SQLiteCache] = None,
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ):
+        """
+        Args:
+            name: Nom du cache (métriques)
+            local: Premier niveau, propre au processus
+            shared: Second niveau partagé (None = premier niveau seul)
+            encode: Valeur -> donnée JSON stockée dans le second niveau
+            decode: Donnée JSON du second niveau -> valeur
+        """
+        self.name = name
+        self.local = local
+        self.shared = shared
+        self._encode = encode
+        self._decode = decode
+
+    def _sharedKey(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return ":".join(str(part) for part in (self.name, *parts))
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Retourne la valeur associée à la clé, ou default si absente des deux niveaux"""
+        if self.shared is None:
+            value = self.local.get(key)
+            if value is not MISSING:
+                metrics.increment(f"cache.{self.name}.hits.local")
+                return value
+            metrics.increment(f"cache.{self.name}.misses")
+            return default
+
+        generation = self.shared.generation(self.name)
+        entry = self.local.get(key)
+        if entry is not MISSING:
+            value, entryGeneration = entry
+            if entryGeneration == generation:
+                metrics.increment(f"cache.{self.name}.hits.local")
+                return value
+            metrics.increment(f"cache.{self.name}.stale")
+            self.local.delete(key)
+
+        stored = self.shared.get(self._sharedKey(key))
+        if stored is not MISSING:
+            metrics.increment(f"cache.{self.name}.hits.shared")
+            value = self._decode(stored)
+            self.local.set(key, (value, generation))
+            return value
+
+        metrics.increment(f"cache.{self.name}.misses")
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = MISSING) -> None:
+        """
+        Ajoute ou remplace une entrée dans les deux niveaux
+
+        ttl s'applique au second niveau; le premier garde au plus sa propre durée.
+        """
+        localTtl = self.local.ttl
+        if ttl is not MISSING and ttl is not None:
+            localTtl = ttl if localTtl is None else min(ttl, localTtl)
+        if self.shared is None:
+            self.local.set(key, value, ttl=localTtl)
+            return
+
+        generation = self.shared.generation(self.name)
+        self.shared.set(self._sharedKey(key), self._encode(value), ttl=ttl)
+        self.local.set(key, (value, generation), ttl=localTtl)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Supprime une entrée des deux niveaux
+
+        Avec un second niveau, la génération partagée est incrémentée: les
+        autres workers relisent leurs entrées locales depuis le second niveau.
+        """
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(self._sharedKey(key))
+            self.shared.bump_generation(self.name)
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+
+def clear_all_caches() -> None:
+    """Vide tous les caches du processus (et les caches SQLite partagés)"""
+    for cache in _registry:
+        cache.clear()
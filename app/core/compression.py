@@ -0,0 +1,136 @@
+import gzip
+from typing import Dict, Hashable, Optional
+
+from fastapi import Response
+
+from app.core.cache import MISSING, TTLCache
+from app.core.config import settings
+
+try:  # Brotli est optionnel (pip install ".[performance]")
+    import brotli
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    brotli = None
+
+# Encodages supportés, par ordre de préférence à qualité égale
+SUPPORTED_ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+# Corps compressés des plannings: (etag, encodage) -> bytes
+# L'ETag dépend de (planning_id, updated_at): une entrée n'est jamais périmée,
+# elle devient simplement inutilisée quand le planning change.
+compressedBodyCache = TTLCache(maxsize=settings.COMPRESSED_CACHE_MAX_ENTRIES, ttl=None)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Choisit l'encodage de compression à partir de l'en-tête Accept-Encoding
+
+    Returns:
+        str: "br", "gzip" ou None si aucun encodage supporté n'est accepté
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compresse un corps de réponse avec l'encodage demandé"""
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    # mtime=0: même entrée, même sortie (utile pour le cache)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag fort propre à une représentation compressée: "abc" -> "abc-gzip" """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def compressed_response(
+    response: Response,
+    encoding: Optional[str],
+    cache_key: Optional[Hashable] = None,
+) -> Response:
+    """
+    Compresse une réponse déjà rendue si elle dépasse le seuil configuré
+
+    Args:
+        response: Réponse dont le corps est déjà encodé en bytes
+        encoding: Encodage négocié (None = pas de compression)
+        cache_key: Clé de cache du corps compressé (None = pas de cache)
+
+    Returns:
+        Response: Réponse compressée, ou la réponse d'origine
+    """
+    if len(response.body) < settings.COMPRESSION_MIN_SIZE:
+        return response
+    if not encoding:
+        # La représentation dépend de Accept-Encoding (caches intermédiaires)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    body = MISSING
+    if cache_key is not None:
+        body = compressedBodyCache.get((cache_key, encoding))
+    if body is MISSING:
+        body = compress_body(response.body, encoding)
+        if cache_key is not None:
+            compressedBodyCache.set((cache_key, encoding), body)
+
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key.lower() != "content-length"
+    }
+    if "etag" in headers:
+        headers["etag"] = encoded_etag(headers["etag"], encoding)
+    return encoded_response(body, encoding, response.status_code, headers)
+
+
+def cached_compressed_response(
+    cache_key: Hashable, encoding: Optional[str], headers: Dict[str, str]
+) -> Optional[Response]:
+    """Réponse construite depuis le cache de corps compressés, ou None"""
+    if not encoding:
+        return None
+
+    body = compressedBodyCache.get((cache_key, encoding))
+    if body is MISSING:
+        return None
+
+    headers = dict(headers)
+    if "ETag" in headers:
+        headers["ETag"] = encoded_etag(headers["ETag"], encoding)
+    return encoded_response(body, encoding, 200, headers)
+
+
+def encoded_response(
+    body: bytes, encoding: str, status_code: int, headers: Dict[str, str]
+) -> Response:
+    """Réponse JSON dont le corps est déjà compressé"""
+    response = Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+    response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
@@ -11,6 +12,12 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_SERVICE_KEY: str  # cle admin
     SUPABASE_KEY: str
+    SUPABASE_POOL_MAX_CONNECTIONS: int = 20  # connexions HTTP simultanées max
+    SUPABASE_POOL_MAX_KEEPALIVE: int = 10  # connexions gardées ouvertes au repos
+    SUPABASE_KEEPALIVE_EXPIRY: float = 30.0  # secondes avant fermeture au repos
+    SUPABASE_TIMEOUT: float = 30.0  # secondes, lecture/écriture
+    SUPABASE_CONNECT_TIMEOUT: float = 5.0  # secondes, établissement de connexion
+    SUPABASE_HTTP2: bool = True
 
     # OPENAI
     OPENAI_API_KEY: str
@@ -20,10 +27,58 @@ class Settings(BaseSettings):
     CORS_ORIGIN: str
     TRUSTED_HOSTS: str = "localhost,127.0.0.1"
     ENVIRONMENT: str = "development"  # development ou production
+    ADMIN_API_KEY: Optional[str] = None  # en-tête X-API-Key des routes /api/admin
 
     # PORT - Support pour Render et autres plateformes cloud
     PORT: int = 8003
 
+    # SERVEUR (production)
+    SERVER_WORKERS: Optional[int] = None  # None = un worker par cœur disponible
+    SERVER_KEEP_ALIVE: int = 75  # secondes, keep-alive HTTP
+    SERVER_BACKLOG: int = 4096  # connexions en attente d'acceptation
+    SERVER_GRACEFUL_TIMEOUT: int = 150  # secondes, > attente max OpenAI (120s)
+
+    # CACHE
+    # Caches mémoire propres à chaque worker: une invalidation faite par un
+    # worker n'atteint pas les autres, qui peuvent servir une valeur périmée
+    # au plus pendant le TTL (ETags, statuts, et plannings complets sans
+    # PLANNING_CACHE_SQLITE_PATH). Avec le cache SQLite partagé, les
+    # plannings complets sont revalidés par génération à chaque lecture.
+    PLANNING_VERSION_CACHE_TTL: float = 5.0  # secondes, cache des ETags
+    STATUS_CACHE_TTL: float = 2.0  # secondes, cache des statuts de planning
+    COMPRESSED_CACHE_MAX_ENTRIES: int = 256  # corps de plannings compressés en cache
+    PLANNING_CACHE_MAX_ENTRIES: int = 256  # plannings complets en cache par worker
+    PLANNING_CACHE_LOCAL_TTL: float = 5.0  # secondes, cache mémoire de chaque worker
+    PLANNING_CACHE_SHARED_TTL: float = 300.0  # secondes, cache SQLite partagé
+    PLANNING_CACHE_NEGATIVE_TTL: float = 5.0  # secondes, plannings inexistants (404)
+    PLANNING_CACHE_SQLITE_PATH: Optional[str] = None  # None = pas de cache partagé
+    TEAM_INDEX_CACHE_MAX_ENTRIES: int = 1024  # index d'équipes (un par tournoi)
+    TEAM_INDEX_CACHE_TTL: float = (
+        3600.0  # secondes, revalidé par empreinte à chaque usage
+    )
+
+    # COMPRESSION
+    COMPRESSION_MIN_SIZE: int = 1024  # octets, en dessous on ne compresse pas
+    PLANNING_DATA_COMPRESSION: Optional[str] = (
+        None  # "gzip" ou "zstd": planning_data stocké compressé, None = JSON
+    )
+
+    # LIMITES
+    BATCH_STATUS_MAX_IDS: int = 100  # nombre max d'IDs par lecture de statuts groupée
+    BULK_GENERATION_MAX_TOURNAMENTS: int = 100  # tournois max par génération groupée
+    BULK_GENERATION_CONCURRENCY: int = 4  # générations simultanées (génération groupée)
+    STATUS_WAIT_DEFAULT_TIMEOUT: float = 20.0  # secondes, attente par défaut (wait=)
+    STATUS_WAIT_MAX_TIMEOUT: float = 30.0  # secondes, attente maximale (wait=)
+    STATUS_WAIT_RECHECK_INTERVAL: float = 5.0  # secondes, relecture du statut (wait=)
+    LIVE_FEED_QUEUE_SIZE: int = 32  # messages en attente par client WebSocket
+    LIVE_FEED_REVALIDATE_INTERVAL: float = (
+        5.0  # secondes, relecture de la version des tournois suivis en direct
+    )
+    MATCH_INSERT_CHUNK_SIZE: int = 500  # matchs max par requête d'insertion
+    MATCH_INSERT_CONCURRENCY: int = 3  # lots de matchs envoyés simultanément
+    MATCH_INSERT_RETRIES: int = 2  # nouvelles tentatives par lot de matchs
+    MATCH_INSERT_RETRY_DELAY: float = 0.2  # secondes, doublé à chaque tentative
+
     model_config = ConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
@@ -1,18 +1,103 @@
+import threading
 from typing import Optional
 
-from supabase import Client, create_client
+import httpx
+from supabase import AsyncClient, Client, create_client
+from supabase.lib.client_options import AsyncClientOptions, SyncClientOptions
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.queries import record_payload
 
 SUPABASE_URL = settings.SUPABASE_URL
 SUPABASE_KEY = settings.SUPABASE_KEY
 SUPABASE_SERVICE_KEY = settings.SUPABASE_SERVICE_KEY
 
 supabase: Optional[Client] = None
+httpClient: Optional[httpx.Client] = None
+asyncSupabase: Optional[AsyncClient] = None
+asyncHttpClient: Optional[httpx.AsyncClient] = None
+
+# Protège la création paresseuse du client partagé
+_supabaseLock = threading.Lock()
+
+
+def _traceConnection(eventName: str, info: dict) -> None:
+    """Trace httpcore: compte les nouvelles connexions TCP vers Supabase"""
+    if eventName == "connection.connect_tcp.complete":
+        metrics.increment("supabase.connections.opened")
+
+
+def _onRequest(request: httpx.Request) -> None:
+    metrics.increment("supabase.requests")
+    request.extensions["trace"] = _traceConnection
+
+
+def _onResponse(response: httpx.Response) -> None:
+    metrics.increment(f"supabase.responses.{response.http_version}")
+    if response.request.method == "GET":
+        # Taille des lectures par requête du catalogue (app.core.queries)
+        response.read()
+        record_payload(response)
+
+
+async def _traceConnectionAsync(eventName: str, info: dict) -> None:
+    _traceConnection(eventName, info)
+
+
+async def _onRequestAsync(request: httpx.Request) -> None:
+    metrics.increment("supabase.requests")
+    request.extensions["trace"] = _traceConnectionAsync
+
+
+async def _onResponseAsync(response: httpx.Response) -> None:
+    metrics.increment(f"supabase.responses.{response.http_version}")
+    if response.request.method == "GET":
+        await response.aread()
+        record_payload(response)
+
+
+def _httpClientOptions() -> dict:
+    """Pool, HTTP/2 et timeouts communs aux clients httpx synchrone et asynchrone"""
+    return {
+        "http2": settings.SUPABASE_HTTP2,
+        "limits": httpx.Limits(
+            max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(
+            settings.SUPABASE_TIMEOUT, connect=settings.SUPABASE_CONNECT_TIMEOUT
+        ),
+        "follow_redirects": True,
+    }
+
+
+def createHttpClient() -> httpx.Client:
+    """
+    Client httpx partagé par toutes les requêtes PostgREST du processus:
+    pool de connexions dimensionné, keep-alive HTTP/2 et timeouts explicites
+    """
+    return httpx.Client(
+        **_httpClientOptions(),
+        event_hooks={"request": [_onRequest], "response": [_onResponse]},
+    )
+
+
+def createAsyncHttpClient() -> httpx.AsyncClient:
+    """Équivalent asynchrone de createHttpClient (couche d'accès async)"""
+    return httpx.AsyncClient(
+        **_httpClientOptions(),
+        event_hooks={"request": [_onRequestAsync], "response": [_onResponseAsync]},
+    )
 
 
 def initSupabase():
-    global supabase
+    """Crée le client Supabase du processus s'il n'existe pas encore"""
+    global supabase, httpClient
+
+    if supabase is not None:
+        return
 
     if SUPABASE_URL is None:
         raise Exception("SUPABASE_URL manquant dans les variables d'environnement")
@@ -24,16 +109,28 @@ def initSupabase():
             "SUPABASE_SERVICE_KEY manquant dans les variables d'environnement"
         )
 
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    with _supabaseLock:
+        if supabase is not None:
+            return
 
-        print("Connexion à Supabase !")
-    except Exception as e:
-        print(f"Erreur : {e}")
-        raise
+        try:
+            httpClient = createHttpClient()
+            supabase = create_client(
+                SUPABASE_URL,
+                SUPABASE_SERVICE_KEY,
+                # Le client httpx n'est utilisé que pour PostgREST
+                # (storage et functions ne sont pas utilisés par le service)
+                options=SyncClientOptions(httpx_client=httpClient),
+            )
+
+            print("Connexion à Supabase !")
+        except Exception as e:
+            print(f"Erreur : {e}")
+            raise
 
 
 def getSupabase():
+    """Client Supabase partagé par le processus (créé au premier appel)"""
     initSupabase()
     if supabase is None:
         raise Exception("Supabase pas initialisé - appeler init_supabase() d'abord")
@@ -41,6 +138,51 @@ def getSupabase():
     return supabase
 
 
+def getAsyncSupabase() -> AsyncClient:
+    """
+    Client Supabase asynchrone partagé par le processus (créé au premier appel)
+
+    Avec une clé de service, AsyncClient.create() n'ajoute rien au constructeur
+    (pas de session à restaurer): le client peut donc être créé sans await.
+    """
+    global asyncSupabase, asyncHttpClient
+
+    if asyncSupabase is not None:
+        return asyncSupabase
+
+    with _supabaseLock:
+        if asyncSupabase is None:
+            asyncHttpClient = createAsyncHttpClient()
+            asyncSupabase = AsyncClient(
+                SUPABASE_URL,
+                SUPABASE_SERVICE_KEY,
+                options=AsyncClientOptions(httpx_client=asyncHttpClient),
+            )
+            print("Connexion asynchrone à Supabase !")
+
+    return asyncSupabase
+
+
+def getConnectionMetrics() -> dict:
+    """
+    Métriques du pool de connexions Supabase
+
+    Returns:
+        dict: Requêtes, connexions ouvertes et requêtes servies par une
+        connexion déjà ouverte (réutilisation keep-alive / HTTP/2)
+    """
+    requests = metrics.get("supabase.requests")
+    opened = metrics.get("supabase.connections.opened")
+    return {
+        "requests": requests,
+        "connections_opened": opened,
+        "connections_reused": max(0, requests - opened),
+        "pool_max_connections": settings.SUPABASE_POOL_MAX_CONNECTIONS,
+        "pool_max_keepalive": settings.SUPABASE_POOL_MAX_KEEPALIVE,
+        "http2": settings.SUPABASE_HTTP2,
+    }
+
+
 def testConnection():
     try:
         db = getSupabase()
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+# Clé d'abonnement recevant les événements de tous les plannings
+ALL_PLANNINGS = "*"
+
+
+class Subscription:
+    """Abonnement d'une coroutine aux événements d'un planning"""
+
+    def __init__(self, key: str, loop: asyncio.AbstractEventLoop):
+        self.key = key
+        self.loop = loop
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Attend le prochain événement
+
+        Returns:
+            dict: Événement {"planning_id", "status", "tournament_id"}, ou None si timeout expiré
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PlanningEventBroker:
+    """
+    Diffusion en mémoire des changements de statut des plannings
+
+    publish() peut être appelé depuis n'importe quel thread (générations lancées
+    via asyncio.to_thread); les événements sont remis dans la boucle asyncio
+    de chaque abonné. La diffusion est limitée au processus courant.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, planningId: str = ALL_PLANNINGS) -> Subscription:
+        """
+        Abonne l'appelant aux événements d'un planning (ou de tous les plannings)
+
+        Doit être appelé depuis une coroutine (boucle asyncio en cours).
+        """
+        subscription = Subscription(planningId, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[planningId].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Retire un abonnement"""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.key)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.key]
+
+    def publish(
+        self, planningId: str, status: Optional[str], tournamentId: Optional[str] = None
+    ) -> None:
+        """
+        Notifie un changement de statut (status=None: planning supprimé)
+
+        Args:
+            planningId: ID du planning
+            status: Nouveau statut du planning
+            tournamentId: ID du tournoi, s'il est connu de l'appelant
+        """
+        event = {
+            "planning_id": planningId,
+            "status": status,
+            "tournament_id": tournamentId,
+        }
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(planningId, ())) + list(
+                self._subscriptions.get(ALL_PLANNINGS, ())
+            )
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.queue.put_nowait, event
+                )
+            except RuntimeError:
+                # Boucle fermée: l'abonné a disparu sans se désabonner
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self, planningId: str = ALL_PLANNINGS) -> int:
+        """Nombre d'abonnés à un planning"""
+        with self._lock:
+            return len(self._subscriptions.get(planningId, ()))
+
+    def clear(self) -> None:
+        """Retire tous les abonnements"""
+        with self._lock:
+            self._subscriptions.clear()
+
+
+# Instance globale
+planningEventBroker = PlanningEventBroker()
@@ -0,0 +1,77 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+# Les clients doivent revalider à chaque fois (via If-None-Match)
+CACHE_CONTROL = "private, no-cache"
+
+# Suffixes ajoutés à l'ETag des représentations compressées
+ENCODING_SUFFIXES = ["-gzip", "-br"]
+
+
+def build_etag(planning_id: str, updated_at: Union[datetime, str, None]) -> str:
+    """
+    Construit un ETag fort à partir de l'ID du planning et de sa date de mise à jour
+
+    Args:
+        planning_id: ID du planning
+        updated_at: Date de dernière mise à jour (datetime ou chaîne ISO)
+
+    Returns:
+        str: ETag entre guillemets, ex: "3f2a..."
+    """
+    if isinstance(updated_at, str):
+        # Normalisation pour que la chaîne brute de la DB et le datetime
+        # parsé par Pydantic produisent le même ETag
+        updated_at = datetime.fromisoformat(updated_at)
+    version = updated_at.isoformat() if updated_at else ""
+
+    digest = hashlib.sha256(f"{planning_id}:{version}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Vérifie si l'en-tête If-None-Match correspond à l'ETag courant
+    (comparaison faible, comme le prévoit la RFC 9110 pour If-None-Match)
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    for candidate in candidates:
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        # Les représentations compressées portent un suffixe: "abc-gzip"
+        for suffix in ENCODING_SUFFIXES:
+            if candidate.endswith(f'{suffix}"'):
+                candidate = f'{candidate[: -len(suffix) - 1]}"'
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_response(etag: str) -> Response:
+    """Réponse 304 sans corps"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def planning_cache_headers(
+    planning: Union[BaseModel, Dict[str, Any]],
+) -> Dict[str, str]:
+    """En-têtes de cache (ETag + Cache-Control) pour un planning complet ou partiel"""
+    if isinstance(planning, BaseModel):
+        planning = {"id": planning.id, "updated_at": planning.updated_at}
+    return {
+        "ETag": build_etag(planning["id"], planning.get("updated_at")),
+        "Cache-Control": CACHE_CONTROL,
+    }
@@ -0,0 +1,51 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+
+class Metrics:
+    """
+    Compteurs de métriques du processus (thread-safe)
+
+    Les noms sont hiérarchiques, séparés par des points:
+    "supabase.requests", "supabase.connections.opened", ...
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Number] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: Number = 1) -> None:
+        """Ajoute value au compteur name"""
+        with self._lock:
+            self._values[name] += value
+
+    def set(self, name: str, value: Number) -> None:
+        """Fixe la valeur d'une jauge"""
+        with self._lock:
+            self._values[name] = value
+
+    def get(self, name: str) -> Number:
+        """Valeur courante d'un compteur (0 s'il n'existe pas)"""
+        with self._lock:
+            return self._values.get(name, 0)
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Number]:
+        """Copie des compteurs, éventuellement filtrés par préfixe"""
+        with self._lock:
+            return {
+                name: value
+                for name, value in sorted(self._values.items())
+                if name.startswith(prefix)
+            }
+
+    def reset(self) -> None:
+        """Remet tous les compteurs à zéro"""
+        with self._lock:
+            self._values.clear()
+
+
+# Instance globale
+metrics = Metrics()
@@ -0,0 +1,47 @@
+import base64
+import binascii
+from typing import Tuple
+
+import orjson
+
+
+class InvalidCursorError(ValueError):
+    """Curseur de pagination illisible ou falsifié"""
+
+
+def encode_cursor(debut_horaire: str, row_id: str) -> str:
+    """
+    Encode la position (debut_horaire, id) du dernier élément d'une page
+
+    Returns:
+        str: Curseur opaque (base64 url-safe, sans padding)
+    """
+    raw = orjson.dumps([debut_horaire, row_id])
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Décode un curseur produit par encode_cursor
+
+    Raises:
+        InvalidCursorError: si le curseur n'est pas valide
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        debut_horaire, row_id = orjson.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise InvalidCursorError("Curseur de pagination invalide")
+
+    if not isinstance(debut_horaire, str) or not isinstance(row_id, str):
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return debut_horaire, row_id
+
+
+def quote_filter_value(value: str) -> str:
+    """
+    Protège une valeur utilisée dans un filtre logique PostgREST (or=/and=),
+    où les caractères , . : ( ) sont réservés
+    """
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
@@ -0,0 +1,57 @@
+"""
+Stockage compressé de planning_data (JSON complet de l'assistant)
+
+Valeur stockée dans ai_tournament_planning.planning_data_compressed:
+"<encodage>:<données compressées en base64>", l'encodage ("gzip" ou "zstd")
+suffit à la décompresser quel que soit le réglage courant.
+"""
+
+import base64
+import gzip
+from typing import Any, Dict
+
+import orjson
+
+try:  # zstd est optionnel (pip install ".[performance]")
+    import zstandard
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    zstandard = None
+
+# Encodages de stockage disponibles
+STORAGE_ENCODINGS = ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+
+
+def encode_planning_data(data: Dict[str, Any], encoding: str) -> str:
+    """
+    Compresse planning_data pour la colonne planning_data_compressed
+
+    Args:
+        data: JSON complet de l'assistant
+        encoding: "zstd" (gzip si zstandard n'est pas installé) ou "gzip"
+
+    Returns:
+        str: Valeur stockée, préfixée par son encodage
+    """
+    body = orjson.dumps(data)
+    if encoding == "zstd" and zstandard is not None:
+        compressed = zstandard.ZstdCompressor(level=6).compress(body)
+    else:
+        encoding = "gzip"
+        # mtime=0: même JSON, même valeur stockée
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+    return f"{encoding}:{base64.b64encode(compressed).decode('ascii')}"
+
+
+def decode_planning_data(value: str) -> Dict[str, Any]:
+    """Décompresse une valeur de planning_data_compressed"""
+    encoding, _, payload = value.partition(":")
+    compressed = base64.b64decode(payload)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("planning_data compressé en zstd: zstandard requis")
+        body = zstandard.ZstdDecompressor().decompress(compressed)
+    elif encoding == "gzip":
+        body = gzip.decompress(compressed)
+    else:
+        raise ValueError(f"Encodage de planning_data inconnu: {encoding}")
+    return orjson.loads(body)
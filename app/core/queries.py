@@ -0,0 +1,157 @@
+"""
+Catalogue des lectures Supabase
+
+Chaque lecture déclare sa table et les colonnes strictement nécessaires
+(jamais "*"). Les hooks httpx du client partagé (app.core.database)
+retrouvent la requête du catalogue à partir de l'URL et comptent, par
+requête, le nombre d'appels et les octets reçus:
+    supabase.queries.<nom>.calls / supabase.queries.<nom>.bytes
+"""
+
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Type
+
+import httpx
+from pydantic import BaseModel
+
+from app.core.metrics import metrics
+from app.models.models import (
+    AIGeneratedMatch,
+    AITournamentPlanning,
+    Team,
+    Tournament,
+)
+
+QUERY_METRICS_PREFIX = "supabase.queries"
+
+
+def columns_of(model: Type[BaseModel], exclude: Iterable[str] = ()) -> str:
+    """Liste de colonnes PostgREST des champs d'un modèle"""
+    return ",".join(name for name in model.model_fields if name not in exclude)
+
+
+class Query:
+    """Lecture déclarée dans le catalogue: table + colonnes"""
+
+    def __init__(self, name: str, table: str, columns: str):
+        self.name = name
+        self.table = table
+        self.columns = columns
+
+    def select(self, client):
+        """Début de la requête PostgREST (client synchrone ou asynchrone)"""
+        return client.table(self.table).select(self.columns)
+
+
+class QueryCatalogue:
+    """Lectures connues, indexées par nom et par (table, colonnes)"""
+
+    def __init__(self):
+        self._byName: Dict[str, Query] = {}
+        self._byColumns: Dict[Tuple[str, str], Query] = {}
+
+    def register(self, name: str, table: str, columns: str) -> Query:
+        """Déclare une lecture (nom et couple table/colonnes uniques)"""
+        if "*" in columns.split(","):
+            raise ValueError(f"{name}: colonnes explicites requises")
+        if name in self._byName or (table, columns) in self._byColumns:
+            raise ValueError(f"Requête déjà déclarée: {name}")
+
+        query = Query(name, table, columns)
+        self._byName[name] = query
+        self._byColumns[(table, columns)] = query
+        return query
+
+    def get(self, name: str) -> Query:
+        return self._byName[name]
+
+    def resolve(self, table: str, columns: Optional[str]) -> Optional[Query]:
+        """Requête du catalogue correspondant à une URL PostgREST, ou None"""
+        return self._byColumns.get((table, columns))
+
+    def __iter__(self) -> Iterator[Query]:
+        return iter(self._byName.values())
+
+
+queries = QueryCatalogue()
+
+
+def record_payload(response: httpx.Response) -> None:
+    """
+    Compte une réponse de lecture PostgREST (corps déjà lu)
+
+    Les lectures hors catalogue (colonnes choisies par l'appelant) sont
+    regroupées sous <table>.adhoc.
+    """
+    url = response.request.url
+    table = url.path.rsplit("/", 1)[-1]
+    query = queries.resolve(table, url.params.get("select"))
+    name = query.name if query else f"{table}.adhoc"
+
+    # Octets reçus sur le réseau (compressés); corps décodé si la réponse n'a
+    # pas été téléchargée (transport en mémoire)
+    size = response.num_bytes_downloaded or len(response.content)
+
+    metrics.increment(f"{QUERY_METRICS_PREFIX}.{name}.calls")
+    metrics.increment(f"{QUERY_METRICS_PREFIX}.{name}.bytes", size)
+
+
+# Tournoi + équipes en une requête: team est embarquée via sa clé tournament_id
+# (registered_teams est calculé à partir des équipes, pas lu)
+TOURNAMENT_WITH_TEAMS = queries.register(
+    "tournament.with_teams",
+    "tournament",
+    f"{columns_of(Tournament, exclude=['registered_teams'])},team({columns_of(Team)})",
+)
+TEAMS = queries.register("team.by_tournament", "team", columns_of(Team))
+# Correspondance nom -> id pour résoudre les équipes des matchs
+TEAM_NAMES = queries.register("team.names", "team", "id,name")
+# Empreinte des équipes embarquée dans une lecture du tournoi: nombre de
+# lignes et dernière modification (app.core.team_index.with_team_fingerprint)
+TEAM_FINGERPRINT_COLUMNS = "team_count:team(count),team_latest:team(updated_at)"
+TEAM_FINGERPRINT = queries.register(
+    "team.fingerprint", "tournament", f"id,{TEAM_FINGERPRINT_COLUMNS}"
+)
+# Tournoi + empreinte de ses équipes (génération avec l'index en cache)
+TOURNAMENT_WITH_TEAM_FINGERPRINT = queries.register(
+    "tournament.with_team_fingerprint",
+    "tournament",
+    f"{columns_of(Tournament, exclude=['registered_teams'])},{TEAM_FINGERPRINT_COLUMNS}",
+)
+
+# Planning complet: planning_data est lu en JSON ou, s'il est stocké
+# compressé, dans planning_data_compressed (l'autre colonne est vide)
+PLANNING = queries.register(
+    "planning.full", "ai_tournament_planning", columns_of(AITournamentPlanning)
+)
+# Planning sans planning_data (le JSON complet de l'IA), ni compressé ni en clair
+PLANNING_SUMMARY = queries.register(
+    "planning.summary",
+    "ai_tournament_planning",
+    columns_of(
+        AITournamentPlanning, exclude=["planning_data", "planning_data_compressed"]
+    ),
+)
+PLANNING_VERSION = queries.register(
+    "planning.version", "ai_tournament_planning", "id,updated_at"
+)
+PLANNING_TOURNAMENT = queries.register(
+    "planning.tournament_id", "ai_tournament_planning", "tournament_id"
+)
+PLANNING_STATUS = queries.register(
+    "planning.status", "ai_tournament_planning", "status"
+)
+PLANNING_STATUSES = queries.register(
+    "planning.statuses", "ai_tournament_planning", "id,status"
+)
+
+MATCHES = queries.register(
+    "match.by_planning", "ai_generated_match", columns_of(AIGeneratedMatch)
+)
+# Clés et empreintes des matchs et poules d'une version de planning en une
+# requête (base d'une sauvegarde différentielle), embarqués via planning_id
+PLANNING_CHILDREN = queries.register(
+    "planning.children",
+    "ai_tournament_planning",
+    "id,ai_generated_match(match_id_ai,row_hash),"
+    "ai_generated_poule(poule_id,row_hash)",
+)
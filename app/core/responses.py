@@ -0,0 +1,53 @@
+from typing import Any, Dict, Optional, Union
+
+import orjson
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from app.core.planning_storage import decode_planning_data
+
+
+def planning_payload(planning: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convertit un planning déjà validé en dict sérialisable par orjson
+
+    On copie uniquement le premier niveau des champs: planning_data (dict arbitraire)
+    est transmis tel quel, sans être parcouru par Pydantic ni par jsonable_encoder.
+    Un planning_data stocké compressé n'est décompressé qu'ici, à l'envoi.
+    """
+    payload = dict(planning) if isinstance(planning, BaseModel) else planning
+    if "planning_data_compressed" in payload:
+        payload = dict(payload)
+        compressed = payload.pop("planning_data_compressed")
+        if compressed and not payload.get("planning_data"):
+            payload["planning_data"] = decode_planning_data(compressed)
+    return payload
+
+
+def planning_response(
+    message: str,
+    planning: Union[BaseModel, Dict[str, Any]],
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None,
+) -> ORJSONResponse:
+    """
+    Réponse de planning encodée directement en bytes avec orjson
+
+    Même format que PlanningResponse, mais sans la seconde validation Pydantic
+    ni le passage par jsonable_encoder de FastAPI.
+    """
+    return ORJSONResponse(
+        content={
+            "success": True,
+            "message": message,
+            "data": planning_payload(planning),
+        },
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+def ndjson_line(content: Dict[str, Any]) -> bytes:
+    """Encode un objet en une ligne NDJSON (JSON + saut de ligne)"""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS) + b"\n"
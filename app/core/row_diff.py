@@ -0,0 +1,98 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Représentation comparable d'une ligne (colonnes de contenu uniquement)
+Comparable = Callable[[dict], Any]
+
+
+class DuplicateKeyError(ValueError):
+    """Clé présente plusieurs fois dans une version: pas de diff possible"""
+
+
+class RowDiff:
+    """Lignes ajoutées, modifiées, supprimées et inchangées entre deux versions"""
+
+    def __init__(
+        self,
+        key: str,
+        inserts: List[dict],
+        updates: List[dict],
+        deletes: List[str],
+        unchanged: List[str],
+    ):
+        self.key = key
+        self.inserts = inserts  # nouvelles lignes (clé absente de la base)
+        self.updates = updates  # nouvelles lignes dont le contenu a changé
+        self.deletes = deletes  # clés de la base absentes de la nouvelle version
+        self.unchanged = unchanged  # clés identiques dans les deux versions
+
+    @property
+    def changed(self) -> List[dict]:
+        """Lignes à écrire: ajoutées + modifiées"""
+        return self.inserts + self.updates
+
+    @property
+    def replaced(self) -> List[str]:
+        """Clés des lignes de la base à ne pas reprendre: modifiées + supprimées"""
+        return [row[self.key] for row in self.updates] + self.deletes
+
+    def __bool__(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+
+def diff_rows(
+    previous: Iterable[dict],
+    current: Iterable[dict],
+    key: str,
+    comparable: Optional[Comparable] = None,
+) -> RowDiff:
+    """
+    Compare deux versions d'un ensemble de lignes indexées par une clé métier
+
+    Args:
+        previous: Lignes de la version de base
+        current: Lignes de la nouvelle version
+        key: Colonne identifiant une ligne d'une version à l'autre
+        comparable: Contenu comparé d'une ligne (par défaut la ligne entière)
+
+    Returns:
+        RowDiff: Lignes de current à écrire, clés de previous à abandonner
+
+    Raises:
+        DuplicateKeyError: une clé apparaît deux fois dans l'une des versions
+    """
+    comparable = comparable or (lambda row: row)
+    base: Dict[str, Any] = {}
+    for row in previous:
+        if row[key] in base:
+            raise DuplicateKeyError(f"{key} en double dans la base: {row[key]}")
+        base[row[key]] = comparable(row)
+
+    inserts, updates, unchanged = [], [], []
+    seen = set()
+    for row in current:
+        rowKey = row[key]
+        if rowKey in seen:
+            raise DuplicateKeyError(f"{key} en double: {rowKey}")
+        seen.add(rowKey)
+        if rowKey not in base:
+            inserts.append(row)
+        elif base[rowKey] != comparable(row):
+            updates.append(row)
+        else:
+            unchanged.append(rowKey)
+
+    deletes = [rowKey for rowKey in base if rowKey not in seen]
+    return RowDiff(key, inserts, updates, deletes, unchanged)
+
+
+def content_hash(values: dict) -> str:
+    """
+    Empreinte stable du contenu d'une ligne (colonne row_hash)
+
+    Permet de comparer une nouvelle ligne à celle d'une version en base en ne
+    relisant que sa clé et son empreinte.
+    """
+    encoded = json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
@@ -1,7 +1,8 @@
 import os
+import secrets
 from typing import List, Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
@@ -37,8 +38,9 @@ def get_cors_config() -> dict:
             "Accept",
             "Origin",
             "X-API-Key",
+            "If-None-Match",
         ],
-        "expose_headers": ["Content-Range", "X-Content-Range", "X-Total-Count"],
+        "expose_headers": ["Content-Range", "X-Content-Range", "X-Total-Count", "ETag"],
         "allow_credentials": True,
         "max_age": 86400,  # 24 heures
     }
@@ -127,6 +129,23 @@ def get_trusted_hosts() -> List[str]:
     return list(set(default_hosts + configured_hosts))
 
 
+def require_admin_key(x_api_key: Optional[str] = Header(None)) -> None:
+    """
+    Dépendance des routes d'administration: en-tête X-API-Key égal à
+    ADMIN_API_KEY (routes désactivées si la clé n'est pas configurée)
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Routes d'administration désactivées",
+        )
+    if not x_api_key or not secrets.compare_digest(x_api_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Clé d'administration invalide",
+        )
+
+
 def apply_security_middleware(app: FastAPI) -> None:
     """
     Applique tous les middlewares de sécurité à l'application FastAPI
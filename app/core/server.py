@@ -0,0 +1,69 @@
+import importlib.util
+import os
+from typing import Any, Dict
+
+from app.core.config import settings
+
+
+def has_module(name: str) -> bool:
+    """Vérifie si un module optionnel est installé (sans l'importer)"""
+    return importlib.util.find_spec(name) is not None
+
+
+def get_worker_count() -> int:
+    """
+    Nombre de workers uvicorn en production
+
+    WEB_CONCURRENCY (ou SERVER_WORKERS) est prioritaire; sinon un worker par
+    cœur réellement disponible pour le processus (cgroups/affinité compris).
+    """
+    configured = os.getenv("WEB_CONCURRENCY") or settings.SERVER_WORKERS
+    if configured:
+        return max(1, int(configured))
+
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS / Windows
+        cores = os.cpu_count() or 1
+    return max(1, cores)
+
+
+def get_server_config(environment: str, host: str, port: int) -> Dict[str, Any]:
+    """
+    Configuration uvicorn selon l'environnement
+
+    Args:
+        environment: development ou production
+        host: Adresse d'écoute
+        port: Port d'écoute
+
+    Returns:
+        dict: Arguments pour uvicorn.run("main:app", **config)
+    """
+    config = {
+        "host": host,
+        "port": port,
+        "log_level": "info" if environment == "production" else "debug",
+        "access_log": True,
+    }
+
+    if environment == "development":
+        # En développement: un seul processus avec rechargement automatique
+        config["reload"] = True
+    if environment != "production":
+        return config
+
+    config.update(
+        {
+            "workers": get_worker_count(),
+            # uvloop et httptools s'ils sont installés (pip install ".[performance]")
+            "loop": "uvloop" if has_module("uvloop") else "asyncio",
+            "http": "httptools" if has_module("httptools") else "h11",
+            # Au-delà du délai d'inactivité des load balancers (souvent 60s)
+            "timeout_keep_alive": settings.SERVER_KEEP_ALIVE,
+            "backlog": settings.SERVER_BACKLOG,
+            # Laisse aux générations en cours le temps de se terminer
+            "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        }
+    )
+    return config
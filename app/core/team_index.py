@@ -0,0 +1,190 @@
+"""
+Index des équipes d'un tournoi (noms -> IDs), mis en cache par tournoi
+
+Une génération n'a besoin que du nom et de l'ID des équipes. L'index est
+revalidé à chaque usage par une empreinte lue sans télécharger les équipes
+(nombre de lignes et plus grand updated_at, embarqués dans la lecture du
+tournoi): tant qu'elle ne change pas, les équipes ne sont pas relues.
+invalidate_team_index sert aux chemins qui modifient les équipes.
+"""
+
+import unicodedata
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from app.core.cache import MISSING, TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.queries import TEAM_FINGERPRINT, TEAM_NAMES
+
+# Empreinte des équipes d'un tournoi: (nombre de lignes, plus grand updated_at)
+Fingerprint = Tuple[int, Optional[str]]
+
+
+class IndexedTeam(NamedTuple):
+    """Équipe réduite aux colonnes de l'index"""
+
+    id: str
+    name: str
+
+
+def normalize_team_name(name: str) -> str:
+    """Nom comparable: sans accents, casse ni espaces superflus"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def team_fingerprint(rows: Iterable[dict]) -> Fingerprint:
+    """Empreinte calculée depuis des lignes d'équipes complètes"""
+    rows = list(rows)
+    latest = max(
+        (row["updated_at"] for row in rows if row.get("updated_at")), default=None
+    )
+    return len(rows), latest
+
+
+def embedded_team_fingerprint(tournamentRow: dict) -> Fingerprint:
+    """
+    Empreinte depuis une ligne de tournoi lue avec les colonnes
+    queries.TEAM_FINGERPRINT_COLUMNS (voir with_team_fingerprint)
+    """
+    counts = tournamentRow.get("team_count") or []
+    latest = tournamentRow.get("team_latest") or []
+    return (
+        counts[0]["count"] if counts else 0,
+        latest[0].get("updated_at") if latest else None,
+    )
+
+
+def with_team_fingerprint(query):
+    """Ne garde que l'équipe modifiée le plus récemment sous team_latest"""
+    return query.order(
+        "updated_at", desc=True, nullsfirst=False, foreign_table="team_latest"
+    ).limit(1, foreign_table="team_latest")
+
+
+class TeamIndex(dict):
+    """
+    Noms d'équipes -> IDs d'un tournoi
+
+    S'utilise comme un dict de correspondance; garde en plus les équipes
+    dans l'ordre des noms, les noms normalisés (résolution tolérante aux
+    accents et à la casse) et l'empreinte des lignes dont il est construit.
+    """
+
+    def __init__(self, rows: Iterable[dict], fingerprint: Fingerprint):
+        self.teams = [IndexedTeam(row["id"], row["name"]) for row in rows]
+        super().__init__((team.name, team.id) for team in self.teams)
+        self.normalized = {
+            normalize_team_name(team.name): team.id for team in self.teams
+        }
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> "TeamIndex":
+        """Index de lignes d'équipes complètes (empreinte calculée)"""
+        rows = list(rows)
+        return cls(rows, team_fingerprint(rows))
+
+    @property
+    def count(self) -> int:
+        return len(self.teams)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """ID de l'équipe: nom exact, sinon nom normalisé"""
+        teamId = self.get(name)
+        if teamId is None and name:
+            teamId = self.normalized.get(normalize_team_name(name))
+        return teamId
+
+
+# Index des équipes par tournoi: tournament_id -> TeamIndex
+# (revalidé par empreinte à chaque usage, le TTL ne fait que borner la mémoire)
+teamIndexCache = TTLCache(
+    maxsize=settings.TEAM_INDEX_CACHE_MAX_ENTRIES, ttl=settings.TEAM_INDEX_CACHE_TTL
+)
+
+
+def cached_team_index(
+    tournamentId: str, fingerprint: Fingerprint
+) -> Optional[TeamIndex]:
+    """Index en cache s'il correspond encore à l'empreinte lue en base"""
+    index = teamIndexCache.get(tournamentId)
+    if index is MISSING:
+        metrics.increment("cache.team_index.misses")
+        return None
+    if index.fingerprint != fingerprint:
+        metrics.increment("cache.team_index.stale")
+        return None
+    metrics.increment("cache.team_index.hits")
+    return index
+
+
+def cache_team_index(
+    tournamentId: str, rows: Iterable[dict], fingerprint: Fingerprint
+) -> TeamIndex:
+    index = TeamIndex(rows, fingerprint)
+    teamIndexCache.set(tournamentId, index)
+    return index
+
+
+def invalidate_team_index(tournamentId: str) -> None:
+    """Oublie l'index d'un tournoi (à appeler après une modification des équipes)"""
+    teamIndexCache.delete(tournamentId)
+
+
+def load_team_index(
+    client, tournamentId: str, fingerprint: Optional[Fingerprint] = None
+) -> TeamIndex:
+    """
+    Index des équipes d'un tournoi: celui du cache si l'empreinte n'a pas
+    changé, sinon relu (noms et IDs seulement)
+
+    Args:
+        client: Client Supabase synchrone
+        tournamentId: ID du tournoi
+        fingerprint: Empreinte déjà lue avec le tournoi (sinon lue ici)
+    """
+    if fingerprint is None:
+        fingerprint = embedded_team_fingerprint(
+            with_team_fingerprint(TEAM_FINGERPRINT.select(client))
+            .eq("id", tournamentId)
+            .single()
+            .execute()
+            .data
+        )
+    index = cached_team_index(tournamentId, fingerprint)
+    if index is None:
+        rows = (
+            TEAM_NAMES.select(client)
+            .eq("tournament_id", tournamentId)
+            .order("name")
+            .execute()
+            .data
+        )
+        index = cache_team_index(tournamentId, rows, fingerprint)
+    return index
+
+
+async def load_team_index_async(
+    client, tournamentId: str, fingerprint: Optional[Fingerprint] = None
+) -> TeamIndex:
+    """Variante asynchrone de load_team_index (client Supabase async)"""
+    if fingerprint is None:
+        result = (
+            await with_team_fingerprint(TEAM_FINGERPRINT.select(client))
+            .eq("id", tournamentId)
+            .single()
+            .execute()
+        )
+        fingerprint = embedded_team_fingerprint(result.data)
+    index = cached_team_index(tournamentId, fingerprint)
+    if index is None:
+        result = (
+            await TEAM_NAMES.select(client)
+            .eq("tournament_id", tournamentId)
+            .order("name")
+            .execute()
+        )
+        index = cache_team_index(tournamentId, result.data, fingerprint)
+    return index
@@ -0,0 +1,126 @@
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from app.core.cache import MISSING
+from app.core.metrics import metrics
+
+
+class UnitOfWork:
+    """
+    Identity map d'un traitement: chaque ligne lue n'est demandée qu'une fois
+
+    Les clés sont (table, clé): ("tournament", tournament_id),
+    ("team", tournament_id) pour les équipes d'un tournoi, ...
+    Contrairement aux caches TTL, le contenu vit le temps d'une requête et
+    n'est jamais partagé entre deux requêtes.
+    """
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, Hashable], Any] = {}
+
+    def get(self, table: str, key: Hashable) -> Any:
+        """Valeur déjà lue, ou MISSING"""
+        return self._rows.get((table, key), MISSING)
+
+    def set(self, table: str, key: Hashable, value: Any) -> None:
+        """Enregistre une valeur lue ou écrite pendant le traitement"""
+        self._rows[(table, key)] = value
+
+    def discard(self, table: str, key: Hashable) -> None:
+        """Oublie une valeur (après une modification en base)"""
+        self._rows.pop((table, key), None)
+
+
+_currentUnitOfWork: ContextVar[Optional[UnitOfWork]] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """Unité de travail active, ou None hors d'un traitement"""
+    return _currentUnitOfWork.get()
+
+
+@contextmanager
+def unit_of_work() -> Iterator[UnitOfWork]:
+    """
+    Active une unité de travail pour le bloc
+
+    Imbriqué dans une unité déjà active, le bloc réutilise celle-ci.
+    """
+    current = _currentUnitOfWork.get()
+    if current is not None:
+        yield current
+        return
+
+    uow = UnitOfWork()
+    token = _currentUnitOfWork.set(uow)
+    try:
+        yield uow
+    finally:
+        _currentUnitOfWork.reset(token)
+
+
+def unit_of_work_scope(fn: Callable) -> Callable:
+    """Décorateur: exécute une fonction (sync ou async) dans une unité de travail"""
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with unit_of_work():
+                return await fn(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with unit_of_work():
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def remember(table: str, key: Hashable, value: Any) -> None:
+    """Enregistre une valeur écrite dans l'unité de travail active (s'il y en a une)"""
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.set(table, key, value)
+
+
+def fetch_once(table: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+    """
+    Lit une valeur via loader, au plus une fois par unité de travail
+
+    Hors unité de travail, loader est appelé à chaque fois.
+    """
+    uow = current_unit_of_work()
+    if uow is None:
+        return loader()
+
+    value = uow.get(table, key)
+    if value is MISSING:
+        value = loader()
+        uow.set(table, key, value)
+    else:
+        metrics.increment("unit_of_work.hits")
+    return value
+
+
+async def fetch_once_async(
+    table: str, key: Hashable, loader: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Variante asynchrone de fetch_once"""
+    uow = current_unit_of_work()
+    if uow is None:
+        return await loader()
+
+    value = uow.get(table, key)
+    if value is MISSING:
+        value = await loader()
+        uow.set(table, key, value)
+    else:
+        metrics.increment("unit_of_work.hits")
+    return value
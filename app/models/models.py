@@ -1,7 +1,9 @@
 from datetime import date, datetime, time
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, PrivateAttr
+
+from app.core.planning_storage import decode_planning_data
 
 
 class Tournament(BaseModel):
@@ -139,6 +141,22 @@ class AIPlanningData(BaseModel):
     final_ranking: List[FinalRanking] = []
     commentaires: Optional[str] = None
 
+    # JSON d'origine de l'assistant (conservé pour planning_data)
+    _source: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_assistant(cls, data: Dict[str, Any]) -> "AIPlanningData":
+        """Valide le JSON de l'assistant en gardant le dict d'origine"""
+        planning = cls(**data)
+        planning._source = data
+        return planning
+
+    def to_planning_data(self) -> Dict[str, Any]:
+        """JSON à stocker dans ai_tournament_planning.planning_data"""
+        if self._source is not None:
+            return self._source
+        return self.model_dump(mode="json", exclude_unset=True)
+
     def calculate_total_matches(self) -> int:
         """Calcule le nombre total de matchs"""
         total = 0
@@ -170,17 +188,33 @@ class AITournamentPlanning(BaseModel):
     type_tournoi: str
     status: str = "generating"
     planning_data: Dict[str, Any] = {}  # JSON complet de l'IA
+    # planning_data compressé (PLANNING_DATA_COMPRESSION), décompressé à la demande;
+    # colonne de stockage, absente des réponses (model_dump)
+    planning_data_compressed: Optional[str] = Field(default=None, exclude=True)
     total_matches: int = 0
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     ai_comments: Optional[str] = None
+    is_active: bool = False  # version active du planning du tournoi
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+    def get_planning_data(self) -> Dict[str, Any]:
+        """
+        JSON complet de l'IA, décompressé s'il est stocké compressé
+
+        Le résultat n'est pas gardé sur l'objet: un planning en cache ne
+        conserve que la forme compressée.
+        """
+        if self.planning_data or not self.planning_data_compressed:
+            return self.planning_data
+        return decode_planning_data(self.planning_data_compressed)
+
     def get_planning_data_object(self) -> Optional[AIPlanningData]:
         """Retourne les données de planning comme objet AIPlanningData"""
-        if self.planning_data:
-            return AIPlanningData(**self.planning_data)
+        planningData = self.get_planning_data()
+        if planningData:
+            return AIPlanningData(**planningData)
         return None
 
 
@@ -202,6 +236,7 @@ class AIGeneratedMatch(BaseModel):
     resolved_equipe_a_id: Optional[str] = None
     resolved_equipe_b_id: Optional[str] = None
     created_at: Optional[datetime] = None
+    row_hash: Optional[str] = None  # Empreinte du contenu (régénérations)
 
     def is_placeholder(self) -> bool:
         """Vérifie si le match contient des placeholders"""
@@ -222,6 +257,7 @@ class AIGeneratedPoule(BaseModel):
     nb_equipes: int = 0
     nb_matches: int = 0
     created_at: Optional[datetime] = None
+    row_hash: Optional[str] = None  # Empreinte du contenu (régénérations)
 
 
 class Profile(BaseModel):
@@ -1,7 +1,33 @@
+from typing import List
+
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 
 class GeneratePlanningRequest(BaseModel):
     """Requête pour générer un planning"""
 
     tournament_id: str = Field(..., description="ID du tournoi (UUID)")
+
+
+class BatchStatusRequest(BaseModel):
+    """Requête pour récupérer le statut de plusieurs plannings"""
+
+    planning_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BATCH_STATUS_MAX_IDS,
+        description="IDs des plannings (UUID)",
+    )
+
+
+class BulkGeneratePlanningRequest(BaseModel):
+    """Requête pour générer les plannings de plusieurs tournois"""
+
+    tournament_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BULK_GENERATION_MAX_TOURNAMENTS,
+        description="IDs des tournois (UUID)",
+    )
@@ -1,8 +1,8 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
-from app.models.models import AITournamentPlanning
+from app.models.models import AIGeneratedMatch, AITournamentPlanning
 
 
 class StandardResponse(BaseModel):
@@ -23,3 +23,22 @@ class StatusResponse(StandardResponse):
     """Réponse avec statut de planning"""
 
     data: Optional[Dict[str, str]] = None
+
+
+class BatchStatusResponse(StandardResponse):
+    """Réponse avec les statuts de plusieurs plannings (None si non trouvé)"""
+
+    data: Optional[Dict[str, Optional[str]]] = None
+
+
+class MatchesPage(BaseModel):
+    """Page de matchs (pagination par curseur)"""
+
+    items: List[AIGeneratedMatch] = []
+    next_cursor: Optional[str] = None
+
+
+class MatchesPageResponse(StandardResponse):
+    """Réponse avec une page de matchs"""
+
+    data: Optional[MatchesPage] = None
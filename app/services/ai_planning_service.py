@@ -1,8 +1,23 @@
-from typing import Any, Dict, Optional
+import asyncio
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from app.core.cache import MISSING
+from app.core.config import settings
 from app.core.database import getSupabase
+from app.core.events import planningEventBroker
+from app.core.queries import PLANNING_STATUS, PLANNING_STATUSES, PLANNING_SUMMARY
+from app.core.unit_of_work import unit_of_work_scope
 from app.models.models import AITournamentPlanning
-from app.services.database_service import databaseService
+from app.services.async_database_service import asyncDatabaseService
+from app.services.async_tournament_service import asyncTournamentService
+from app.services.database_service import (
+    PURGE_PLANNINGS_FUNCTION,
+    databaseService,
+    planningCache,
+    planningStatusCache,
+)
 from app.services.openai_service import openai_service
 from app.services.tournament_service import tournamentService
 
@@ -13,20 +28,30 @@ class AIPlanningService:
         self.openAIService = openai_service
         self.databaseService = databaseService
         self.tournamentService = tournamentService
+        self.asyncDatabaseService = asyncDatabaseService
+        self.asyncTournamentService = asyncTournamentService
 
-    def generatePlanning(self, tournamentId: str) -> Optional[AITournamentPlanning]:
+    @unit_of_work_scope
+    def generatePlanning(
+        self, tournamentId: str, basePlanningId: Optional[str] = None
+    ) -> Optional[AITournamentPlanning]:
         """
         Génère un planning complet pour un tournoi
 
         Args:
             tournament_id: ID du tournoi
+            basePlanningId: Version régénérée: seules les lignes qui en
+                diffèrent sont écrites (sauvegarde différentielle)
 
         Returns:
             AITournamentPlanning si succès, None sinon
         """
         try:
-            # Récupération des données tournoi avec équipes
-            tournamentData = self.tournamentService.getTournamentWithTeams(tournamentId)
+            # Récupération du tournoi et de l'index de ses équipes (en cache
+            # tant que les équipes ne changent pas)
+            tournamentData = self.tournamentService.getTournamentWithTeamIndex(
+                tournamentId
+            )
             if not tournamentData:
                 print("Impossible de récupérer les données du tournoi")
                 return None
@@ -48,37 +73,137 @@ class AIPlanningService:
                 print("Echec OpenAI")
                 return None
 
-            # sauvegarde via database service
+            # sauvegarde planning + matchs + poules (une transaction, tout ou rien)
             tournament = tournamentData["tournament"]
-            planning = self.databaseService.savePlanning(
-                tournamentId, aiResponse, tournament.tournament_type
+            details = (
+                tournamentId,
+                aiResponse,
+                tournament.tournament_type,
+                self._teamsMapping(tournamentData),
             )
+            if basePlanningId:
+                planning = self.databaseService.savePlanningRevision(
+                    basePlanningId, *details
+                )
+            else:
+                planning = self.databaseService.savePlanningWithDetails(*details)
 
             if not planning:
                 print("Echec sauvegarde planning")
                 return None
 
-            # sauvegarde les matchs
-            matches = self.databaseService.saveMatches(planning.id, aiResponse)
-            if matches is None:
-                print("Echec sauvegarde matchs - suppression planning")
-                self._deletePlanning(planning.id)
+            print(f"Planning genere : {planning.id}")
+            planningEventBroker.publish(planning.id, "generated", tournamentId)
+
+            return planning
+        except Exception as e:
+            print(f"Erreur generation planning: {e}")
+            return None
+
+    @unit_of_work_scope
+    async def generatePlanningAsync(
+        self, tournamentId: str, basePlanningId: Optional[str] = None
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Génère un planning complet pour un tournoi (accès Supabase asynchrones)
+
+        Même pipeline que generatePlanning, avec les mêmes requêtes: lecture du
+        tournoi et de l'empreinte des équipes, puis sauvegarde; ces étapes
+        dépendent l'une de l'autre et restent séquentielles. Une génération
+        n'est donc pas plus rapide qu'en synchrone: le gain est de ne pas
+        occuper de thread pendant les accès Supabase. Seul l'appel OpenAI
+        (client synchrone) est exécuté dans un thread.
+
+        Args:
+            tournamentId: ID du tournoi
+            basePlanningId: Version régénérée (sauvegarde différentielle,
+                voir generatePlanning)
+
+        Returns:
+            AITournamentPlanning si succès, None sinon
+        """
+        try:
+            tournamentData = (
+                await self.asyncTournamentService.getTournamentWithTeamIndex(
+                    tournamentId
+                )
+            )
+            if not tournamentData:
+                print("Impossible de récupérer les données du tournoi")
+                return None
+
+            if not self.tournamentService._validateTournamentData(tournamentData):
+                print("Tournament data non valide")
+                return None
+
+            prompt = self._buildStaticPrompt(tournamentData)
+
+            aiResponse = await asyncio.to_thread(
+                self.openAIService.generate_planning, prompt
+            )
+            if not aiResponse:
+                print("Echec OpenAI")
                 return None
 
-            # sauvegarde les poules
-            poules = self.databaseService.savePoules(planning.id, aiResponse)
-            if poules is None:
-                print("Echec sauvegarde poules - suppression planning")
-                self._deletePlanning(planning.id)
+            tournament = tournamentData["tournament"]
+            details = (
+                tournamentId,
+                aiResponse,
+                tournament.tournament_type,
+                self._teamsMapping(tournamentData),
+            )
+            if basePlanningId:
+                planning = await self.asyncDatabaseService.savePlanningRevision(
+                    basePlanningId, *details
+                )
+            else:
+                planning = await self.asyncDatabaseService.savePlanningWithDetails(
+                    *details
+                )
+            if not planning:
+                print("Echec sauvegarde planning")
                 return None
 
             print(f"Planning genere : {planning.id}")
+            planningEventBroker.publish(planning.id, "generated", tournamentId)
 
             return planning
         except Exception as e:
             print(f"Erreur generation planning: {e}")
             return None
 
+    async def generatePlannings(
+        self, tournamentIds: List[str], concurrency: int
+    ) -> AsyncIterator[Tuple[str, Optional[AITournamentPlanning]]]:
+        """
+        Génère les plannings de plusieurs tournois avec une concurrence bornée
+
+        Chaque génération s'exécute dans un thread: l'attente OpenAI d'un tournoi
+        se poursuit pendant que les lectures Supabase du suivant s'exécutent.
+
+        Args:
+            tournamentIds: IDs des tournois
+            concurrency: Nombre maximum de générations simultanées
+
+        Yields:
+            (tournament_id, planning ou None) dans l'ordre de fin des générations
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(tournamentId: str):
+            async with semaphore:
+                planning = await asyncio.to_thread(self.generatePlanning, tournamentId)
+                return tournamentId, planning
+
+        tasks = [asyncio.create_task(generate(tid)) for tid in tournamentIds]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Client déconnecté: on n'engage pas les générations en attente
+            for task in tasks:
+                task.cancel()
+
     def getPlanningStatus(self, planningId: str) -> Optional[str]:
         """
         Récupère le statut d'un planning
@@ -89,32 +214,153 @@ class AIPlanningService:
         Returns:
             Statut du planning ou None si erreur
         """
+        cached = planningStatusCache.get(planningId)
+        if cached is not MISSING:
+            return cached
+
+        # Planning complet déjà en cache (ou connu comme inexistant)
+        planning = planningCache.get(("planning", planningId))
+        if planning is None:
+            print("❌ Planning non trouvé (cache)")
+            return None
+        if planning is not MISSING:
+            return planning.status
+
         try:
             print(f"🔍 Vérification statut planning {planningId}")
+            return self._readPlanningStatus(planningId)
 
-            result = (
-                self.supabase.table("ai_tournament_planning")
-                .select("status")
-                .eq("id", planningId)
-                .execute()
-            )
+        except Exception as e:
+            print(f"❌ Erreur récupération statut: {e}")
+            return None
 
-            if not result.data:
-                print("❌ Planning non trouvé")
-                return None
+    def _readPlanningStatus(self, planningId: str) -> Optional[str]:
+        """
+        Statut lu en base, sans passer par les caches (qui sont mis à jour)
+
+        Returns:
+            Statut du planning ou None s'il n'existe pas
+
+        Raises:
+            Exception: si la lecture échoue
+        """
+        result = PLANNING_STATUS.select(self.supabase).eq("id", planningId).execute()
 
-            status = result.data[0]["status"]
-            print(f"✅ Statut: {status}")
-            return status
+        if not result.data:
+            print("❌ Planning non trouvé")
+            self.databaseService.cacheMissingPlanning(planningId)
+            return None
+
+        status = result.data[0]["status"]
+        planningStatusCache.set(planningId, status)
+        print(f"✅ Statut: {status}")
+        return status
+
+    async def waitForStatusChange(
+        self, planningId: str, knownStatus: str, timeout: float
+    ) -> Optional[str]:
+        """
+        Attend que le statut d'un planning diffère de celui connu du client
+
+        L'attente est réveillée par les notifications en mémoire (génération,
+        updatePlanningStatus, suppression), qui ne couvrent que ce processus:
+        le statut est aussi relu en base toutes les
+        STATUS_WAIT_RECHECK_INTERVAL secondes (écriture d'un autre worker).
+
+        Args:
+            planningId: ID du planning
+            knownStatus: Statut déjà connu du client
+            timeout: Durée maximale d'attente en secondes
+
+        Returns:
+            Nouveau statut, knownStatus si le timeout expire, None si non trouvé
+        """
+        # Abonnement avant la lecture: aucun changement ne peut être manqué
+        subscription = planningEventBroker.subscribe(planningId)
+        try:
+            status = self.getPlanningStatus(planningId)
+            if status != knownStatus:
+                return status
+
+            deadline = time.monotonic() + timeout
+            recheckAt = time.monotonic() + settings.STATUS_WAIT_RECHECK_INTERVAL
+            while True:
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    return knownStatus
+
+                if now >= recheckAt:
+                    recheckAt = now + settings.STATUS_WAIT_RECHECK_INTERVAL
+                    try:
+                        status = await asyncio.to_thread(
+                            self._readPlanningStatus, planningId
+                        )
+                    except Exception as e:
+                        print(f"❌ Erreur relecture statut: {e}")
+                    else:
+                        if status != knownStatus:
+                            return status
+                    continue
+
+                event = await subscription.get(timeout=min(remaining, recheckAt - now))
+                if event is not None and event["status"] != knownStatus:
+                    return event["status"]
+        finally:
+            planningEventBroker.unsubscribe(subscription)
+
+    def getPlanningStatuses(
+        self, planningIds: List[str]
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Récupère le statut de plusieurs plannings en une seule requête
+        (les statuts encore en cache ne sont pas relus)
+
+        Args:
+            planningIds: IDs des plannings
+
+        Returns:
+            dict: {planning_id: statut ou None si non trouvé}, None si erreur
+        """
+        try:
+            cached = planningStatusCache.get_many(planningIds)
+            statuses = {
+                planningId: cached.get(planningId) for planningId in planningIds
+            }
+
+            # Un ID qui n'est pas un UUID ne peut pas exister en base
+            missing = [
+                planningId
+                for planningId in statuses
+                if planningId not in cached and self._isUuid(planningId)
+            ]
+
+            if missing:
+                print(f"🔍 Vérification statut de {len(missing)} plannings")
+                result = (
+                    PLANNING_STATUSES.select(self.supabase).in_("id", missing).execute()
+                )
+                for row in result.data or []:
+                    statuses[row["id"]] = row["status"]
+                    planningStatusCache.set(row["id"], row["status"])
+
+            return statuses
 
         except Exception as e:
-            print(f"❌ Erreur récupération statut: {e}")
+            print(f"❌ Erreur récupération statuts: {e}")
             return None
 
+    @unit_of_work_scope
     def regeneratePlanning(self, planningId: str) -> Optional[AITournamentPlanning]:
         """
         Régénère un planning existant
 
+        La nouvelle version est générée à côté de l'actuelle, qui reste servie
+        jusqu'à la bascule atomique faite par la sauvegarde (et le reste si la
+        génération échoue). La bascule supprime les versions remplacées avant
+        l'actuelle (activate_planning): l'actuelle reste lisible par son ID
+        jusqu'à l'activation suivante.
+
         Args:
             planning_id: ID du planning à régénérer
 
@@ -130,11 +376,51 @@ class AIPlanningService:
                 print("❌ Planning original non trouvé")
                 return None
 
-            # Supprimer l'ancien planning
-            self._deletePlanning(planningId)
+            # Générer une nouvelle version (activée à la sauvegarde), écrite en
+            # différentiel par rapport à l'ancienne
+            new_planning = self.generatePlanning(
+                old_planning.tournament_id, basePlanningId=planningId
+            )
+
+            if new_planning:
+                print(f"✅ Planning régénéré: {new_planning.id}")
 
-            # Générer un nouveau planning
-            new_planning = self.generatePlanning(old_planning.tournament_id)
+            return new_planning
+
+        except Exception as e:
+            print(f"❌ Erreur régénération planning: {e}")
+            return None
+
+    async def regeneratePlanningAsync(
+        self, planningId: str
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Régénère un planning existant (accès Supabase asynchrones)
+
+        Même comportement que regeneratePlanning, sans bloquer la boucle
+        d'événements: seul l'appel OpenAI est exécuté dans un thread.
+
+        Args:
+            planningId: ID du planning à régénérer
+
+        Returns:
+            Nouveau planning généré ou None si erreur
+        """
+        try:
+            print(f"🔄 Régénération planning {planningId}")
+
+            old_planning = (
+                await self.asyncDatabaseService.getPlanningWithDetailsByPlanningId(
+                    planningId, fields=["tournament_id"]
+                )
+            )
+            if not old_planning:
+                print("❌ Planning original non trouvé")
+                return None
+
+            new_planning = await self.generatePlanningAsync(
+                old_planning["tournament_id"], basePlanningId=planningId
+            )
 
             if new_planning:
                 print(f"✅ Planning régénéré: {new_planning.id}")
@@ -202,40 +488,25 @@ class AIPlanningService:
         print("✅ Prompt statique construit")
         return prompt
 
-    def _deletePlanning(self, planningId: str) -> bool:
-        """Supprime un planning et ses détails"""
-        try:
-            # Supprimer d'abord les détails (tables liées)
-            self.supabase.table("ai_generated_match").delete().eq(
-                "planning_id", planningId
-            ).execute()
-            self.supabase.table("ai_generated_poule").delete().eq(
-                "planning_id", planningId
-            ).execute()
-
-            # Supprimer le planning principal
-            result = (
-                self.supabase.table("ai_tournament_planning")
-                .delete()
-                .eq("id", planningId)
-                .execute()
-            )
+    def _teamsMapping(self, tournamentData: Dict[str, Any]) -> Dict[str, str]:
+        """Noms d'équipes -> IDs, depuis les équipes déjà chargées avec le tournoi"""
+        index = tournamentData.get("team_index")
+        if index is not None:
+            return index
+        return {team.name: team.id for team in tournamentData["teams"]}
 
-            print(f"🗑️ Planning {planningId} supprimé")
+    def _isUuid(self, value: str) -> bool:
+        try:
+            uuid.UUID(value)
             return True
-
-        except Exception as e:
-            print(f"❌ Erreur suppression planning: {e}")
+        except ValueError:
             return False
 
     def _getPlanningById(self, planningId: str) -> Optional[AITournamentPlanning]:
-        """Récupère un planning par son ID"""
+        """Récupère un planning par son ID (sans planning_data)"""
         try:
             result = (
-                self.supabase.table("ai_tournament_planning")
-                .select("*")
-                .eq("id", planningId)
-                .execute()
+                PLANNING_SUMMARY.select(self.supabase).eq("id", planningId).execute()
             )
 
             if not result.data:
@@ -247,33 +518,41 @@ class AIPlanningService:
             print(f"❌ Erreur récupération planning: {e}")
             return None
 
-    def _deletePlanningByTournamentId(self, tournamentId: str) -> bool:
-        """Supprime tous les plannings d'un tournoi"""
+    def purgeTournamentPlannings(self, tournamentId: str) -> Optional[List[str]]:
+        """
+        Supprime tous les plannings d'un tournoi, matchs et poules compris
+
+        Un seul appel rpc (une instruction DELETE côté base, enfants supprimés
+        en cascade), quel que soit le nombre de plannings du tournoi.
+
+        Args:
+            tournamentId: ID du tournoi
+
+        Returns:
+            List[str]: IDs des plannings supprimés, ou None si erreur
+        """
         try:
-            # transaction pour supprimer les plannings et les matchs et les poules
-            self.supabase.transaction(
-                lambda tx: tx.table("ai_tournament_planning")
-                .delete()
-                .eq("tournament_id", tournamentId)
-                .execute()
-            )
-            self.supabase.transaction(
-                lambda tx: tx.table("ai_generated_match")
-                .delete()
-                .eq("planning_id", tournamentId)
-                .execute()
-            )
-            self.supabase.transaction(
-                lambda tx: tx.table("ai_generated_poule")
-                .delete()
-                .eq("planning_id", tournamentId)
-                .execute()
-            )
+            result = self.supabase.rpc(
+                PURGE_PLANNINGS_FUNCTION, {"p_tournament_id": tournamentId}
+            ).execute()
+            planningIds = result.data or []
 
-            return True
+            self.databaseService.invalidateTournamentPlannings(tournamentId)
+            self._forgetDeletedPlannings(tournamentId, planningIds)
+
+            print(
+                f"🗑️ {len(planningIds)} planning(s) du tournoi {tournamentId} supprimé(s)"
+            )
+            return planningIds
         except Exception as e:
-            print(f"❌ Erreur suppression planning: {e}")
-            return False
+            print(f"❌ Erreur purge des plannings du tournoi {tournamentId}: {e}")
+            return None
+
+    def _forgetDeletedPlannings(self, tournamentId: str, planningIds: List[str]):
+        """Invalide les caches des plannings supprimés et notifie les abonnés"""
+        for planningId in planningIds:
+            self.databaseService.invalidatePlanning(planningId)
+            planningEventBroker.publish(planningId, None, tournamentId)
 
 
 aiPlanningService = AIPlanningService()
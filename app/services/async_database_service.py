@@ -0,0 +1,503 @@
+import asyncio
+from typing import List, Optional, Tuple, Union
+
+from app.core.batching import async_call_with_retry, chunked
+from app.core.cache import MISSING
+from app.core.config import settings
+from app.core.database import getAsyncSupabase
+from app.core.team_index import load_team_index_async
+from app.core.unit_of_work import fetch_once_async
+from app.models.models import (
+    AIGeneratedMatch,
+    AIGeneratedPoule,
+    AIPlanningData,
+    AITournamentPlanning,
+)
+from app.services.database_service import PlanningRowsMixin
+
+
+class AsyncDatabaseService(PlanningRowsMixin):
+    """
+    Variante asynchrone de DatabaseService (client PostgREST async)
+
+    Mêmes méthodes publiques, en coroutines. Les requêtes, la construction
+    des lignes et les caches sont partagés avec DatabaseService
+    (PlanningRowsMixin); seules l'exécution des requêtes et la concurrence
+    sont propres à cette classe: les lectures et écritures indépendantes sont
+    lancées ensemble (asyncio.gather).
+    """
+
+    def __init__(self, supabase_client=None):
+        self.supabase = (
+            supabase_client if supabase_client is not None else getAsyncSupabase()
+        )
+
+    async def savePlanning(
+        self,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Sauvegarde le planning principal en DB (version inactive)
+
+        Args:
+            tournamentId: ID du tournoi
+            planningData: JSON complet de l'IA (dict ou AIPlanningData validé)
+            typeTournoi: Type de tournoi
+
+        Returns:
+            AITournamentPlanning: Planning créé ou None si erreur
+        """
+        try:
+            print(f"💾 Sauvegarde planning pour tournoi {tournamentId}")
+
+            planning_dict = self._buildPlanningRow(
+                tournamentId, planningData, typeTournoi
+            )
+            result = await self._insertPlanningQuery(planning_dict).execute()
+            return self._rememberInsertedPlanning(result.data[0])
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde : {e}")
+            return None
+
+    async def saveMatches(
+        self, planningId: str, planningData: Union[dict, AIPlanningData]
+    ) -> Optional[List[AIGeneratedMatch]]:
+        """
+        Sauvegarde tous les matchs en lot
+
+        Args:
+            planningId: ID du planning
+            planningData: Données JSON de l'IA (dict ou AIPlanningData validé)
+
+        Returns:
+            List[AIGeneratedMatch]: Matchs sauvegardés ou None si erreur
+        """
+        try:
+            print(f"Extraction et sauvegarde des matchs pour planning {planningId}")
+
+            teamsMapping = await self._getTeamsMapping(planningId)
+            if not teamsMapping:
+                raise Exception("Impossible de recuperer les equipes")
+
+            matchesDicts = self._buildMatchRows(planningId, planningData, teamsMapping)
+            if not matchesDicts:
+                print("Aucun match à sauvegarder")
+                return []
+
+            await self._insertMatchRows(planningId, matchesDicts)
+            print(f"{len(matchesDicts)} matchs sauvegardes en lot")
+            return [AIGeneratedMatch(**data) for data in matchesDicts]
+
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde des matchs: {e}")
+            return None
+
+    async def savePoules(
+        self, planningId: str, planningData: Union[dict, AIPlanningData]
+    ) -> Optional[List[AIGeneratedPoule]]:
+        """
+        Sauvegarde les poules en lot
+
+        Args:
+            planningId: ID du planning
+            planningData: Données JSON de l'IA (dict ou AIPlanningData validé)
+
+        Returns:
+            List[AIGeneratedPoule]: Poules sauvegardées ou None si erreur
+        """
+        try:
+            poulesDicts = self._buildPouleRows(planningId, planningData)
+            if not poulesDicts:
+                print("Pas de poules à sauvegarder")
+                return []
+
+            print(f"Sauvegarde de {len(poulesDicts)} poules")
+
+            result = await self._insertPoulesQuery(poulesDicts).execute()
+            print(f"{len(poulesDicts)} poules sauvegardees")
+            return [AIGeneratedPoule(**data) for data in result.data]
+
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde des poules {e}")
+            return None
+
+    async def saveMatchesAndPoules(
+        self, planningId: str, planningData: Union[dict, AIPlanningData]
+    ) -> Tuple[Optional[List[AIGeneratedMatch]], Optional[List[AIGeneratedPoule]]]:
+        """
+        Sauvegarde les matchs et les poules en parallèle (écritures indépendantes)
+
+        Returns:
+            (matchs, poules): chacun None en cas d'erreur
+        """
+        planningData = self._planningDataObject(planningData)
+        matches, poules = await asyncio.gather(
+            self.saveMatches(planningId, planningData),
+            self.savePoules(planningId, planningData),
+        )
+        return matches, poules
+
+    async def savePlanningWithDetails(
+        self,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+        teamsMapping: dict,
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Sauvegarde le planning, ses matchs et ses poules en un seul aller-retour
+        (fonction Postgres save_generated_planning, une seule transaction)
+
+        Args:
+            tournamentId: ID du tournoi
+            planningData: JSON complet de l'IA (dict ou AIPlanningData validé)
+            typeTournoi: Type de tournoi
+            teamsMapping: Noms d'équipes -> IDs (résolution des équipes des matchs)
+
+        Returns:
+            AITournamentPlanning: Planning créé ou None si erreur
+        """
+        try:
+            print(
+                f"💾 Sauvegarde planning + matchs + poules pour tournoi {tournamentId}"
+            )
+
+            params, matchRows, inChunks = self._chunkedDetailsParams(
+                self._planningDetailsParams(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                )
+            )
+
+            result = await self._savePlanningDetailsQuery(params).execute()
+            planning = self._rememberSavedPlanning(result.data)
+
+            if inChunks:
+                try:
+                    await self._insertMatchRows(planning.id, matchRows)
+                    planning = await self._activatePlanning(planning.id)
+                except Exception:
+                    await self._rollbackPlanning(planning.id)
+                    raise
+
+            return self._planningDetailsSaved(planning, matchRows, params)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde du planning complet : {e}")
+            return None
+
+    async def savePlanningRevision(
+        self,
+        basePlanningId: str,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+        teamsMapping: dict,
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Sauvegarde une régénération en n'envoyant que ce qui a changé
+        (voir DatabaseService.savePlanningRevision)
+
+        Args:
+            basePlanningId: ID de la version régénérée
+            tournamentId: ID du tournoi
+            planningData: JSON complet de l'IA (dict ou AIPlanningData validé)
+            typeTournoi: Type de tournoi
+            teamsMapping: Noms d'équipes -> IDs (résolution des équipes des matchs)
+
+        Returns:
+            AITournamentPlanning: Planning créé ou None si erreur
+        """
+        try:
+            base = await self._getPlanningChildren(basePlanningId)
+            if base is None:
+                print(f"⚠️ Version de base {basePlanningId} introuvable")
+                return await self.savePlanningWithDetails(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                )
+
+            revision = self._revisionParams(
+                basePlanningId,
+                base,
+                self._planningDetailsParams(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                ),
+            )
+            if revision is None:
+                return await self.savePlanningWithDetails(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                )
+
+            params, matchDiff = revision
+            result = await self._savePlanningRevisionQuery(params).execute()
+            return self._planningRevisionSaved(result.data, matchDiff)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde différentielle du planning : {e}")
+            return None
+
+    async def getPlanningWithDetailsByPlanningId(
+        self, planningId: str, fields: Optional[List[str]] = None
+    ) -> Optional[Union[AITournamentPlanning, dict]]:
+        """
+        Récupère un planning par son ID
+
+        Args:
+            planningId: ID du planning
+            fields: Colonnes à récupérer (optionnel, toutes par défaut).
+                Si fourni, retourne un dict limité à ces colonnes.
+
+        Returns:
+            AITournamentPlanning (ou dict si fields) ou None si erreur
+        """
+        if not fields:
+            cached = self._cachedPlanningById(planningId)
+            if cached is not MISSING:
+                return cached
+
+        try:
+            print(f"Recuperation planning {planningId}")
+
+            planningResult = await self._planningByIdQuery(planningId, fields).execute()
+            return self._planningFromRow(planningId, planningResult.data, fields)
+
+        except Exception as e:
+            self._planningReadFailed(planningId, e, fields)
+            return None
+
+    async def getPlanningWithDetailsByTournamentId(
+        self, tournamentId: str, fields: Optional[List[str]] = None
+    ) -> Optional[Union[AITournamentPlanning, dict]]:
+        """
+        Récupère la version active du planning d'un tournoi
+
+        Args:
+            tournamentId: ID du tournoi
+            fields: Colonnes à récupérer (optionnel, toutes par défaut).
+                Si fourni, retourne un dict limité à ces colonnes.
+
+        Returns:
+            voir DatabaseService.getPlanningWithDetailsByTournamentId
+        """
+        try:
+            if not fields:
+                cached = self._cachedPlanningByTournamentId(tournamentId)
+                if cached is not MISSING:
+                    if cached is None:
+                        print("Planning non trouve (cache)")
+                        return None
+                    self.rememberPlanningVersion(cached, active=True)
+                    return cached
+
+            print(f"Recuperation planning par tournoi {tournamentId}")
+
+            planningResult = await self._activePlanningQuery(
+                tournamentId, fields
+            ).execute()
+            return self._activePlanningFromRows(
+                tournamentId, planningResult.data, fields
+            )
+
+        except Exception as e:
+            raise Exception(f"Erreur recuperation planning par tournoi {e}")
+
+    async def updatePlanningStatus(self, planningId: str, newStatus: str) -> bool:
+        """
+        Met à jour le statut d'un planning
+
+        Args:
+            planningId: ID du planning
+            newStatus: Nouveau statut
+
+        Returns:
+            bool: Succès de l'opération
+        """
+        try:
+            print(f"Mise à jour statut planning {planningId} -> {newStatus}")
+            await self._updateStatusQuery(planningId, newStatus).execute()
+            self._planningStatusUpdated(planningId, newStatus)
+            return True
+
+        except Exception as e:
+            print(f"Erreur mise à jour planning: {e}")
+            return False
+
+    async def getMatchesPage(
+        self,
+        planningId: str,
+        limit: int = 50,
+        after: Optional[Tuple[str, str]] = None,
+        phase: Optional[str] = None,
+        terrain: Optional[int] = None,
+        pouleId: Optional[str] = None,
+        team: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Récupère une page de matchs d'un planning (voir DatabaseService.getMatchesPage)
+
+        Returns:
+            dict: {"items": List[AIGeneratedMatch], "next_cursor": str | None}
+            ou None si erreur
+        """
+        try:
+            query = self._matchesPageQuery(
+                planningId, limit, after, phase, terrain, pouleId, team
+            )
+            result = await query.execute()
+            return self._matchesPage(result.data, limit)
+
+        except Exception as e:
+            print(f"Erreur recuperation matchs du planning {planningId}: {e}")
+            return None
+
+    async def getPlanningMatches(
+        self, planningId: str
+    ) -> Optional[List[AIGeneratedMatch]]:
+        """
+        Récupère tous les matchs d'un planning, dans l'ordre chronologique
+
+        Returns:
+            List[AIGeneratedMatch]: Matchs du planning ou None si erreur
+        """
+        try:
+            result = await self._planningMatchesQuery(planningId).execute()
+            return [AIGeneratedMatch(**row) for row in result.data or []]
+
+        except Exception as e:
+            print(f"Erreur recuperation matchs du planning {planningId}: {e}")
+            return None
+
+    async def getPlanningVersionByPlanningId(self, planningId: str) -> Optional[dict]:
+        """
+        Récupère la version d'un planning (id + updated_at), depuis le cache si possible
+
+        Returns:
+            dict: {"id": str, "updated_at": str} ou None si non trouvé
+        """
+        cached = self._cachedPlanningVersion(planningId)
+        if cached is not None:
+            return cached
+
+        try:
+            result = await self._planningVersionQuery(planningId).execute()
+            return self._rememberVersionRow(result.data)
+
+        except Exception as e:
+            print(f"Erreur recuperation version planning {e}")
+            return None
+
+    async def getPlanningVersionByTournamentId(
+        self, tournamentId: str
+    ) -> Optional[dict]:
+        """
+        Récupère la version du planning d'un tournoi, depuis le cache si possible
+
+        Returns:
+            dict: {"id": str, "updated_at": str} ou None si non trouvé
+        """
+        cached = self._cachedTournamentVersion(tournamentId)
+        if cached is not None:
+            return cached
+
+        try:
+            result = await self._tournamentVersionQuery(tournamentId).execute()
+            return self._rememberVersionRow(result.data, tournamentId)
+
+        except Exception as e:
+            print(f"Erreur recuperation version planning par tournoi {e}")
+            return None
+
+    async def activatePlanning(self, planningId: str) -> Optional[AITournamentPlanning]:
+        """
+        Fait d'un planning sauvegardé la version active de son tournoi
+
+        Returns:
+            AITournamentPlanning: Planning activé ou None si erreur
+        """
+        try:
+            return await self._activatePlanning(planningId)
+        except Exception as e:
+            print(f"❌ Erreur activation du planning {planningId}: {e}")
+            return None
+
+    async def _activatePlanning(self, planningId: str) -> AITournamentPlanning:
+        result = await self._activatePlanningQuery(planningId).execute()
+        return self._rememberSavedPlanning(result.data)
+
+    async def _getPlanningChildren(self, planningId: str) -> Optional[dict]:
+        """Clés et empreintes des matchs et poules d'une version (voir le service sync)"""
+        result = await self._planningChildrenQuery(planningId).execute()
+        return result.data[0] if result.data else None
+
+    async def _insertMatchRows(self, planningId: str, matchRows: List[dict]) -> None:
+        """
+        Insère les matchs par lots concurrents (voir DatabaseService._insertMatchRows)
+
+        Raises:
+            Exception: erreur du premier lot en échec, après annulation
+        """
+        chunks = chunked(matchRows, settings.MATCH_INSERT_CHUNK_SIZE)
+        if len(chunks) == 1:
+            await self._insertMatchChunk(chunks[0])
+            return
+
+        semaphore = asyncio.Semaphore(settings.MATCH_INSERT_CONCURRENCY)
+        errors = []
+
+        async def insert(chunk: List[dict]) -> None:
+            async with semaphore:
+                if errors:
+                    return  # un lot a déjà échoué: inutile d'envoyer les suivants
+                try:
+                    await self._insertMatchChunk(chunk)
+                except Exception as e:
+                    errors.append(e)
+
+        await asyncio.gather(*(insert(chunk) for chunk in chunks))
+
+        if errors:
+            print(f"❌ Lot de matchs en échec - annulation des {len(chunks)} lots")
+            await self._deleteMatchRows(planningId)
+            raise errors[0]
+
+    async def _insertMatchChunk(self, chunk: List[dict]) -> None:
+        await async_call_with_retry(
+            lambda: self._insertMatchChunkQuery(chunk).execute(),
+            settings.MATCH_INSERT_RETRIES,
+            settings.MATCH_INSERT_RETRY_DELAY,
+        )
+
+    async def _deleteMatchRows(self, planningId: str) -> None:
+        try:
+            await self._deleteMatchRowsQuery(planningId).execute()
+        except Exception as e:
+            print(f"❌ Erreur annulation des matchs du planning {planningId}: {e}")
+
+    async def _rollbackPlanning(self, planningId: str) -> None:
+        try:
+            await self._deletePlanningQuery(planningId).execute()
+        except Exception as e:
+            print(f"❌ Erreur annulation du planning {planningId}: {e}")
+        self.invalidatePlanning(planningId)
+
+    async def _getTeamsMapping(self, planningId) -> dict:
+        try:
+            tournamentId = await fetch_once_async(
+                "planning_tournament",
+                planningId,
+                lambda: self._selectPlanningTournamentId(planningId),
+            )
+            return await fetch_once_async(
+                "team_index",
+                tournamentId,
+                lambda: load_team_index_async(self.supabase, tournamentId),
+            )
+        except Exception as e:
+            print(f"Erreur recuperation teams mapping: {e}")
+            return {}
+
+    async def _selectPlanningTournamentId(self, planningId: str) -> str:
+        result = await self._planningTournamentQuery(planningId).execute()
+        return result.data["tournament_id"]
+
+
+asyncDatabaseService = AsyncDatabaseService()
@@ -0,0 +1,175 @@
+from typing import Any, Dict, List, Optional
+
+from app.core.database import getAsyncSupabase
+from app.core.team_index import embedded_team_fingerprint, load_team_index_async
+from app.core.unit_of_work import fetch_once_async
+from app.models.models import Team, Tournament
+from app.services.tournament_service import TournamentRowsMixin
+
+
+class AsyncTournamentService(TournamentRowsMixin):
+    """
+    Variante asynchrone de TournamentService (client PostgREST async)
+
+    Mêmes méthodes publiques, en coroutines; requêtes et construction des
+    objets viennent de TournamentRowsMixin. Le tournoi et ses équipes sont
+    lus en une requête (équipes embarquées).
+    """
+
+    def __init__(self, supabase_client=None):
+        """
+        Args:
+            supabase_client: Client Supabase async (optionnel, getAsyncSupabase() par défaut)
+        """
+        self.supabase = (
+            supabase_client if supabase_client is not None else getAsyncSupabase()
+        )
+
+    async def getTournamentById(self, tournamentId: str) -> Optional[Tournament]:
+        """
+        Récupère un tournoi par son ID
+
+        Args:
+            tournamentId: ID du tournoi
+
+        Returns:
+            Tournament: Objet Tournament ou None si pas trouvé
+        """
+        try:
+            print(f"🔍 Récupération tournoi {tournamentId}")
+
+            tournamentData = await self._getTournamentRow(tournamentId)
+            if not tournamentData:
+                print(f"❌ Tournoi {tournamentId} non trouvé")
+                return None
+
+            tournament, _ = self._buildTournamentWithTeams(tournamentData)
+            print(f"✅ Tournoi récupéré: {tournament.name}")
+            return tournament
+
+        except Exception as e:
+            print(f"❌ Erreur récupération tournoi {tournamentId}: {e}")
+            return None
+
+    async def getTournamentTeams(self, tournamentId: str) -> List[Team]:
+        """
+        Récupère toutes les équipes d'un tournoi
+
+        Args:
+            tournamentId: ID du tournoi
+
+        Returns:
+            List[Team]: Liste des équipes (vide si aucune)
+        """
+        try:
+            print(f"👥 Récupération équipes du tournoi {tournamentId}")
+
+            teamRows = await fetch_once_async(
+                "team", tournamentId, lambda: self._selectTeamRows(tournamentId)
+            )
+
+            teams = self._buildTeams(teamRows)
+
+            print(f"✅ {len(teams)} équipes récupérées")
+            return teams
+
+        except Exception as e:
+            print(f"❌ Erreur récupération équipes: {e}")
+            return []
+
+    async def getTournamentWithTeams(
+        self, tournamentId: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Récupère un tournoi avec ses équipes (une seule requête)
+
+        Args:
+            tournamentId: ID du tournoi
+
+        Returns:
+            dict: {"tournament": Tournament, "teams": List[Team]} ou None si erreur
+        """
+        try:
+            print(f"🔍 Récupération tournoi + équipes {tournamentId}")
+
+            tournamentData = await self._getTournamentRow(tournamentId)
+            if not tournamentData:
+                return None
+
+            tournament, teams = self._buildTournamentWithTeams(tournamentData)
+            return self._tournamentWithTeams(tournament, teams)
+
+        except Exception as e:
+            print(f"❌ Erreur récupération tournoi avec équipes: {e}")
+            return None
+
+    async def getTournamentWithTeamIndex(
+        self, tournamentId: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Récupère un tournoi avec l'index de ses équipes (génération)
+
+        Args:
+            tournamentId: ID du tournoi
+
+        Returns:
+            dict: voir TournamentService.getTournamentWithTeamIndex, ou None si erreur
+        """
+        try:
+            print(f"🔍 Récupération tournoi + index des équipes {tournamentId}")
+
+            tournamentData = await fetch_once_async(
+                "tournament_fingerprint",
+                tournamentId,
+                lambda: self._selectTournamentFingerprint(tournamentId),
+            )
+            if not tournamentData:
+                print(f"❌ Tournoi {tournamentId} non trouvé")
+                return None
+
+            index = await fetch_once_async(
+                "team_index",
+                tournamentId,
+                lambda: load_team_index_async(
+                    self.supabase,
+                    tournamentId,
+                    embedded_team_fingerprint(tournamentData),
+                ),
+            )
+            return self._tournamentWithTeamIndex(tournamentData, index)
+
+        except Exception as e:
+            print(f"❌ Erreur récupération tournoi avec index des équipes: {e}")
+            return None
+
+    async def _getTournamentRow(self, tournamentId: str) -> Optional[dict]:
+        """
+        Ligne du tournoi avec ses équipes embarquées sous "team"
+        (lue une fois par traitement)
+        """
+        try:
+            tournamentData = await fetch_once_async(
+                "tournament",
+                tournamentId,
+                lambda: self._selectTournamentRow(tournamentId),
+            )
+            self._rememberTeamRows(tournamentId, tournamentData)
+            return tournamentData
+        except Exception as e:
+            print(f"❌ Erreur récupération tournoi {tournamentId}: {e}")
+            return None
+
+    async def _selectTournamentRow(self, tournamentId: str) -> Optional[dict]:
+        result = await self._tournamentRowQuery(tournamentId).execute()
+        return result.data
+
+    async def _selectTournamentFingerprint(self, tournamentId: str) -> Optional[dict]:
+        result = await self._tournamentFingerprintQuery(tournamentId).execute()
+        return result.data
+
+    async def _selectTeamRows(self, tournamentId: str) -> List[dict]:
+        result = await self._teamRowsQuery(tournamentId).execute()
+        return result.data
+
+
+asyncTournamentService = AsyncTournamentService()
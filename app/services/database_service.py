@@ -1,8 +1,29 @@
 import uuid
-from datetime import datetime
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Union
 
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+from app.core.batching import call_with_retry, chunked
+from app.core.cache import MISSING, SQLiteCache, TTLCache, TwoTierCache
+from app.core.config import settings
 from app.core.database import getSupabase
+from app.core.events import planningEventBroker
+from app.core.metrics import metrics
+from app.core.pagination import encode_cursor, quote_filter_value
+from app.core.planning_storage import encode_planning_data
+from app.core.queries import (
+    MATCHES,
+    PLANNING,
+    PLANNING_CHILDREN,
+    PLANNING_TOURNAMENT,
+    PLANNING_VERSION,
+)
+from app.core.row_diff import DuplicateKeyError, RowDiff, content_hash, diff_rows
+from app.core.team_index import TeamIndex, load_team_index
+from app.core.unit_of_work import fetch_once, remember
 from app.models.models import (
     AIGeneratedMatch,
     AIGeneratedPoule,
@@ -11,292 +32,314 @@ from app.models.models import (
     Match,
 )
 
+# Colonnes toujours lues avec un planning pour pouvoir calculer son ETag
+PLANNING_VERSION_FIELDS = ["id", "tournament_id", "updated_at"]
+
+# Fonction Postgres de sauvegarde transactionnelle planning + matchs + poules
+# (supabase/migrations/20261019100000_save_generated_planning_function.sql)
+SAVE_PLANNING_FUNCTION = "save_generated_planning"
+
+# Fonction Postgres de suppression de tous les plannings d'un tournoi
+# (supabase/migrations/20261019120000_purge_tournament_plannings_function.sql)
+PURGE_PLANNINGS_FUNCTION = "purge_tournament_plannings"
+
+# Versions de planning (supabase/migrations/20261019130000_versioned_plannings.sql):
+# bascule de la version active d'un tournoi et suppression des versions
+# remplacées, dans la même transaction
+# (supabase/migrations/20261019170000_collect_versions_on_activation.sql),
+# ordonnées par une séquence de la base
+# (supabase/migrations/20261019200000_planning_version_order.sql)
+ACTIVATE_PLANNING_FUNCTION = "activate_planning"
+
+# Sauvegarde différentielle d'une régénération (lignes modifiées seulement)
+# (supabase/migrations/20261019140000_save_planning_revision_function.sql)
+SAVE_PLANNING_REVISION_FUNCTION = "save_planning_revision"
+
+# Colonnes propres à une version de planning, ignorées pour comparer des lignes
+VERSION_COLUMNS = {"id", "planning_id", "created_at", "row_hash"}
+
+# Cache des versions de planning (id + updated_at) pour les ETags
+# Clés: ("planning", planning_id) -> updated_at
+#       ("tournament", tournament_id) -> planning_id de la version active
+planningVersionCache = TTLCache(maxsize=4096, ttl=settings.PLANNING_VERSION_CACHE_TTL)
+
+# Cache court des statuts de planning: planning_id -> status
+planningStatusCache = TTLCache(maxsize=4096, ttl=settings.STATUS_CACHE_TTL)
+
+
+def _encodeCachedPlanning(value):
+    if isinstance(value, AITournamentPlanning):
+        return {
+            **value.model_dump(mode="json"),
+            "planning_data_compressed": value.planning_data_compressed,
+        }
+    return value
+
+
+def _decodeCachedPlanning(value):
+    if isinstance(value, dict):
+        return AITournamentPlanning(**value)
+    return value
+
+
+# Plannings complets (lecture seule une fois générés, sauf le statut)
+# Clés: ("planning", planning_id) -> AITournamentPlanning, ou None si inexistant
+#       ("tournament", tournament_id) -> planning_id, ou None si pas de planning
+# Second niveau SQLite partagé entre les workers si PLANNING_CACHE_SQLITE_PATH
+# (une invalidation est alors vue par tous les workers, cf. TwoTierCache)
+planningCache = TwoTierCache(
+    "planning",
+    TTLCache(
+        maxsize=settings.PLANNING_CACHE_MAX_ENTRIES,
+        ttl=settings.PLANNING_CACHE_LOCAL_TTL,
+    ),
+    shared=(
+        SQLiteCache(
+            settings.PLANNING_CACHE_SQLITE_PATH, ttl=settings.PLANNING_CACHE_SHARED_TTL
+        )
+        if settings.PLANNING_CACHE_SQLITE_PATH
+        else None
+    ),
+    encode=_encodeCachedPlanning,
+    decode=_decodeCachedPlanning,
+)
 
-class DatabaseService:
-    def __init__(self):
-        self.supabase = getSupabase()
-
-    def savePlanning(
-        self, tournamentId: str, planningData: dict, typeTournoi: str
-    ) -> Optional[AITournamentPlanning]:
-        """
-        Sauvegarde le planning principal en DB
-
-        Args:
-            tournament_id: ID du tournoi
-            planning_data: JSON complet de l'IA
-            type_tournoi: Type de tournoi
-
-        Returns:
-            AITournamentPlanning: Planning créé ou None si erreur
-        """
-        try:
-            print(f"💾 Sauvegarde planning pour tournoi {tournamentId}")
-
-            # Générer ID unique
-            planning_id = str(uuid.uuid4())
-
-            # Valider les données avec Pydantic
-            ai_planning_data = AIPlanningData(**planningData)
-            total_matches = ai_planning_data.calculate_total_matches()
-
-            # Créer l'objet Planning
-            planning_obj = AITournamentPlanning(
-                id=planning_id,
-                tournament_id=tournamentId,
-                type_tournoi=typeTournoi,
-                status="generated",
-                planning_data=planningData,
-                total_matches=total_matches,
-                ai_comments=ai_planning_data.commentaires,
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
-            )
+# Code PostgREST d'un .single() sans ligne
+NO_ROW_ERROR = "PGRST116"
 
-            # Convertir en dict pour Supabase
-            planning_dict = planning_obj.model_dump()
-            planning_dict["created_at"] = planning_dict["created_at"].isoformat()
-            planning_dict["updated_at"] = planning_dict["updated_at"].isoformat()
 
-            # Sauvegarder
-            result = (
-                self.supabase.table("ai_tournament_planning")
-                .insert(planning_dict)
-                .execute()
-            )
+class PlanningRowsMixin:
+    """
+    Lignes, requêtes et caches d'un planning, partagés par DatabaseService et
+    AsyncDatabaseService
 
-            print(f"✅ Planning {planning_id} sauvegardé ({total_matches} matchs)")
+    Les requêtes sont construites sur self.supabase sans être exécutées: chaque
+    service n'ajoute que l'exécution (synchrone ou awaitée) et sa gestion
+    d'erreur, la construction des lignes et le traitement des réponses sont ici.
+    """
 
-            # Retourner l'objet Planning créé
-            return AITournamentPlanning(**result.data[0])
-        except Exception as e:
-            print(f"Erreur lors de la sauvegarde : {e}")
-            return None
-
-    def saveMatches(
-        self, planningId: str, planningData: dict
-    ) -> Optional[List[AIGeneratedMatch]]:
+    def rememberPlanningVersion(
+        self, planning: Union[AITournamentPlanning, dict], active: bool = False
+    ) -> None:
         """
-        Sauvegarde tous les matchs en lot
+        Met en cache la version d'un planning qui vient d'être lu ou écrit
 
         Args:
-            planning_id: ID du planning
-            planning_data: Données JSON de l'IA
-
-        Returns:
-            List[AIGeneratedMatch]: Matchs sauvegardés ou None si erreur
+            planning: Planning ou ligne partielle (id, tournament_id, updated_at)
+            active: Version active du tournoi d'après la base (activation ou
+                lecture par tournoi); seule celle-ci est associée au tournoi.
+                Jamais déduit du champ is_active d'un objet en cache.
         """
-
-        try:
-            print(f"Extraction et sauvegarde des matchs pour planning {planningId}")
-
-            teamsMapping = self._getTeamsMapping(planningId)
-            if not teamsMapping:
-                raise Exception("Impossible de recuperer les equipes")
-
-            allMatches = []
-            aiPlanningData = AIPlanningData(**planningData)
-
-            roundRobinMatches = self._extractRoundRobinMatches(
-                planningId, aiPlanningData, teamsMapping
-            )
-            allMatches.extend(roundRobinMatches)
-
-            poulesMatches = self._extractPoulesMatches(
-                planningId, aiPlanningData, teamsMapping
+        if isinstance(planning, AITournamentPlanning):
+            planning = {
+                "id": planning.id,
+                "tournament_id": planning.tournament_id,
+                "updated_at": planning.updated_at,
+            }
+        if not planning.get("id") or not planning.get("updated_at"):
+            return
+        planningVersionCache.set(("planning", planning["id"]), planning["updated_at"])
+        if active and planning.get("tournament_id"):
+            planningVersionCache.set(
+                ("tournament", planning["tournament_id"]), planning["id"]
             )
-            allMatches.extend(poulesMatches)
-
-            eliminationMatches = self._extractEliminationMatches(
-                planningId, aiPlanningData, teamsMapping
-            )
-            allMatches.extend(eliminationMatches)
-
-            if allMatches:
-                matchesDicts = []
-                for match in allMatches:
-                    matchDict = match.model_dump()
-                    matchDict["created_at"] = matchDict["created_at"].isoformat()
-                    matchDict["debut_horaire"] = matchDict["debut_horaire"].isoformat()
-                    matchDict["fin_horaire"] = matchDict["fin_horaire"].isoformat()
-
-                    matchesDicts.append(matchDict)
-
-                result = (
-                    self.supabase.table("ai_generated_match")
-                    .insert(matchesDicts)
-                    .execute()
-                )
-                print(f"{len(allMatches)} matchs sauvegardes en lot")
-                print(f"result : {result.data}")
-                return [AIGeneratedMatch(**data) for data in result.data]
-
-            else:
-                print("Aucun match à sauvegarder")
-                return []
 
-        except Exception as e:
-            print(f"Erreur lors de la sauvegarde des matchs: {e}")
-            return None
-
-    def savePoules(
-        self, planningId: str, planningData: dict
-    ) -> Optional[List[AIGeneratedPoule]]:
+    def invalidatePlanning(self, planningId: str) -> None:
         """
-        Sauvegarde les poules en lot
-
-        Args:
-            planning_id: ID du planning
-            planning_data: Données JSON de l'IA
-
-        Returns:
-            List[AIGeneratedPoule]: Poules sauvegardées ou None si erreur
+        Invalide la version, le statut et le planning en cache d'un planning
+        modifié ou supprimé
         """
+        planningVersionCache.delete(("planning", planningId))
+        planningStatusCache.delete(planningId)
+        # Un pointeur ("tournament", id) vers ce planning devient un défaut de cache
+        planningCache.delete(("planning", planningId))
 
-        try:
-            aiPlanningData = AIPlanningData(**planningData)
-
-            if not aiPlanningData.poules:
-                print("Pas de poules à sauvegarder")
-                return []
-
-            print(f"Sauvegarde de {len(aiPlanningData.poules)} poules")
-
-            allPoules = []
-
-            for poule in aiPlanningData.poules:
-                pouleObj = AIGeneratedPoule(
-                    id=str(uuid.uuid4()),
-                    planning_id=planningId,
-                    poule_id=poule.poule_id,
-                    nom_poule=poule.nom_poule,
-                    equipes=poule.equipes,
-                    nb_equipes=len(poule.equipes),
-                    nb_matches=len(poule.matchs),
-                    created_at=datetime.now(),
-                )
-                allPoules.append(pouleObj)
-
-            if allPoules:
-                poulesDicts = []
-                for poule in allPoules:
-                    pouleDict = poule.model_dump()
-                    pouleDict["created_at"] = pouleDict["created_at"].isoformat()
-                    poulesDicts.append(pouleDict)
-
-                result = (
-                    self.supabase.table("ai_generated_poule")
-                    .insert(poulesDicts)
-                    .execute()
-                )
-                print(f"{len(allPoules)} poules sauvegardees")
-
-                return [AIGeneratedPoule(**data) for data in result.data]
-            else:
-                return []
-
-        except Exception as e:
-            print(f"Erreur lors de la sauvegarde des poules {e}")
+    def _rememberSavedPlanning(self, data: dict) -> AITournamentPlanning:
+        """
+        Met en cache le planning renvoyé par une sauvegarde ou une activation
 
-    def getPlanningWithDetailsByPlanningId(self, planningId: str) -> Optional[dict]:
+        Les versions que l'activation vient de désactiver (deactivated_ids)
+        sont oubliées: leur entrée en cache se dit encore active. Celles
+        qu'elle a supprimées (collected_ids) sont aussi notifiées aux abonnés.
         """
-        Récupère un planning avec tous ses détails
+        planning = AITournamentPlanning(**data)
+        for planningId in data.get("deactivated_ids") or []:
+            self.invalidatePlanning(planningId)
+        for planningId in data.get("collected_ids") or []:
+            self.invalidatePlanning(planningId)
+            planningEventBroker.publish(planningId, None, planning.tournament_id)
+        self.rememberPlanningVersion(planning, active=planning.is_active)
+        self.cachePlanning(planning, active=planning.is_active)
+        return planning
+
+    def cachePlanning(
+        self, planning: AITournamentPlanning, active: bool = False
+    ) -> None:
+        """
+        Met en cache un planning complet qui vient d'être lu ou écrit
 
         Args:
-            planningId: ID du planning
-
-        Returns:
-            dict: {
-            "planning": AITournamentPlanning,
-            "matches": List[AIGeneratedMatch],
-            "poules": List[AIGeneratedPoule]
-            } ou None si erreur
+            active: Version active du tournoi d'après la base (activation ou
+                lecture par tournoi); jamais déduit d'un objet en cache
         """
-        try:
-            print(f"Recuperation planning {planningId}")
-
-            planningResult = (
-                self.supabase.table("ai_tournament_planning")
-                .select("*")
-                .eq("id", planningId)
-                .single()
-                .execute()
+        if not planning.id:
+            return
+        planningCache.set(("planning", planning.id), planning)
+        if active:
+            planningCache.set(("tournament", planning.tournament_id), planning.id)
+
+    def _planningDataObject(
+        self, planningData: Union[dict, AIPlanningData]
+    ) -> AIPlanningData:
+        """JSON de l'IA validé, sans nouvelle validation s'il l'est déjà"""
+        if isinstance(planningData, AIPlanningData):
+            return planningData
+        return AIPlanningData(**planningData)
+
+    def _buildPlanningRow(
+        self,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+    ) -> dict:
+        """Construit la ligne ai_tournament_planning d'un nouveau planning"""
+        # Générer ID unique
+        planning_id = str(uuid.uuid4())
+
+        # Valider les données avec Pydantic (si ce n'est pas déjà fait)
+        ai_planning_data = self._planningDataObject(planningData)
+        total_matches = ai_planning_data.calculate_total_matches()
+        if isinstance(planningData, AIPlanningData):
+            planningData = planningData.to_planning_data()
+
+        # planning_data compressé dans sa propre colonne si configuré
+        planningDataCompressed = None
+        if settings.PLANNING_DATA_COMPRESSION:
+            planningDataCompressed = encode_planning_data(
+                planningData, settings.PLANNING_DATA_COMPRESSION
             )
-            if not planningResult.data:
-                print("Planning non trouve")
-                return None
-            planningObj = AITournamentPlanning(**planningResult.data)
-
-            # matchesResult = self.supabase.table("ai_generated_match")\
-            #     .select("*")\
-            #     .eq("planning_id", planningId)\
-            #     .order("debut_horaire")\
-            #     .execute()
-            # matchesObj = [AIGeneratedMatch(**matchData) for matchData in matchesResult.data or []]
-
-            # poulesResult = self.supabase.table("ai_generated_poule")\
-            #     .select("*")\
-            #     .eq("planning_id", planningId)\
-            #     .execute()
-            # poulesObj = [AIGeneratedPoule(**pouleData) for pouleData in poulesResult.data or []]
-
-            return planningObj
-
-        except Exception as e:
-            print(f"Erreur recuperation planning {e}")
-            return None
-
-    def getPlanningWithDetailsByTournamentId(self, tournamentId: str) -> Optional[dict]:
-        """
-        Récupère un planning avec tous ses détails par l'ID du tournoi
+            planningData = {}
+
+        # Créer l'objet Planning
+        planning_obj = AITournamentPlanning(
+            id=planning_id,
+            tournament_id=tournamentId,
+            type_tournoi=typeTournoi,
+            status="generated",
+            planning_data=planningData,
+            planning_data_compressed=planningDataCompressed,
+            total_matches=total_matches,
+            ai_comments=ai_planning_data.commentaires,
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+        )
+
+        # Convertir en dict pour Supabase
+        planning_dict = planning_obj.model_dump()
+        planning_dict["planning_data_compressed"] = planningDataCompressed
+        planning_dict["created_at"] = planning_dict["created_at"].isoformat()
+        planning_dict["updated_at"] = planning_dict["updated_at"].isoformat()
+        return planning_dict
+
+    def _planningDetailsParams(
+        self,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+        teamsMapping: dict,
+    ) -> dict:
+        """Paramètres de la fonction save_generated_planning"""
+        if not teamsMapping:
+            raise Exception("Impossible de recuperer les equipes")
+
+        # Une seule validation pour le planning, les matchs et les poules
+        planningData = self._planningDataObject(planningData)
+
+        planning_dict = self._buildPlanningRow(tournamentId, planningData, typeTournoi)
+        planningId = planning_dict["id"]
+        return {
+            "p_planning": planning_dict,
+            "p_matches": self._buildMatchRows(planningId, planningData, teamsMapping),
+            "p_poules": self._buildPouleRows(planningId, planningData),
+        }
+
+    def _comparableRow(self, model, row: dict) -> dict:
         """
-        try:
-            print(f"Recuperation planning par tournoi {tournamentId}")
-
-            planningResult = (
-                self.supabase.table("ai_tournament_planning")
-                .select("*")
-                .eq("tournament_id", tournamentId)
-                .limit(1)
-                .execute()
-            )
-
-            print(f"planningResult: {planningResult.data}")
-
-            if not planningResult.data or len(planningResult.data) == 0:
-                raise Exception("Planning non trouve")
-
-            return AITournamentPlanning(**planningResult.data[0])
+        Contenu d'une ligne de match ou de poule, comparable entre versions
 
-        except Exception as e:
-            raise Exception(f"Erreur recuperation planning par tournoi {e}")
-
-    def updatePlanningStatus(self, planningId: str, newStatus: str) -> bool:
+        Les colonnes propres à une version (id, planning_id, created_at,
+        row_hash) sont ignorées; les horaires lus en timestamptz sont ramenés en UTC naïf
+        comme ceux construits depuis le JSON de l'IA.
         """
-        Met à jour le statut d'un planning
+        values = model(**row).model_dump(exclude=VERSION_COLUMNS)
+        for name, value in values.items():
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                values[name] = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return values
 
-        Args:
-            planningId: ID du planning
-            newStatus: Nouveau statut
+    def _rowHash(self, model, row: dict) -> str:
+        """Empreinte stockée avec la ligne (row_hash), comparée aux régénérations"""
+        return content_hash(self._comparableRow(model, row))
 
-        Returns:
-            bool: Succès de l'opération
-        """
-        try:
-            print(f"Mise à jour statut planning {planningId} -> {newStatus}")
-            result = (
-                self.supabase.table("ai_tournament_planning")
-                .update({"status": newStatus, "updated_at": datetime.now().isoformat()})
-                .eq("id", planningId)
-                .execute()
+    def _buildMatchRows(
+        self,
+        planningId: str,
+        planningData: Union[dict, AIPlanningData],
+        teamsMapping: dict,
+    ) -> List[dict]:
+        """Construit les lignes ai_generated_match de tous les matchs du planning"""
+        allMatches = []
+        aiPlanningData = self._planningDataObject(planningData)
+
+        roundRobinMatches = self._extractRoundRobinMatches(
+            planningId, aiPlanningData, teamsMapping
+        )
+        allMatches.extend(roundRobinMatches)
+
+        poulesMatches = self._extractPoulesMatches(
+            planningId, aiPlanningData, teamsMapping
+        )
+        allMatches.extend(poulesMatches)
+
+        eliminationMatches = self._extractEliminationMatches(
+            planningId, aiPlanningData, teamsMapping
+        )
+        allMatches.extend(eliminationMatches)
+
+        matchesDicts = []
+        for match in allMatches:
+            matchDict = match.model_dump()
+            matchDict["created_at"] = matchDict["created_at"].isoformat()
+            matchDict["debut_horaire"] = matchDict["debut_horaire"].isoformat()
+            matchDict["fin_horaire"] = matchDict["fin_horaire"].isoformat()
+            matchDict["row_hash"] = self._rowHash(AIGeneratedMatch, matchDict)
+
+            matchesDicts.append(matchDict)
+        return matchesDicts
+
+    def _buildPouleRows(
+        self, planningId: str, planningData: Union[dict, AIPlanningData]
+    ) -> List[dict]:
+        """Construit les lignes ai_generated_poule des poules du planning"""
+        aiPlanningData = self._planningDataObject(planningData)
+
+        poulesDicts = []
+        for poule in aiPlanningData.poules:
+            pouleObj = AIGeneratedPoule(
+                id=str(uuid.uuid4()),
+                planning_id=planningId,
+                poule_id=poule.poule_id,
+                nom_poule=poule.nom_poule,
+                equipes=poule.equipes,
+                nb_equipes=len(poule.equipes),
+                nb_matches=len(poule.matchs),
+                created_at=datetime.now(),
             )
-
-            print("Statut mis à jour")
-            return True
-
-        except Exception as e:
-            print(f"Erreur mise à jour planning: {e}")
-            return False
+            pouleDict = pouleObj.model_dump()
+            pouleDict["created_at"] = pouleDict["created_at"].isoformat()
+            pouleDict["row_hash"] = self._rowHash(AIGeneratedPoule, pouleDict)
+            poulesDicts.append(pouleDict)
+        return poulesDicts
 
     def _extractRoundRobinMatches(
         self, planningId: str, aiPlanningData: AIPlanningData, teamsMapping: dict
@@ -415,7 +458,8 @@ class DatabaseService:
             planningId: ID du planning
             match: Objet Match contenant les données
             phase: Phase du match (round_robin, poules, elimination, finale)
-            teamsMapping: Dictionnaire de mapping nom -> id des équipes
+            teamsMapping: Dictionnaire de mapping nom -> id des équipes (un
+                TeamIndex résout aussi les noms aux accents/casse près)
             poule_id: ID de la poule (optionnel)
             journee: Numéro de journée (optionnel)
 
@@ -423,8 +467,13 @@ class DatabaseService:
             AIGeneratedMatch ou None si erreur
         """
         try:
-            resolved_a = teamsMapping.get(match.equipe_a)
-            resolved_b = teamsMapping.get(match.equipe_b)
+            resolve = (
+                teamsMapping.resolve
+                if isinstance(teamsMapping, TeamIndex)
+                else teamsMapping.get
+            )
+            resolved_a = resolve(match.equipe_a)
+            resolved_b = resolve(match.equipe_b)
 
             if not resolved_a and not any(
                 ph in match.equipe_a for ph in ["winner_", "loser_", "1er_", "2e_"]
@@ -456,27 +505,897 @@ class DatabaseService:
             print(f"⚠️ Erreur création match avec équipes résolues: {e}")
             return None
 
-    def _getTeamsMapping(self, planningId) -> dict:
+    # Requêtes: construites ici sur self.supabase (client synchrone ou
+    # asynchrone), exécutées par le service (execute() ou await execute())
+
+    def _insertPlanningQuery(self, planningRow: dict):
+        return self.supabase.table("ai_tournament_planning").insert(planningRow)
+
+    def _insertPoulesQuery(self, pouleRows: List[dict]):
+        return self.supabase.table("ai_generated_poule").insert(pouleRows)
+
+    def _savePlanningDetailsQuery(self, params: dict):
+        return self.supabase.rpc(SAVE_PLANNING_FUNCTION, params)
+
+    def _savePlanningRevisionQuery(self, params: dict):
+        return self.supabase.rpc(SAVE_PLANNING_REVISION_FUNCTION, params)
+
+    def _activatePlanningQuery(self, planningId: str):
+        return self.supabase.rpc(
+            ACTIVATE_PLANNING_FUNCTION, {"p_planning_id": planningId}
+        )
+
+    def _planningByIdQuery(self, planningId: str, fields: Optional[List[str]]):
+        return (
+            self.supabase.table("ai_tournament_planning")
+            .select(self._planningColumns(fields))
+            .eq("id", planningId)
+            .single()
+        )
+
+    def _activePlanningQuery(self, tournamentId: str, fields: Optional[List[str]]):
+        return (
+            self.supabase.table("ai_tournament_planning")
+            .select(self._planningColumns(fields))
+            .eq("tournament_id", tournamentId)
+            .eq("is_active", True)
+            .limit(1)
+        )
+
+    def _updateStatusQuery(self, planningId: str, newStatus: str):
+        return (
+            self.supabase.table("ai_tournament_planning")
+            .update({"status": newStatus, "updated_at": datetime.now().isoformat()})
+            .eq("id", planningId)
+        )
+
+    def _planningMatchesQuery(self, planningId: str):
+        return (
+            MATCHES.select(self.supabase)
+            .eq("planning_id", planningId)
+            .order("debut_horaire")
+            .order("id")
+        )
+
+    def _matchesPageQuery(
+        self,
+        planningId: str,
+        limit: int,
+        after: Optional[Tuple[str, str]],
+        phase: Optional[str],
+        terrain: Optional[int],
+        pouleId: Optional[str],
+        team: Optional[str],
+    ):
+        """Requête PostgREST d'une page de matchs"""
+        query = MATCHES.select(self.supabase).eq("planning_id", planningId)
+
+        if phase:
+            query = query.eq("phase", phase)
+        if terrain is not None:
+            query = query.eq("terrain", terrain)
+        if pouleId:
+            query = query.eq("poule_id", pouleId)
+        if team:
+            query = query.or_(self._teamFilter(team))
+        if after:
+            debutHoraire, matchId = (quote_filter_value(v) for v in after)
+            query = query.or_(
+                f"debut_horaire.gt.{debutHoraire},"
+                f"and(debut_horaire.eq.{debutHoraire},id.gt.{matchId})"
+            )
+
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        return query.order("debut_horaire").order("id").limit(limit + 1)
+
+    def _planningVersionQuery(self, planningId: str):
+        return PLANNING_VERSION.select(self.supabase).eq("id", planningId).limit(1)
+
+    def _tournamentVersionQuery(self, tournamentId: str):
+        return (
+            PLANNING_VERSION.select(self.supabase)
+            .eq("tournament_id", tournamentId)
+            .eq("is_active", True)
+            .limit(1)
+        )
+
+    def _planningTournamentQuery(self, planningId: str):
+        return PLANNING_TOURNAMENT.select(self.supabase).eq("id", planningId).single()
+
+    def _planningChildrenQuery(self, planningId: str):
+        return PLANNING_CHILDREN.select(self.supabase).eq("id", planningId).limit(1)
+
+    def _insertMatchChunkQuery(self, chunk: List[dict]):
+        return self.supabase.table("ai_generated_match").insert(
+            chunk, upsert=True, returning=ReturnMethod.minimal
+        )
+
+    def _deleteMatchRowsQuery(self, planningId: str):
+        return (
+            self.supabase.table("ai_generated_match")
+            .delete()
+            .eq("planning_id", planningId)
+        )
+
+    def _deletePlanningQuery(self, planningId: str):
+        # Matchs et poules supprimés en cascade
+        return (
+            self.supabase.table("ai_tournament_planning")
+            .delete(returning=ReturnMethod.minimal)
+            .eq("id", planningId)
+        )
+
+    # Résultats: ce que les deux services font des réponses
+
+    def _rememberInsertedPlanning(self, data: dict) -> AITournamentPlanning:
+        """Planning inséré seul (version inactive), mis en cache"""
+        planning = AITournamentPlanning(**data)
+        print(f"✅ Planning {planning.id} sauvegardé ({planning.total_matches} matchs)")
+        self.rememberPlanningVersion(planning)
+        self.cachePlanning(planning)
+        remember("planning_tournament", planning.id, planning.tournament_id)
+        return planning
+
+    def _chunkedDetailsParams(self, params: dict) -> Tuple[dict, List[dict], bool]:
+        """
+        Paramètres de save_generated_planning, matchs à insérer à part et
+        indicateur d'insertion par lots
+
+        Trop de matchs pour une seule requête: planning et poules via la
+        fonction, puis matchs par lots (annulés ensemble si échec); la version
+        n'est activée qu'une fois tous les matchs insérés.
+        """
+        matchRows = params["p_matches"]
+        inChunks = len(matchRows) > settings.MATCH_INSERT_CHUNK_SIZE
+        if inChunks:
+            params = {**params, "p_matches": [], "p_activate": False}
+        return params, matchRows, inChunks
+
+    def _planningDetailsSaved(
+        self, planning: AITournamentPlanning, matchRows: List[dict], params: dict
+    ) -> AITournamentPlanning:
+        print(
+            f"✅ Planning {planning.id} sauvegardé "
+            f"({len(matchRows)} matchs, {len(params['p_poules'])} poules)"
+        )
+        remember("planning_tournament", planning.id, planning.tournament_id)
+        return planning
+
+    def _revisionParams(
+        self, basePlanningId: str, base: dict, params: dict
+    ) -> Optional[Tuple[dict, RowDiff]]:
+        """
+        Paramètres de save_planning_revision: lignes nouvelles ou modifiées par
+        rapport à la version de base (voir savePlanningRevision)
+
+        La base n'est lue que par clés et empreintes (row_hash): une ligne de
+        la base sans empreinte (antérieure à la colonne) est réécrite.
+
+        Returns:
+            (paramètres, différence des matchs), ou None si trop de matchs ont
+            changé pour une seule requête ou si une clé est en double
+            (sauvegarde complète)
+        """
         try:
-            # recuperer tournament_id grace à planningId
-            tournamentResult = (
-                self.supabase.table("ai_tournament_planning")
-                .select("tournament_id")
-                .eq("id", planningId)
-                .single()
-                .execute()
+            matchDiff = diff_rows(
+                base["ai_generated_match"],
+                params["p_matches"],
+                "match_id_ai",
+                lambda row: row.get("row_hash"),
+            )
+            pouleDiff = diff_rows(
+                base["ai_generated_poule"],
+                params["p_poules"],
+                "poule_id",
+                lambda row: row.get("row_hash"),
+            )
+        except DuplicateKeyError as e:
+            # Une ligne par clé ne suffirait pas à décrire la version
+            print(f"⚠️ Sauvegarde différentielle impossible: {e}")
+            metrics.increment("planning.revision.duplicate_keys")
+            return None
+        if len(matchDiff.changed) > settings.MATCH_INSERT_CHUNK_SIZE:
+            return None
+
+        print(
+            f"💾 Sauvegarde différentielle du planning {basePlanningId}: "
+            f"{len(matchDiff.inserts)} matchs ajoutés, "
+            f"{len(matchDiff.updates)} modifiés, "
+            f"{len(matchDiff.deletes)} supprimés, "
+            f"{len(matchDiff.unchanged)} inchangés"
+        )
+        return {
+            "p_planning": params["p_planning"],
+            "p_base_planning_id": basePlanningId,
+            "p_matches": matchDiff.changed,
+            "p_poules": pouleDiff.changed,
+            "p_replaced_match_ids": matchDiff.replaced,
+            "p_replaced_poule_ids": pouleDiff.replaced,
+        }, matchDiff
+
+    def _planningRevisionSaved(
+        self, data: dict, matchDiff: RowDiff
+    ) -> AITournamentPlanning:
+        planning = self._rememberSavedPlanning(data)
+        metrics.increment("planning.revision.rows_written", len(matchDiff.changed))
+        metrics.increment("planning.revision.rows_copied", len(matchDiff.unchanged))
+        print(f"✅ Planning {planning.id} sauvegardé")
+        remember("planning_tournament", planning.id, planning.tournament_id)
+        return planning
+
+    def _cachedPlanningById(self, planningId: str):
+        """
+        Planning en cache: AITournamentPlanning, None s'il n'existe pas,
+        MISSING s'il faut le lire
+        """
+        cached = planningCache.get(("planning", planningId))
+        if cached is None:
+            print("Planning non trouve (cache)")
+        elif cached is not MISSING:
+            self.rememberPlanningVersion(cached)
+        return cached
+
+    def _planningFromRow(
+        self, planningId: str, row: Optional[dict], fields: Optional[List[str]]
+    ) -> Optional[Union[AITournamentPlanning, dict]]:
+        """Planning lu par son ID (dict limité à fields si fourni), mis en cache"""
+        if not row:
+            print("Planning non trouve")
+            if not fields:
+                self.cacheMissingPlanning(planningId)
+            return None
+        if fields:
+            self.rememberPlanningVersion(row)
+            return row
+
+        planningObj = AITournamentPlanning(**row)
+        self.rememberPlanningVersion(planningObj)
+        self.cachePlanning(planningObj)
+        return planningObj
+
+    def _planningReadFailed(
+        self, planningId: str, error: Exception, fields: Optional[List[str]]
+    ) -> None:
+        if self._isNoRowError(error) and not fields:
+            self.cacheMissingPlanning(planningId)
+        print(f"Erreur recuperation planning {error}")
+
+    def _activePlanningFromRows(
+        self, tournamentId: str, rows: Optional[List[dict]], fields: Optional[List[str]]
+    ) -> Optional[Union[AITournamentPlanning, dict]]:
+        """Version active lue par tournoi, mise en cache comme telle (None sans planning)"""
+        print(f"planningResult: {rows}")
+
+        if not rows:
+            print("Planning non trouve")
+            if not fields:
+                self.cacheMissingTournamentPlanning(tournamentId)
+            return None
+        if fields:
+            self.rememberPlanningVersion(rows[0], active=True)
+            return rows[0]
+
+        planningObj = AITournamentPlanning(**rows[0])
+        self.rememberPlanningVersion(planningObj, active=True)
+        self.cachePlanning(planningObj, active=True)
+        return planningObj
+
+    def _planningStatusUpdated(self, planningId: str, newStatus: str) -> None:
+        self.invalidatePlanning(planningId)
+        planningStatusCache.set(planningId, newStatus)
+        planningEventBroker.publish(planningId, newStatus)
+        print("Statut mis à jour")
+
+    def _cachedPlanningVersion(self, planningId: str) -> Optional[dict]:
+        updatedAt = planningVersionCache.get(("planning", planningId))
+        if updatedAt is MISSING:
+            return None
+        return {"id": planningId, "updated_at": updatedAt}
+
+    def _cachedTournamentVersion(self, tournamentId: str) -> Optional[dict]:
+        planningId = planningVersionCache.get(("tournament", tournamentId))
+        if planningId is MISSING:
+            return None
+        return self._cachedPlanningVersion(planningId)
+
+    def _rememberVersionRow(
+        self, rows: Optional[List[dict]], tournamentId: Optional[str] = None
+    ) -> Optional[dict]:
+        """Version lue (id + updated_at), associée au tournoi si lue par tournoi"""
+        if not rows:
+            return None
+        version = rows[0]
+        if tournamentId:
+            planningVersionCache.set(("tournament", tournamentId), version["id"])
+        planningVersionCache.set(("planning", version["id"]), version["updated_at"])
+        return version
+
+    def _matchesPage(self, rows: Optional[List[dict]], limit: int) -> dict:
+        """Page de matchs et curseur suivant à partir des lignes lues (limit + 1)"""
+        rows = rows or []
+        nextCursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            nextCursor = encode_cursor(rows[-1]["debut_horaire"], rows[-1]["id"])
+
+        return {
+            "items": [AIGeneratedMatch(**row) for row in rows],
+            "next_cursor": nextCursor,
+        }
+
+    def _teamFilter(self, team: str) -> str:
+        """Filtre PostgREST sur l'une ou l'autre équipe d'un match"""
+        try:
+            uuid.UUID(team)
+            columns = ["resolved_equipe_a_id", "resolved_equipe_b_id"]
+        except ValueError:
+            columns = ["equipe_a", "equipe_b"]
+
+        value = quote_filter_value(team)
+        return ",".join(f"{column}.eq.{value}" for column in columns)
+
+    def _planningColumns(self, fields: Optional[List[str]]) -> str:
+        """
+        Liste de colonnes PostgREST pour une lecture de planning
+        (id, tournament_id et updated_at sont toujours inclus pour l'ETag)
+        """
+        if not fields:
+            return PLANNING.columns
+        columns = list(PLANNING_VERSION_FIELDS)
+        if "planning_data" in fields:
+            # planning_data peut être stocké compressé (PLANNING_DATA_COMPRESSION)
+            fields = [*fields, "planning_data_compressed"]
+        columns.extend(field for field in fields if field not in columns)
+        return ",".join(columns)
+
+    def invalidateTournamentPlannings(self, tournamentId: str) -> None:
+        """Oublie le planning en cache d'un tournoi (plannings supprimés)"""
+        planningVersionCache.delete(("tournament", tournamentId))
+        planningCache.delete(("tournament", tournamentId))
+
+    def cacheMissingPlanning(self, planningId: str) -> None:
+        """Cache négatif: le planning n'existe pas (404)"""
+        planningCache.set(
+            ("planning", planningId), None, ttl=settings.PLANNING_CACHE_NEGATIVE_TTL
+        )
+
+    def cacheMissingTournamentPlanning(self, tournamentId: str) -> None:
+        """Cache négatif: le tournoi n'a pas de planning"""
+        planningCache.set(
+            ("tournament", tournamentId), None, ttl=settings.PLANNING_CACHE_NEGATIVE_TTL
+        )
+
+    def _cachedPlanningByTournamentId(self, tournamentId: str):
+        """
+        Planning en cache d'un tournoi: AITournamentPlanning, None si le
+        tournoi n'a pas de planning, MISSING s'il faut le lire
+        """
+        planningId = planningCache.get(("tournament", tournamentId))
+        if planningId is MISSING or planningId is None:
+            return planningId
+        planning = planningCache.get(("planning", planningId))
+        # Pointeur vers un planning supprimé, invalidé ou expiré
+        return planning if planning is not None else MISSING
+
+    def _isNoRowError(self, error: Exception) -> bool:
+        """Erreur PostgREST d'un .single() qui ne trouve aucune ligne"""
+        return isinstance(error, APIError) and error.code == NO_ROW_ERROR
+
+
+class DatabaseService(PlanningRowsMixin):
+    def __init__(self):
+        self.supabase = getSupabase()
+
+    def savePlanning(
+        self,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Sauvegarde le planning principal en DB
+
+        Le planning est une version inactive: activatePlanning le rend visible
+        par tournoi une fois ses matchs et ses poules sauvegardés.
+
+        Args:
+            tournament_id: ID du tournoi
+            planning_data: JSON complet de l'IA (dict ou AIPlanningData validé)
+            type_tournoi: Type de tournoi
+
+        Returns:
+            AITournamentPlanning: Planning créé ou None si erreur
+        """
+        try:
+            print(f"💾 Sauvegarde planning pour tournoi {tournamentId}")
+
+            planning_dict = self._buildPlanningRow(
+                tournamentId, planningData, typeTournoi
             )
-            tournamentId = tournamentResult.data["tournament_id"]
 
-            # recuperer teams grace à tournamentId
-            teamsResult = (
-                self.supabase.table("team")
-                .select("*")
-                .eq("tournament_id", tournamentId)
+            # Sauvegarder
+            result = self._insertPlanningQuery(planning_dict).execute()
+
+            # Retourner l'objet Planning créé
+            return self._rememberInsertedPlanning(result.data[0])
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde : {e}")
+            return None
+
+    def saveMatches(
+        self, planningId: str, planningData: Union[dict, AIPlanningData]
+    ) -> Optional[List[AIGeneratedMatch]]:
+        """
+        Sauvegarde tous les matchs en lot
+
+        Args:
+            planning_id: ID du planning
+            planning_data: Données JSON de l'IA (dict ou AIPlanningData validé)
+
+        Returns:
+            List[AIGeneratedMatch]: Matchs sauvegardés ou None si erreur
+        """
+
+        try:
+            print(f"Extraction et sauvegarde des matchs pour planning {planningId}")
+
+            teamsMapping = self._getTeamsMapping(planningId)
+            if not teamsMapping:
+                raise Exception("Impossible de recuperer les equipes")
+
+            matchesDicts = self._buildMatchRows(planningId, planningData, teamsMapping)
+
+            if matchesDicts:
+                self._insertMatchRows(planningId, matchesDicts)
+                print(f"{len(matchesDicts)} matchs sauvegardes en lot")
+                return [AIGeneratedMatch(**data) for data in matchesDicts]
+
+            else:
+                print("Aucun match à sauvegarder")
+                return []
+
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde des matchs: {e}")
+            return None
+
+    def savePoules(
+        self, planningId: str, planningData: Union[dict, AIPlanningData]
+    ) -> Optional[List[AIGeneratedPoule]]:
+        """
+        Sauvegarde les poules en lot
+
+        Args:
+            planning_id: ID du planning
+            planning_data: Données JSON de l'IA (dict ou AIPlanningData validé)
+
+        Returns:
+            List[AIGeneratedPoule]: Poules sauvegardées ou None si erreur
+        """
+
+        try:
+            poulesDicts = self._buildPouleRows(planningId, planningData)
+            if not poulesDicts:
+                print("Pas de poules à sauvegarder")
+                return []
+
+            print(f"Sauvegarde de {len(poulesDicts)} poules")
+
+            result = self._insertPoulesQuery(poulesDicts).execute()
+            print(f"{len(poulesDicts)} poules sauvegardees")
+
+            return [AIGeneratedPoule(**data) for data in result.data]
+
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde des poules {e}")
+
+    def savePlanningWithDetails(
+        self,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+        teamsMapping: dict,
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Sauvegarde le planning, ses matchs et ses poules en un seul aller-retour
+
+        Appelle la fonction Postgres save_generated_planning: les trois
+        insertions sont faites dans une seule transaction (tout ou rien), qui
+        active aussi la nouvelle version du planning du tournoi.
+
+        Args:
+            tournamentId: ID du tournoi
+            planningData: JSON complet de l'IA (dict ou AIPlanningData validé)
+            typeTournoi: Type de tournoi
+            teamsMapping: Noms d'équipes -> IDs (résolution des équipes des matchs)
+
+        Returns:
+            AITournamentPlanning: Planning créé ou None si erreur
+        """
+        try:
+            print(
+                f"💾 Sauvegarde planning + matchs + poules pour tournoi {tournamentId}"
+            )
+
+            params, matchRows, inChunks = self._chunkedDetailsParams(
+                self._planningDetailsParams(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                )
+            )
+
+            result = self._savePlanningDetailsQuery(params).execute()
+            planning = self._rememberSavedPlanning(result.data)
+
+            if inChunks:
+                try:
+                    self._insertMatchRows(planning.id, matchRows)
+                    planning = self._activatePlanning(planning.id)
+                except Exception:
+                    self._rollbackPlanning(planning.id)
+                    raise
+
+            return self._planningDetailsSaved(planning, matchRows, params)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde du planning complet : {e}")
+            return None
+
+    def savePlanningRevision(
+        self,
+        basePlanningId: str,
+        tournamentId: str,
+        planningData: Union[dict, AIPlanningData],
+        typeTournoi: str,
+        teamsMapping: dict,
+    ) -> Optional[AITournamentPlanning]:
+        """
+        Sauvegarde une régénération en n'envoyant que ce qui a changé
+
+        Les matchs (clé match_id_ai) et poules (clé poule_id) de la nouvelle
+        version sont comparés à ceux de la version de base, dont seules les
+        clés et empreintes de contenu (row_hash) sont lues: seules les lignes
+        ajoutées ou modifiées sont envoyées à la fonction Postgres
+        save_planning_revision, qui recopie les lignes inchangées de la base et
+        active la nouvelle version dans la même transaction.
+
+        Si la base est introuvable, si trop de matchs ont changé pour une
+        seule requête ou si une clé est en double dans l'une des versions,
+        sauvegarde complète (savePlanningWithDetails).
+
+        Args:
+            basePlanningId: ID de la version régénérée
+            tournamentId: ID du tournoi
+            planningData: JSON complet de l'IA (dict ou AIPlanningData validé)
+            typeTournoi: Type de tournoi
+            teamsMapping: Noms d'équipes -> IDs (résolution des équipes des matchs)
+
+        Returns:
+            AITournamentPlanning: Planning créé ou None si erreur
+        """
+        try:
+            base = self._getPlanningChildren(basePlanningId)
+            if base is None:
+                print(f"⚠️ Version de base {basePlanningId} introuvable")
+                return self.savePlanningWithDetails(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                )
+
+            revision = self._revisionParams(
+                basePlanningId,
+                base,
+                self._planningDetailsParams(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                ),
+            )
+            if revision is None:
+                return self.savePlanningWithDetails(
+                    tournamentId, planningData, typeTournoi, teamsMapping
+                )
+
+            params, matchDiff = revision
+            result = self._savePlanningRevisionQuery(params).execute()
+            return self._planningRevisionSaved(result.data, matchDiff)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde différentielle du planning : {e}")
+            return None
+
+    def getPlanningWithDetailsByPlanningId(
+        self, planningId: str, fields: Optional[List[str]] = None
+    ) -> Optional[dict]:
+        """
+        Récupère un planning avec tous ses détails
+
+        Args:
+            planningId: ID du planning
+            fields: Colonnes à récupérer (optionnel, toutes par défaut).
+                Si fourni, retourne un dict limité à ces colonnes.
+
+        Returns:
+            dict: {
+            "planning": AITournamentPlanning,
+            "matches": List[AIGeneratedMatch],
+            "poules": List[AIGeneratedPoule]
+            } ou None si erreur
+        """
+        if not fields:
+            cached = self._cachedPlanningById(planningId)
+            if cached is not MISSING:
+                return cached
+
+        try:
+            print(f"Recuperation planning {planningId}")
+
+            planningResult = self._planningByIdQuery(planningId, fields).execute()
+            return self._planningFromRow(planningId, planningResult.data, fields)
+
+        except Exception as e:
+            self._planningReadFailed(planningId, e, fields)
+            return None
+
+    def getPlanningWithDetailsByTournamentId(
+        self, tournamentId: str, fields: Optional[List[str]] = None
+    ) -> Optional[Union[AITournamentPlanning, dict]]:
+        """
+        Récupère un planning avec tous ses détails par l'ID du tournoi
+
+        Args:
+            tournamentId: ID du tournoi
+            fields: Colonnes à récupérer (optionnel, toutes par défaut).
+                Si fourni, retourne un dict limité à ces colonnes.
+
+        Returns:
+            AITournamentPlanning (ou dict si fields) ou None si le tournoi n'a
+            pas de planning
+
+        Raises:
+            Exception: si la lecture échoue
+        """
+        try:
+            if not fields:
+                cached = self._cachedPlanningByTournamentId(tournamentId)
+                if cached is not MISSING:
+                    if cached is None:
+                        print("Planning non trouve (cache)")
+                        return None
+                    self.rememberPlanningVersion(cached, active=True)
+                    return cached
+
+            print(f"Recuperation planning par tournoi {tournamentId}")
+
+            planningResult = self._activePlanningQuery(tournamentId, fields).execute()
+            return self._activePlanningFromRows(
+                tournamentId, planningResult.data, fields
+            )
+
+        except Exception as e:
+            raise Exception(f"Erreur recuperation planning par tournoi {e}")
+
+    def updatePlanningStatus(self, planningId: str, newStatus: str) -> bool:
+        """
+        Met à jour le statut d'un planning
+
+        Args:
+            planningId: ID du planning
+            newStatus: Nouveau statut
+
+        Returns:
+            bool: Succès de l'opération
+        """
+        try:
+            print(f"Mise à jour statut planning {planningId} -> {newStatus}")
+            self._updateStatusQuery(planningId, newStatus).execute()
+            self._planningStatusUpdated(planningId, newStatus)
+            return True
+
+        except Exception as e:
+            print(f"Erreur mise à jour planning: {e}")
+            return False
+
+    def getMatchesPage(
+        self,
+        planningId: str,
+        limit: int = 50,
+        after: Optional[Tuple[str, str]] = None,
+        phase: Optional[str] = None,
+        terrain: Optional[int] = None,
+        pouleId: Optional[str] = None,
+        team: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Récupère une page de matchs d'un planning (pagination par clé sur
+        debut_horaire puis id)
+
+        Args:
+            planningId: ID du planning
+            limit: Nombre maximum de matchs dans la page
+            after: Position (debut_horaire, id) du dernier match de la page précédente
+            phase: Filtre sur la phase (round_robin, poules, elimination, finale)
+            terrain: Filtre sur le numéro de terrain
+            pouleId: Filtre sur l'ID de poule
+            team: Filtre sur une équipe (ID résolu ou nom)
+
+        Returns:
+            dict: {"items": List[AIGeneratedMatch], "next_cursor": str | None}
+            ou None si erreur
+        """
+        try:
+            query = self._matchesPageQuery(
+                planningId, limit, after, phase, terrain, pouleId, team
+            )
+            return self._matchesPage(query.execute().data, limit)
+
+        except Exception as e:
+            print(f"Erreur recuperation matchs du planning {planningId}: {e}")
+            return None
+
+    def getPlanningMatches(self, planningId: str) -> Optional[List[AIGeneratedMatch]]:
+        """
+        Récupère tous les matchs d'un planning, dans l'ordre chronologique
+
+        Args:
+            planningId: ID du planning
+
+        Returns:
+            List[AIGeneratedMatch]: Matchs du planning ou None si erreur
+        """
+        try:
+            result = self._planningMatchesQuery(planningId).execute()
+            return [AIGeneratedMatch(**row) for row in result.data or []]
+
+        except Exception as e:
+            print(f"Erreur recuperation matchs du planning {planningId}: {e}")
+            return None
+
+    def getPlanningVersionByPlanningId(self, planningId: str) -> Optional[dict]:
+        """
+        Récupère la version d'un planning (id + updated_at) sans planning_data,
+        depuis le cache si possible
+
+        Args:
+            planningId: ID du planning
+
+        Returns:
+            dict: {"id": str, "updated_at": str} ou None si non trouvé
+        """
+        cached = self._cachedPlanningVersion(planningId)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self._planningVersionQuery(planningId).execute()
+            return self._rememberVersionRow(result.data)
+
+        except Exception as e:
+            print(f"Erreur recuperation version planning {e}")
+            return None
+
+    def getPlanningVersionByTournamentId(self, tournamentId: str) -> Optional[dict]:
+        """
+        Récupère la version du planning d'un tournoi (id + updated_at)
+        sans planning_data, depuis le cache si possible
+
+        Args:
+            tournamentId: ID du tournoi
+
+        Returns:
+            dict: {"id": str, "updated_at": str} ou None si non trouvé
+        """
+        cached = self._cachedTournamentVersion(tournamentId)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self._tournamentVersionQuery(tournamentId).execute()
+            return self._rememberVersionRow(result.data, tournamentId)
+
+        except Exception as e:
+            print(f"Erreur recuperation version planning par tournoi {e}")
+            return None
+
+    def activatePlanning(self, planningId: str) -> Optional[AITournamentPlanning]:
+        """
+        Fait d'un planning sauvegardé la version active de son tournoi
+
+        La bascule (ancienne version désactivée, nouvelle activée) est faite
+        par la fonction Postgres activate_planning, en une transaction.
+
+        Returns:
+            AITournamentPlanning: Planning activé ou None si erreur
+        """
+        try:
+            return self._activatePlanning(planningId)
+        except Exception as e:
+            print(f"❌ Erreur activation du planning {planningId}: {e}")
+            return None
+
+    def _activatePlanning(self, planningId: str) -> AITournamentPlanning:
+        result = self._activatePlanningQuery(planningId).execute()
+        return self._rememberSavedPlanning(result.data)
+
+    def _getPlanningChildren(self, planningId: str) -> Optional[dict]:
+        """
+        Clés et empreintes des matchs et poules d'une version de planning,
+        None si elle n'existe pas
+        """
+        result = self._planningChildrenQuery(planningId).execute()
+        return result.data[0] if result.data else None
+
+    def _insertMatchRows(self, planningId: str, matchRows: List[dict]) -> None:
+        """
+        Insère les matchs par lots de MATCH_INSERT_CHUNK_SIZE, envoyés en parallèle
+
+        Chaque lot est relancé en cas d'erreur transitoire: les lignes ont un id
+        fixé côté client et sont envoyées en upsert, une nouvelle tentative
+        après un timeout ne crée donc pas de doublon. Si un lot échoue
+        définitivement, les matchs du planning sont supprimés (tout ou rien).
+
+        Raises:
+            Exception: erreur du premier lot en échec, après annulation
+        """
+        chunks = chunked(matchRows, settings.MATCH_INSERT_CHUNK_SIZE)
+        if len(chunks) == 1:
+            # Une seule requête: déjà atomique côté PostgREST
+            self._insertMatchChunk(chunks[0])
+            return
+
+        errors = []
+
+        def insert(chunk: List[dict]) -> None:
+            if errors:
+                return  # un lot a déjà échoué: inutile d'envoyer les suivants
+            try:
+                self._insertMatchChunk(chunk)
+            except Exception as e:
+                errors.append(e)
+
+        workers = min(settings.MATCH_INSERT_CONCURRENCY, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(insert, chunks))
+
+        if errors:
+            print(f"❌ Lot de matchs en échec - annulation des {len(chunks)} lots")
+            self._deleteMatchRows(planningId)
+            raise errors[0]
+
+    def _insertMatchChunk(self, chunk: List[dict]) -> None:
+        call_with_retry(
+            lambda: self._insertMatchChunkQuery(chunk).execute(),
+            settings.MATCH_INSERT_RETRIES,
+            settings.MATCH_INSERT_RETRY_DELAY,
+        )
+
+    def _deleteMatchRows(self, planningId: str) -> None:
+        """Supprime les matchs d'un planning (annulation d'une insertion par lots)"""
+        try:
+            self._deleteMatchRowsQuery(planningId).execute()
+        except Exception as e:
+            print(f"❌ Erreur annulation des matchs du planning {planningId}: {e}")
+
+    def _rollbackPlanning(self, planningId: str) -> None:
+        """Supprime un planning dont les matchs n'ont pas pu être insérés"""
+        try:
+            self._deletePlanningQuery(planningId).execute()
+        except Exception as e:
+            print(f"❌ Erreur annulation du planning {planningId}: {e}")
+        self.invalidatePlanning(planningId)
+
+    def _getTeamsMapping(self, planningId) -> dict:
+        try:
+            # recuperer tournament_id grace à planningId (connu si le planning
+            # vient d'être sauvegardé dans le même traitement)
+            tournamentId = fetch_once(
+                "planning_tournament",
+                planningId,
+                lambda: self._planningTournamentQuery(planningId)
                 .execute()
+                .data["tournament_id"],
             )
 
-            return {team["name"]: team["id"] for team in teamsResult.data}
+            # index des équipes (déjà lu avec le tournoi, sinon revalidé par
+            # empreinte: voir app.core.team_index)
+            return fetch_once(
+                "team_index",
+                tournamentId,
+                lambda: load_team_index(self.supabase, tournamentId),
+            )
         except Exception as e:
             print(f"Erreur recuperation teams mapping: {e}")
             return {}
@@ -0,0 +1,298 @@
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+import orjson
+
+from app.core.config import settings
+from app.core.events import ALL_PLANNINGS, planningEventBroker
+from app.core.responses import planning_payload
+from app.services.async_database_service import asyncDatabaseService
+
+# État d'un tournoi suivi: {"planning": dict | None, "matches": {match_id: dict},
+# "version": {"id", "updated_at"} | None (version lue avec l'état)}
+FeedState = Dict[str, Any]
+
+
+def build_snapshot(tournamentId: str, state: FeedState) -> Dict[str, Any]:
+    """Message complet (envoyé à la connexion ou quand le planning est remplacé)"""
+    return {
+        "type": "snapshot",
+        "tournament_id": tournamentId,
+        "planning": state["planning"],
+        "matches": list(state["matches"].values()),
+    }
+
+
+def build_delta(
+    tournamentId: str, previous: FeedState, current: FeedState
+) -> Optional[Dict[str, Any]]:
+    """
+    Différence entre deux états d'un tournoi
+
+    Returns:
+        dict: Message "delta" (champs du planning modifiés, matchs ajoutés ou
+        modifiés, IDs des matchs retirés), "snapshot" si le planning a été
+        remplacé, ou None si rien n'a changé
+    """
+    previousPlanning, currentPlanning = previous["planning"], current["planning"]
+    previousId = previousPlanning["id"] if previousPlanning else None
+    currentId = currentPlanning["id"] if currentPlanning else None
+    if previousId != currentId:
+        return build_snapshot(tournamentId, current)
+    if currentPlanning is None:
+        return None
+
+    planningChanges = {
+        key: value
+        for key, value in currentPlanning.items()
+        if previousPlanning.get(key) != value
+    }
+    upserted = [
+        match
+        for matchId, match in current["matches"].items()
+        if previous["matches"].get(matchId) != match
+    ]
+    removed = [
+        matchId for matchId in previous["matches"] if matchId not in current["matches"]
+    ]
+    if not planningChanges and not upserted and not removed:
+        return None
+
+    return {
+        "type": "delta",
+        "tournament_id": tournamentId,
+        "planning": planningChanges,
+        "matches": {"upserted": upserted, "removed": removed},
+    }
+
+
+def _versionKey(version: Optional[dict]):
+    return (version["id"], version["updated_at"]) if version else None
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """Encode un message une seule fois, pour tous les abonnés"""
+    return orjson.dumps(message).decode("utf-8")
+
+
+class TournamentChannel:
+    """Abonnés et dernier état connu du planning d'un tournoi"""
+
+    def __init__(self, tournamentId: str):
+        self.tournamentId = tournamentId
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.state: Optional[FeedState] = None
+        self.snapshot: Optional[str] = None  # snapshot déjà encodé
+        self.lock = asyncio.Lock()
+        self.refreshPending = False
+        self.connecting = 0  # abonnements en cours (état pas encore chargé)
+
+    @property
+    def planningId(self) -> Optional[str]:
+        if not self.state or not self.state["planning"]:
+            return None
+        return self.state["planning"]["id"]
+
+
+class TournamentFeedHub:
+    """
+    Diffusion en direct du planning d'un tournoi (WebSocket)
+
+    Un canal par tournoi: à chaque notification de planningEventBroker, l'état
+    est relu une seule fois, la différence est encodée une seule fois puis
+    placée dans la file de chaque abonné.
+
+    planningEventBroker ne voit que les écritures de ce processus: la version
+    du planning de chaque canal est aussi relue toutes les
+    LIVE_FEED_REVALIDATE_INTERVAL secondes, et l'état relu si elle a changé
+    (écriture d'un autre worker ou d'un autre client de la base).
+    """
+
+    def __init__(self):
+        self.databaseService = asyncDatabaseService
+        self.channels: Dict[str, TournamentChannel] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._revalidator: Optional[asyncio.Task] = None
+
+    async def subscribe(self, tournamentId: str) -> asyncio.Queue:
+        """
+        Abonne un client au planning d'un tournoi
+
+        Returns:
+            asyncio.Queue: File des messages encodés, commençant par un snapshot
+
+        Raises:
+            Exception: Erreur de lecture de l'état initial (le client n'est pas
+                abonné, le canal est fermé s'il n'a pas d'autre abonné)
+        """
+        channel = self.channels.get(tournamentId)
+        if channel is None:
+            channel = self.channels[tournamentId] = TournamentChannel(tournamentId)
+        self._ensureListener()
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.LIVE_FEED_QUEUE_SIZE)
+        channel.connecting += 1
+        try:
+            async with channel.lock:
+                if channel.state is None:
+                    channel.state = await self._loadState(tournamentId)
+                queue.put_nowait(self._snapshotMessage(channel))
+                channel.subscribers.add(queue)
+        except Exception as e:
+            print(f"❌ Erreur abonnement au direct du tournoi {tournamentId}: {e}")
+            raise
+        finally:
+            channel.connecting -= 1
+            self._closeIfIdle(channel)
+
+        print(
+            f"📡 Abonné au direct du tournoi {tournamentId} "
+            f"({len(channel.subscribers)} connectés)"
+        )
+        return queue
+
+    def unsubscribe(self, tournamentId: str, queue: asyncio.Queue) -> None:
+        """Désabonne un client (le canal est fermé quand il n'a plus d'abonnés)"""
+        channel = self.channels.get(tournamentId)
+        if channel is None:
+            return
+
+        channel.subscribers.discard(queue)
+        self._closeIfIdle(channel)
+
+    def _closeIfIdle(self, channel: TournamentChannel) -> None:
+        """Ferme un canal sans abonné (et l'écoute s'il n'en reste aucun)"""
+        if channel.subscribers or channel.connecting:
+            return
+        if self.channels.get(channel.tournamentId) is channel:
+            del self.channels[channel.tournamentId]
+        if not self.channels:
+            for task in (self._listener, self._revalidator):
+                if task is not None:
+                    task.cancel()
+            self._listener = self._revalidator = None
+
+    def _ensureListener(self) -> None:
+        """Démarre l'écoute des notifications et la revalidation si nécessaire"""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        if self._revalidator is None or self._revalidator.done():
+            self._revalidator = asyncio.create_task(self._revalidate())
+
+    async def _listen(self) -> None:
+        subscription = planningEventBroker.subscribe(ALL_PLANNINGS)
+        try:
+            while True:
+                event = await subscription.get()
+                for channel in list(self.channels.values()):
+                    if event["tournament_id"] == channel.tournamentId or (
+                        event["planning_id"] == channel.planningId
+                    ):
+                        self._scheduleRefresh(channel)
+        finally:
+            planningEventBroker.unsubscribe(subscription)
+
+    async def _revalidate(self) -> None:
+        """Relit périodiquement la version du planning de chaque canal"""
+        while True:
+            await asyncio.sleep(settings.LIVE_FEED_REVALIDATE_INTERVAL)
+            channels = list(self.channels.values())
+            versions = await asyncio.gather(
+                *(
+                    self.databaseService.getPlanningVersionByTournamentId(
+                        channel.tournamentId
+                    )
+                    for channel in channels
+                ),
+                return_exceptions=True,
+            )
+            for channel, version in zip(channels, versions):
+                if isinstance(version, Exception):
+                    print(f"❌ Erreur direct tournoi {channel.tournamentId}: {version}")
+                elif self._isStale(channel, version):
+                    self._scheduleRefresh(channel)
+
+    def _isStale(self, channel: TournamentChannel, version: Optional[dict]) -> bool:
+        """Vrai si la version lue en base n'est pas celle de l'état diffusé"""
+        if channel.state is None:
+            return True
+        return _versionKey(version) != _versionKey(channel.state["version"])
+
+    def _scheduleRefresh(self, channel: TournamentChannel) -> None:
+        """Regroupe les notifications rapprochées en une seule relecture"""
+        if channel.refreshPending:
+            return
+        channel.refreshPending = True
+        asyncio.create_task(self._refresh(channel))
+
+    async def _refresh(self, channel: TournamentChannel) -> None:
+        """Relit l'état du tournoi et diffuse la différence aux abonnés"""
+        async with channel.lock:
+            channel.refreshPending = False
+            try:
+                state = await self._loadState(channel.tournamentId)
+                if channel.state is None:
+                    # Aucun état diffusé (chargement initial en échec): tout renvoyer
+                    message = build_snapshot(channel.tournamentId, state)
+                else:
+                    message = build_delta(channel.tournamentId, channel.state, state)
+            except Exception as e:
+                print(f"❌ Erreur direct tournoi {channel.tournamentId}: {e}")
+                return
+
+            channel.state = state
+            if message is None:
+                return
+            channel.snapshot = None
+            self._broadcast(channel, encode_message(message))
+
+    def _broadcast(self, channel: TournamentChannel, message: str) -> None:
+        """Place un message déjà encodé dans la file de chaque abonné"""
+        for queue in list(channel.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Client trop lent: ses deltas en retard sont remplacés par un snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._snapshotMessage(channel))
+
+    def _snapshotMessage(self, channel: TournamentChannel) -> str:
+        if channel.snapshot is None:
+            channel.snapshot = encode_message(
+                build_snapshot(channel.tournamentId, channel.state)
+            )
+        return channel.snapshot
+
+    async def _loadState(self, tournamentId: str) -> FeedState:
+        """
+        Lit le planning courant d'un tournoi et ses matchs (planning et matchs
+        lus en parallèle une fois la version active connue)
+
+        Raises:
+            Exception: si la lecture échoue (l'état précédent est conservé)
+        """
+        version = await self.databaseService.getPlanningVersionByTournamentId(
+            tournamentId
+        )
+        if not version:
+            return {"planning": None, "matches": {}, "version": None}
+
+        planning, matches = await asyncio.gather(
+            self.databaseService.getPlanningWithDetailsByPlanningId(version["id"]),
+            self.databaseService.getPlanningMatches(version["id"]),
+        )
+        if not planning:
+            return {"planning": None, "matches": {}, "version": version}
+        if matches is None:
+            raise Exception("Erreur lors de la lecture des matchs")
+
+        return {
+            "planning": planning_payload(planning),
+            "matches": {match.id: planning_payload(match) for match in matches},
+            "version": version,
+        }
+
+
+# Instance globale
+tournamentFeedHub = TournamentFeedHub()
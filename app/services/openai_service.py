@@ -1,9 +1,11 @@
 import json
 import time
+from typing import Optional
 
 from openai import OpenAI
 
 from app.core.config import settings
+from app.models.models import AIPlanningData
 
 
 class OpenAIClientService:
@@ -11,15 +13,18 @@ class OpenAIClientService:
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.assistant_id = settings.OPENAI_ASSISTANT_ID
 
-    def generate_planning(self, prompt: str) -> dict:
+    def generate_planning(self, prompt: str) -> Optional[AIPlanningData]:
         """
         Génère un planning en appelant ton assistant
 
+        Le JSON de l'assistant est validé une seule fois ici: les étapes
+        suivantes (planning, matchs, poules) réutilisent cet objet.
+
         Args:
             prompt: Le prompt avec les données du tournoi
 
         Returns:
-            dict: Planning généré par l'IA
+            AIPlanningData: Planning généré par l'IA, validé (None si erreur)
         """
         try:
             thread = self.client.beta.threads.create()
@@ -32,7 +37,9 @@ class OpenAIClientService:
             planning_response = self._wait_for_completion(thread.id, run.id)
 
             # 5. Parser la réponse JSON
-            planning_data = self._parse_response(planning_response)
+            planning_data = AIPlanningData.from_assistant(
+                self._parse_response(planning_response)
+            )
 
             print("✅ Planning généré avec succès")
             return planning_data
@@ -1,10 +1,157 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.database import getSupabase
+from app.core.queries import (
+    TEAMS,
+    TOURNAMENT_WITH_TEAM_FINGERPRINT,
+    TOURNAMENT_WITH_TEAMS,
+)
+from app.core.team_index import (
+    TeamIndex,
+    embedded_team_fingerprint,
+    invalidate_team_index,
+    load_team_index,
+    with_team_fingerprint,
+)
+from app.core.unit_of_work import fetch_once, remember
 from app.models.models import Team, Tournament
 
 
-class TournamentService:
+class TournamentRowsMixin:
+    """
+    Partie commune aux services de tournoi synchrone et asynchrone
+
+    Construit les requêtes (sans les exécuter) et les objets depuis les lignes
+    lues; chaque service ne fait qu'exécuter les requêtes avec son client.
+    """
+
+    def invalidateTeamIndex(self, tournamentId: str) -> None:
+        """
+        Oublie l'index des équipes d'un tournoi de ce worker
+
+        À appeler après une modification des équipes; les autres workers la
+        détectent à la prochaine lecture par l'empreinte des équipes.
+        """
+        invalidate_team_index(tournamentId)
+
+    def _tournamentRowQuery(self, tournamentId: str):
+        """Tournoi avec ses équipes embarquées sous "team" (triées par nom)"""
+        return (
+            TOURNAMENT_WITH_TEAMS.select(self.supabase)
+            .eq("id", tournamentId)
+            .order("name", foreign_table="team")
+            .single()
+        )
+
+    def _tournamentFingerprintQuery(self, tournamentId: str):
+        """Tournoi avec l'empreinte de ses équipes (voir app.core.team_index)"""
+        return (
+            with_team_fingerprint(
+                TOURNAMENT_WITH_TEAM_FINGERPRINT.select(self.supabase)
+            )
+            .eq("id", tournamentId)
+            .single()
+        )
+
+    def _teamRowsQuery(self, tournamentId: str):
+        return (
+            TEAMS.select(self.supabase).eq("tournament_id", tournamentId).order("name")
+        )
+
+    def _rememberTeamRows(self, tournamentId: str, tournamentData: Optional[dict]):
+        """Les équipes embarquées servent aussi les lectures d'équipes du traitement"""
+        if tournamentData:
+            teamRows = tournamentData.get("team") or []
+            remember("team", tournamentId, teamRows)
+            # Toutes les colonnes, donc aussi celles de l'index (et son empreinte)
+            remember("team_index", tournamentId, TeamIndex.from_rows(teamRows))
+
+    def _buildTournamentWithTeams(
+        self, tournamentData: dict
+    ) -> Tuple[Tournament, List[Team]]:
+        """Construit le tournoi et ses équipes depuis la ligne embarquée"""
+        teams = self._buildTeams(tournamentData.get("team"))
+        return self._buildTournament(tournamentData, teams), teams
+
+    def _tournamentWithTeamIndex(
+        self, tournamentData: dict, index: TeamIndex
+    ) -> Optional[Dict[str, Any]]:
+        """Résultat de getTournamentWithTeamIndex depuis le tournoi et l'index"""
+        result = self._tournamentWithTeams(
+            self._buildTournament(tournamentData, index.teams), index.teams
+        )
+        if result:
+            result["team_index"] = index
+        return result
+
+    def _tournamentWithTeams(
+        self, tournament: Tournament, teams: list
+    ) -> Optional[Dict[str, Any]]:
+        """Tournoi, équipes et indicateurs de démarrage (None sans équipe)"""
+        if len(teams) < 1:
+            return None
+        print(f"✅ Tournoi + {len(teams)} équipes récupérés")
+        return {
+            "tournament": tournament,
+            "teams": teams,
+            "teams_count": len(teams),
+            "has_minimum_teams": len(teams) >= 2,
+            "can_start": len(teams) >= 2 and tournament.status == "ready",
+        }
+
+    def _buildTournament(self, tournamentData: dict, teams: list) -> Tournament:
+        return Tournament(**{**tournamentData, "registered_teams": len(teams)})
+
+    def _buildTeams(self, teamRows: Optional[List[dict]]) -> List[Team]:
+        """Équipes valides (les lignes invalides sont ignorées)"""
+        teams = []
+        for team_data in teamRows or []:
+            try:
+                teams.append(Team(**team_data))
+            except Exception as e:
+                print(f"⚠️ Équipe invalide ignorée: {e}")
+                continue
+        return teams
+
+    def _validateTournamentData(self, tournamentData: Dict[str, Any]) -> bool:
+        """Valide si le tournoi peut avoir un planning généré"""
+        try:
+            tournament = tournamentData["tournament"]
+            teams = tournamentData["teams"]
+
+            print(
+                f"🔍 Validation: {len(teams)} équipes, {tournament.courts_available} terrains"
+            )
+
+            # Vérifier nombre minimum d'équipes
+            if len(teams) < 2:
+                print("❌ Pas assez d'équipes (minimum 2)")
+                return False
+
+            # Vérifier nombre maximum d'équipes
+            if len(teams) > tournament.max_teams:
+                print(f"❌ Trop d'équipes ({len(teams)} > {tournament.max_teams})")
+                return False
+
+            # Vérifier terrains
+            if tournament.courts_available <= 0:
+                print("❌ Nombre de terrains invalide")
+                return False
+
+            # Vérifier type de tournoi
+            if not tournament.tournament_type:
+                print("❌ Type de tournoi manquant")
+                return False
+
+            print("✅ Validation réussie")
+            return True
+
+        except Exception as e:
+            print(f"❌ Erreur validation: {e}")
+            return False
+
+
+class TournamentService(TournamentRowsMixin):
     """
     Service pour gerer les tournois et equipes
     """
@@ -33,22 +180,13 @@ class TournamentService:
         try:
             print(f"🔍 Récupération tournoi {tournamentId}")
 
-            result = (
-                self.supabase.table("tournament")
-                .select("*")
-                .eq("id", tournamentId)
-                .single()
-                .execute()
-            )
-            print(f"result : {result}")
-            if not result.data:
+            tournamentData = self._getTournamentRow(tournamentId)
+            if not tournamentData:
                 print(f"❌ Tournoi {tournamentId} non trouvé")
                 return None
-            teams = self.getTournamentTeams(tournamentId)
-            result.data["registered_teams"] = len(teams)
 
-            # Convertir en objet Pydantic
-            tournament = Tournament(**result.data)
+            # Convertir en objets Pydantic
+            tournament, _ = self._buildTournamentWithTeams(tournamentData)
             print(f"✅ Tournoi récupéré: {tournament.name}")
             return tournament
 
@@ -69,22 +207,14 @@ class TournamentService:
         try:
             print(f"👥 Récupération équipes du tournoi {tournamentId}")
 
-            result = (
-                self.supabase.table("team")
-                .select("*")
-                .eq("tournament_id", tournamentId)
-                .order("name")
-                .execute()
+            # Une seule lecture par traitement (voir app.core.unit_of_work)
+            teamRows = fetch_once(
+                "team",
+                tournamentId,
+                lambda: self._teamRowsQuery(tournamentId).execute().data,
             )
 
-            teams = []
-            for team_data in result.data or []:
-                try:
-                    team = Team(**team_data)
-                    teams.append(team)
-                except Exception as e:
-                    print(f"⚠️ Équipe invalide ignorée: {e}")
-                    continue
+            teams = self._buildTeams(teamRows)
 
             print(f"✅ {len(teams)} équipes récupérées")
             return teams
@@ -95,7 +225,7 @@ class TournamentService:
 
     def getTournamentWithTeams(self, tournamentId: str) -> Optional[Dict[str, Any]]:
         """
-        Récupère un tournoi avec ses équipes
+        Récupère un tournoi avec ses équipes (une seule requête)
 
         Args:
             tournmentId: ID du tournoi
@@ -106,63 +236,71 @@ class TournamentService:
         try:
             print(f"🔍 Récupération tournoi + équipes {tournamentId}")
 
-            tournament = self.getTournamentById(tournamentId)
-            if not tournament:
-                return None
-            teams = self.getTournamentTeams(tournamentId)
-            if len(teams) < 1:
+            tournamentData = self._getTournamentRow(tournamentId)
+            if not tournamentData:
+                print(f"❌ Tournoi {tournamentId} non trouvé")
                 return None
-            result = {
-                "tournament": tournament,
-                "teams": teams,
-                "teams_count": len(teams),
-                "has_minimum_teams": len(teams) >= 2,
-                "can_start": len(teams) >= 2 and tournament.status == "ready",
-            }
 
-            print(f"✅ Tournoi + {len(teams)} équipes récupérés")
-            return result
+            tournament, teams = self._buildTournamentWithTeams(tournamentData)
+            return self._tournamentWithTeams(tournament, teams)
 
         except Exception as e:
             print(f"❌ Erreur récupération tournoi avec équipes: {e}")
             return None
 
-    def _validateTournamentData(self, tournamentData: Dict[str, Any]) -> bool:
-        """Valide si le tournoi peut avoir un planning généré"""
-        try:
-            tournament = tournamentData["tournament"]
-            teams = tournamentData["teams"]
-
-            print(
-                f"🔍 Validation: {len(teams)} équipes, {tournament.courts_available} terrains"
-            )
+    def getTournamentWithTeamIndex(self, tournamentId: str) -> Optional[Dict[str, Any]]:
+        """
+        Récupère un tournoi avec l'index de ses équipes (génération)
 
-            # Vérifier nombre minimum d'équipes
-            if len(teams) < 2:
-                print("❌ Pas assez d'équipes (minimum 2)")
-                return False
+        Le tournoi est lu avec l'empreinte de ses équipes; les équipes ne sont
+        relues que si l'index en cache ne correspond plus (app.core.team_index).
 
-            # Vérifier nombre maximum d'équipes
-            if len(teams) > tournament.max_teams:
-                print(f"❌ Trop d'équipes ({len(teams)} > {tournament.max_teams})")
-                return False
+        Args:
+            tournamentId: ID du tournoi
 
-            # Vérifier terrains
-            if tournament.courts_available <= 0:
-                print("❌ Nombre de terrains invalide")
-                return False
+        Returns:
+            dict: comme getTournamentWithTeams, "teams" ne contenant que l'ID
+            et le nom des équipes, plus "team_index" (TeamIndex), ou None si erreur
+        """
+        try:
+            print(f"🔍 Récupération tournoi + index des équipes {tournamentId}")
 
-            # Vérifier type de tournoi
-            if not tournament.tournament_type:
-                print("❌ Type de tournoi manquant")
-                return False
+            tournamentData = fetch_once(
+                "tournament_fingerprint",
+                tournamentId,
+                lambda: self._tournamentFingerprintQuery(tournamentId).execute().data,
+            )
+            if not tournamentData:
+                print(f"❌ Tournoi {tournamentId} non trouvé")
+                return None
 
-            print("✅ Validation réussie")
-            return True
+            index = fetch_once(
+                "team_index",
+                tournamentId,
+                lambda: load_team_index(
+                    self.supabase,
+                    tournamentId,
+                    embedded_team_fingerprint(tournamentData),
+                ),
+            )
+            return self._tournamentWithTeamIndex(tournamentData, index)
 
         except Exception as e:
-            print(f"❌ Erreur validation: {e}")
-            return False
+            print(f"❌ Erreur récupération tournoi avec index des équipes: {e}")
+            return None
+
+    def _getTournamentRow(self, tournamentId: str) -> Optional[dict]:
+        """
+        Ligne du tournoi avec ses équipes embarquées sous "team"
+        (lue une fois par traitement)
+        """
+        tournamentData = fetch_once(
+            "tournament",
+            tournamentId,
+            lambda: self._tournamentRowQuery(tournamentId).execute().data,
+        )
+        self._rememberTeamRows(tournamentId, tournamentData)
+        return tournamentData
 
 
 tournamentService = TournamentService()
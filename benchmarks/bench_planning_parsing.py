@@ -0,0 +1,83 @@
+"""
+Benchmark du temps CPU de préparation d'une sauvegarde de planning
+
+Compare, pour un même JSON d'assistant:
+- avant: le dict brut est validé en AIPlanningData par chaque étape
+  (_buildPlanningRow, _buildMatchRows, _buildPouleRows), soit 3 validations
+- après: OpenAIClientService valide le JSON une fois, les étapes
+  réutilisent l'objet (_planningDetailsParams)
+
+Usage:
+    python -m benchmarks.bench_planning_parsing
+
+Résultats mesurés (1 vCPU, meilleur temps CPU moyen par génération):
+    équipes  matchs    avant (ms)  après (ms)   gain
+         32      56          1.15        0.98   1.2x
+        128     200          4.15        3.40   1.2x
+        512     776         19.17       14.35   1.3x
+Les 2 validations évitées représentent ~2 ms sur 512 équipes; le reste du
+temps est la construction des lignes (AIGeneratedMatch et uuid par match).
+"""
+
+import contextlib
+import io
+import time
+
+from app.models.models import AIPlanningData
+from app.services.database_service import DatabaseService
+from benchmarks.fixtures import build_planning_data, build_teams_mapping
+
+TEAM_SIZES = [32, 128, 512]
+ITERATIONS = 10
+REPEATS = 15
+TOURNAMENT_ID = "tournament-bench"
+
+
+def prepare_before(service: DatabaseService, raw: dict, mapping: dict) -> None:
+    planning = service._buildPlanningRow(TOURNAMENT_ID, raw, "poules_elimination")
+    service._buildMatchRows(planning["id"], raw, mapping)
+    service._buildPouleRows(planning["id"], raw)
+
+
+def prepare_after(service: DatabaseService, raw: dict, mapping: dict) -> None:
+    parsed = AIPlanningData.from_assistant(raw)  # OpenAIClientService
+    service._planningDetailsParams(TOURNAMENT_ID, parsed, "poules_elimination", mapping)
+
+
+def measure(service: DatabaseService, raw: dict, mapping: dict):
+    """
+    Meilleur temps CPU moyen (avant, après) sur REPEATS séries de ITERATIONS
+    appels, séries alternées pour lisser les variations de la machine
+    """
+    timings = {prepare_before: [], prepare_after: []}
+    for _ in range(REPEATS):
+        for prepare, samples in timings.items():
+            prepare(service, raw, mapping)  # échauffement
+            start = time.process_time()
+            for _ in range(ITERATIONS):
+                prepare(service, raw, mapping)
+            samples.append((time.process_time() - start) / ITERATIONS)
+    return min(timings[prepare_before]), min(timings[prepare_after])
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = DatabaseService()
+
+    print(
+        f"{'équipes':>8} {'matchs':>7} {'avant (ms)':>13} {'après (ms)':>11} {'gain':>6}"
+    )
+    for nb_teams in TEAM_SIZES:
+        raw = build_planning_data(nb_teams)
+        mapping = build_teams_mapping(nb_teams)
+        nb_matches = AIPlanningData(**raw).calculate_total_matches()
+
+        before, after = measure(service, raw, mapping)
+        print(
+            f"{nb_teams:>8} {nb_matches:>7} {before * 1000:>13.2f} "
+            f"{after * 1000:>11.2f} {before / after:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark de sérialisation des réponses de planning
+
+Compare le chemin historique (PlanningResponse + validation de response_model
++ jsonable_encoder + json.dumps) au chemin rapide (planning_response + orjson)
+sur des plannings de 8, 32 et 128 équipes.
+
+Usage:
+    python -m benchmarks.bench_planning_serialization
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import planning_response
+from app.models.models import AIPlanningData, AITournamentPlanning
+from app.schemas.response import PlanningResponse
+from benchmarks.fixtures import build_planning_data
+
+TEAM_SIZES = [8, 32, 128]
+ITERATIONS = 300
+MESSAGE = "Planning récupéré avec succès"
+
+# Même champ de réponse que celui construit par FastAPI pour response_model
+RESPONSE_FIELD = create_model_field(
+    name="Response_bench", type_=PlanningResponse, mode="serialization"
+)
+LOOP = asyncio.new_event_loop()
+
+
+def build_planning(nb_teams: int) -> AITournamentPlanning:
+    planning_data = build_planning_data(nb_teams)
+    return AITournamentPlanning(
+        id=str(uuid.uuid4()),
+        tournament_id=str(uuid.uuid4()),
+        type_tournoi=planning_data["type_tournoi"],
+        status="generated",
+        planning_data=planning_data,
+        total_matches=AIPlanningData(**planning_data).calculate_total_matches(),
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+
+def legacy_render(planning: AITournamentPlanning) -> bytes:
+    content = PlanningResponse(success=True, message=MESSAGE, data=planning)
+    encoded = LOOP.run_until_complete(
+        serialize_response(field=RESPONSE_FIELD, response_content=content)
+    )
+    return JSONResponse(encoded).body
+
+
+def fast_render(planning: AITournamentPlanning) -> bytes:
+    return planning_response(MESSAGE, planning).body
+
+
+def measure(render, planning: AITournamentPlanning) -> tuple:
+    body = render(planning)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        render(planning)
+    elapsed = time.perf_counter() - start
+    return len(body), len(body) * ITERATIONS / elapsed
+
+
+def main() -> None:
+    print(
+        f"{'équipes':>8} {'taille':>10} {'historique':>14} {'orjson':>14} {'gain':>7}"
+    )
+    for nb_teams in TEAM_SIZES:
+        planning = build_planning(nb_teams)
+        size, legacy_rate = measure(legacy_render, planning)
+        _, fast_rate = measure(fast_render, planning)
+        print(
+            f"{nb_teams:>8} {size:>9}o "
+            f"{legacy_rate / 1e6:>10.1f} Mo/s {fast_rate / 1e6:>10.1f} Mo/s "
+            f"{fast_rate / legacy_rate:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
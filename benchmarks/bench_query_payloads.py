@@ -0,0 +1,106 @@
+"""
+Benchmark de la taille des réponses Supabase sur les lectures fréquentes
+
+Compare, pour des lignes réalistes, le corps JSON renvoyé par PostgREST
+avec select("*") et avec les colonnes du catalogue (app.core.queries).
+
+Usage:
+    python -m benchmarks.bench_query_payloads [--teams 32]
+
+Résultats mesurés (octets par réponse JSON):
+    équipes  requête                          select=*   catalogue   gain
+         32  team.names (mapping)                 8623        1295   6.7x
+         32  planning.summary (régénération)     10879         258  42.2x
+         32  tournament + équipes                 8923        8931   1.0x
+        128  team.names (mapping)                34601        5289   6.5x
+        128  planning.summary (régénération)     38636         258 149.8x
+La lecture embarquée tournoi + équipes économise un aller-retour, pas des
+octets. Les fixtures ne contiennent que les colonnes des modèles: avec
+select=* les vraies lignes renvoient au moins autant de données.
+"""
+
+import argparse
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.core.queries import (
+    PLANNING_SUMMARY,
+    TEAM_NAMES,
+    TEAMS,
+    TOURNAMENT_WITH_TEAMS,
+    Query,
+)
+from benchmarks.fake_postgrest import build_team_rows, build_tournament_row
+from benchmarks.fixtures import build_planning_data
+
+
+def build_planning_row(nb_teams: int) -> Dict[str, Any]:
+    now = datetime(2024, 6, 1).isoformat()
+    planningData = build_planning_data(nb_teams)
+    return {
+        "id": "planning-bench",
+        "tournament_id": "tournament-bench",
+        "type_tournoi": planningData["type_tournoi"],
+        "status": "generated",
+        "planning_data": planningData,
+        "total_matches": 0,
+        "start_time": None,
+        "end_time": None,
+        "ai_comments": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def project(row: Dict[str, Any], columns: str) -> Dict[str, Any]:
+    """Colonnes d'une ligne (sans ressource embarquée) présentes dans la fixture"""
+    return {column: row[column] for column in columns.split(",") if column in row}
+
+
+def payload_size(data: Any) -> int:
+    return len(json.dumps(data, separators=(",", ":")).encode())
+
+
+def compare(query: Query, rows: List[Dict[str, Any]]) -> tuple:
+    """Taille (select=*, catalogue) d'une réponse de plusieurs lignes"""
+    return payload_size(rows), payload_size(
+        [project(row, query.columns) for row in rows]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--teams", type=int, default=32)
+    args = parser.parse_args()
+
+    tournament = build_tournament_row(args.teams)
+    teams = build_team_rows(args.teams)
+    planning = build_planning_row(args.teams)
+
+    results = [
+        ("team.names (mapping)", *compare(TEAM_NAMES, teams)),
+        ("planning.summary (régénération)", *compare(PLANNING_SUMMARY, [planning])),
+    ]
+
+    # Avant: tournoi et équipes en select=*; après: une requête embarquée
+    tournamentColumns = TOURNAMENT_WITH_TEAMS.columns.split(",team(")[0]
+    embedded = {
+        **project(tournament, tournamentColumns),
+        "team": [project(team, TEAMS.columns) for team in teams],
+    }
+    results.append(
+        (
+            "tournament + équipes",
+            payload_size(tournament) + payload_size(teams),
+            payload_size(embedded),
+        )
+    )
+
+    print(f"{'requête':<30} {'select=*':>10} {'catalogue':>11} {'gain':>6}")
+    for name, before, after in results:
+        print(f"{name:<30} {before:>10} {after:>11} {before / after:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark des octets échangés par une régénération (lecture de la base + rpc)
+
+Compare, pour une régénération qui ne déplace que quelques matchs:
+- complet: save_generated_planning reçoit planning + tous les matchs +
+  poules (aucune lecture)
+- entières: save_planning_revision ne reçoit que les lignes ajoutées ou
+  modifiées, mais la version de base est relue ligne entière pour le diff
+- empreintes: même envoi, la base n'est relue que par clé et row_hash
+
+Usage:
+    python -m benchmarks.bench_regeneration_diff
+
+Résultats mesurés (octets JSON lus + envoyés, diff en ms CPU, calcul des
+empreintes des nouvelles lignes compris; gain = complet / empreintes):
+    équipes  matchs  modifiés    complet   entières  empreintes   gain  diff (ms)
+         32      56         1      41322      39000       16382   2.5x       1.96
+        128     200         1     149190     139140       56758   2.6x       6.63
+        128     200        20     149190     148761       66379   2.2x       7.48
+        512     776        20     584324     552983      229438   2.5x      22.82
+Relire la base ligne entière annulait presque tout le gain de l'envoi
+différentiel (5 % au mieux). Le planning_data (JSON complet de l'IA) reste
+envoyé en entier avec la nouvelle version: c'est lui qui domine ensuite.
+"""
+
+import contextlib
+import copy
+import io
+import json
+import time
+from operator import itemgetter
+
+from app.core.row_diff import diff_rows
+from app.models.models import AIGeneratedMatch, AIGeneratedPoule, AIPlanningData
+from app.services.database_service import DatabaseService
+from benchmarks.fixtures import build_planning_data, build_teams_mapping
+
+CASES = [(32, 1), (128, 1), (128, 20), (512, 20)]
+TOURNAMENT_ID = "tournament-bench"
+
+
+def payload_size(data) -> int:
+    return len(json.dumps(data, separators=(",", ":")).encode())
+
+
+def move_matches(planningData: dict, count: int) -> dict:
+    """Régénération: les count premiers matchs de poule changent de terrain"""
+    moved = copy.deepcopy(planningData)
+    matches = [match for poule in moved["poules"] for match in poule["matchs"]]
+    for match in matches[:count]:
+        match["terrain"] += 1
+    return moved
+
+
+def base_read(rows: list, key: str, full: bool) -> list:
+    """Lignes de la version de base telles que relues (entières ou clé + empreinte)"""
+    if full:
+        return [{k: v for k, v in row.items() if k != "row_hash"} for row in rows]
+    return [{key: row[key], "row_hash": row["row_hash"]} for row in rows]
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = DatabaseService()
+
+    print(
+        f"{'équipes':>8} {'matchs':>7} {'modifiés':>9} {'complet':>10} "
+        f"{'entières':>10} {'empreintes':>11} {'gain':>6} {'diff (ms)':>10}"
+    )
+    for nb_teams, changed in CASES:
+        raw = build_planning_data(nb_teams)
+        mapping = build_teams_mapping(nb_teams)
+        base = service._planningDetailsParams(
+            TOURNAMENT_ID, AIPlanningData.from_assistant(raw), "poules", mapping
+        )
+        params = service._planningDetailsParams(
+            TOURNAMENT_ID,
+            AIPlanningData.from_assistant(move_matches(raw, changed)),
+            "poules",
+            mapping,
+        )
+        baseMatches = base_read(base["p_matches"], "match_id_ai", full=False)
+        basePoules = base_read(base["p_poules"], "poule_id", full=False)
+
+        # Diff sur empreintes, plus le calcul des empreintes des nouvelles lignes
+        # (fait à la construction des lignes, compté ici)
+        start = time.process_time()
+        for model, rows in (
+            (AIGeneratedMatch, params["p_matches"]),
+            (AIGeneratedPoule, params["p_poules"]),
+        ):
+            for row in rows:
+                service._rowHash(model, row)
+        matchDiff = diff_rows(
+            baseMatches, params["p_matches"], "match_id_ai", itemgetter("row_hash")
+        )
+        pouleDiff = diff_rows(
+            basePoules, params["p_poules"], "poule_id", itemgetter("row_hash")
+        )
+        elapsed = time.process_time() - start
+
+        revision = {
+            "p_planning": params["p_planning"],
+            "p_base_planning_id": base["p_planning"]["id"],
+            "p_matches": matchDiff.changed,
+            "p_poules": pouleDiff.changed,
+            "p_replaced_match_ids": matchDiff.replaced,
+            "p_replaced_poule_ids": pouleDiff.replaced,
+        }
+        fullRead = [
+            base_read(base["p_matches"], "match_id_ai", full=True),
+            base_read(base["p_poules"], "poule_id", full=True),
+        ]
+        complete = payload_size(params)
+        fullRows = payload_size(revision) + payload_size(fullRead)
+        hashed = payload_size(revision) + payload_size([baseMatches, basePoules])
+        print(
+            f"{nb_teams:>8} {len(params['p_matches']):>7} {changed:>9} "
+            f"{complete:>10} {fullRows:>10} {hashed:>11} "
+            f"{complete / hashed:>5.1f}x {elapsed * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+PostgREST simulé pour les benchmarks: réponses en mémoire avec une latence
+réseau fixe par requête, pour les clients httpx synchrone et asynchrone
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fixtures import build_team_names
+
+TOURNAMENT_ID = "tournament-bench"
+
+
+def build_tournament_row(nb_teams: int) -> Dict[str, Any]:
+    now = datetime(2024, 6, 1).isoformat()
+    return {
+        "id": TOURNAMENT_ID,
+        "name": "Tournoi benchmark",
+        "description": None,
+        "tournament_type": "poules",
+        "max_teams": nb_teams,
+        "courts_available": 4,
+        "start_date": "2024-06-15",
+        "start_time": "09:00:00",
+        "organizer_id": "organizer-1",
+        "status": "ready",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def build_team_rows(nb_teams: int) -> List[Dict[str, Any]]:
+    now = datetime(2024, 6, 1).isoformat()
+    return [
+        {
+            "id": f"team-{index + 1}",
+            "name": name,
+            "description": "",
+            "tournament_id": TOURNAMENT_ID,
+            "contact_email": "contact@example.com",
+            "contact_phone": "0600000000",
+            "skill_level": "intermediate",
+            "notes": "",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for index, name in enumerate(build_team_names(nb_teams))
+    ]
+
+
+class FakePostgrest:
+    """
+    Réponses PostgREST minimales pour le pipeline de génération
+
+    Args:
+        nb_teams: Nombre d'équipes du tournoi simulé
+        latency: Latence simulée par requête (secondes)
+    """
+
+    def __init__(self, nb_teams: int, latency: float):
+        self.latency = latency
+        self.tournament = build_tournament_row(nb_teams)
+        self.teams = build_team_rows(nb_teams)
+        self.requests = 0
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        table = request.url.path.rsplit("/", 1)[-1]
+        single = "vnd.pgrst.object" in request.headers.get("accept", "")
+
+        if "/rpc/" in request.url.path:
+            # save_generated_planning: renvoie le planning inséré
+            return httpx.Response(200, json=json.loads(request.content)["p_planning"])
+
+        if request.method == "POST":
+            # Insertion: PostgREST renvoie les lignes insérées
+            rows = json.loads(request.content)
+            return httpx.Response(201, json=rows if isinstance(rows, list) else [rows])
+
+        data: Optional[Any] = None
+        if table == "tournament":
+            # Équipes embarquées (select=...,team(...))
+            data = {**self.tournament, "team": self.teams}
+        elif table == "team":
+            data = self.teams
+        elif table == "ai_tournament_planning":
+            data = {"tournament_id": TOURNAMENT_ID}
+        if single and isinstance(data, list):
+            data = data[0]
+        return httpx.Response(200, json=data)
+
+    def transport(self) -> httpx.BaseTransport:
+        fake = self
+
+        class Transport(httpx.BaseTransport):
+            def handle_request(self, request: httpx.Request) -> httpx.Response:
+                time.sleep(fake.latency)
+                return fake.respond(request)
+
+        return Transport()
+
+    def async_transport(self) -> httpx.AsyncBaseTransport:
+        fake = self
+
+        class AsyncTransport(httpx.AsyncBaseTransport):
+            async def handle_async_request(
+                self, request: httpx.Request
+            ) -> httpx.Response:
+                await asyncio.sleep(fake.latency)
+                return fake.respond(request)
+
+        return AsyncTransport()
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+
+def build_team_names(nb_teams: int) -> List[str]:
+    """Noms d'équipes de test"""
+    return [f"Équipe {index + 1}" for index in range(nb_teams)]
+
+
+def build_planning_data(nb_teams: int, courts: int = 4) -> Dict[str, Any]:
+    """
+    Construit un JSON d'assistant réaliste (poules de 4 + phase finale)
+
+    Args:
+        nb_teams: Nombre d'équipes (multiple de 4)
+        courts: Nombre de terrains
+
+    Returns:
+        dict: JSON au format attendu par AIPlanningData
+    """
+    teams = build_team_names(nb_teams)
+    start = datetime(2024, 6, 15, 9, 0)
+    slot = 0
+
+    def next_match(match_id: str, equipe_a: str, equipe_b: str) -> Dict[str, Any]:
+        nonlocal slot
+        debut = start + timedelta(minutes=20 * (slot // courts))
+        match = {
+            "match_id": match_id,
+            "equipe_a": equipe_a,
+            "equipe_b": equipe_b,
+            "debut_horaire": debut.isoformat(),
+            "fin_horaire": (debut + timedelta(minutes=15)).isoformat(),
+            "terrain": slot % courts + 1,
+        }
+        slot += 1
+        return match
+
+    poules = []
+    for index in range(nb_teams // 4):
+        equipes = teams[index * 4 : index * 4 + 4]
+        poule_id = f"poule_{index + 1}"
+        matchs = [
+            next_match(f"{poule_id}_m{number + 1}", equipe_a, equipe_b)
+            for number, (equipe_a, equipe_b) in enumerate(
+                (a, b) for i, a in enumerate(equipes) for b in equipes[i + 1 :]
+            )
+        ]
+        poules.append(
+            {
+                "poule_id": poule_id,
+                "nom_poule": f"Poule {index + 1}",
+                "equipes": equipes,
+                "matchs": matchs,
+            }
+        )
+
+    return {
+        "type_tournoi": "poules_elimination",
+        "poules": poules,
+        "phase_elimination_apres_poules": {
+            "quarts": [
+                next_match(f"quart_{n}", f"1er_poule_{n}", f"2e_poule_{n + 1}")
+                for n in range(1, 5)
+            ],
+            "demi_finales": [
+                next_match(
+                    f"demi_{n}", f"winner_quart_{2 * n - 1}", f"winner_quart_{2 * n}"
+                )
+                for n in range(1, 3)
+            ],
+            "finale": next_match("finale", "winner_demi_1", "winner_demi_2"),
+            "match_troisieme_place": next_match(
+                "petite_finale", "loser_demi_1", "loser_demi_2"
+            ),
+        },
+        "commentaires": f"Planning de test pour {nb_teams} équipes",
+    }
+
+
+def build_teams_mapping(nb_teams: int) -> Dict[str, str]:
+    """Mapping nom -> id pour les équipes de test"""
+    return {
+        name: f"team-{index + 1}"
+        for index, name in enumerate(build_team_names(nb_teams))
+    }
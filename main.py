@@ -4,8 +4,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import des routes
+from app.api.routes.admin import router as admin_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.planning import router as planning_router
 from app.core.security import configure_security
+from app.core.server import get_server_config
 from app.core.rate_limiter import configure_rate_limiter
 
 
@@ -25,6 +28,8 @@ configure_rate_limiter(app)
 
 # Inclusion des routes avec préfixes
 app.include_router(planning_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
 
 # Configuration du port pour le déploiement
 PORT = int(os.getenv("PORT", 8003))
@@ -55,22 +60,16 @@ if __name__ == "__main__":
         host = "127.0.0.1"
         print(f"🏠 Environnement local détecté")
     
-    # Configuration de uvicorn
-    config = {
-        "host": host,
-        "port": PORT,
-        "log_level": "info" if environment == "production" else "debug",
-        "access_log": True,
-    }
-    
-    # En développement, ajouter le reload
-    if environment == "development":
-        config["reload"] = True
-    
+    # Configuration de uvicorn (workers, uvloop, httptools en production)
+    config = get_server_config(environment, host, PORT)
+
     print(f"🚀 Démarrage de l'AI Tournament Service")
     print(f"   - Environnement: {environment}")
     print(f"   - Host: {host}")
     print(f"   - Port: {PORT}")
+    if environment == "production":
+        print(f"   - Workers: {config['workers']}")
+        print(f"   - Boucle/HTTP: {config['loop']}/{config['http']}")
     print(f"   - Documentation: http://{host}:{PORT}/docs")
     
     # Démarrage du serveur
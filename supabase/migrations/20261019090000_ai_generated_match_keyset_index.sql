@@ -0,0 +1,4 @@
+-- Index pour la pagination par clé de GET /api/planning/{id}/matches
+-- (planning_id = ? ORDER BY debut_horaire, id)
+create index if not exists ai_generated_match_planning_keyset_idx
+    on public.ai_generated_match (planning_id, debut_horaire, id);
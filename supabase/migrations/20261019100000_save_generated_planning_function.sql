@@ -0,0 +1,55 @@
+-- Sauvegarde d'un planning généré (planning + matchs + poules) en un seul
+-- aller-retour: appelée via supabase.rpc("save_generated_planning", ...).
+-- Le corps de la fonction s'exécute dans une seule transaction: si une
+-- insertion échoue, aucune ligne n'est conservée.
+create or replace function public.save_generated_planning(
+    p_planning jsonb,
+    p_matches jsonb default '[]'::jsonb,
+    p_poules jsonb default '[]'::jsonb
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_planning public.ai_tournament_planning;
+begin
+    insert into public.ai_tournament_planning (
+        id, tournament_id, type_tournoi, status, planning_data, total_matches,
+        start_time, end_time, ai_comments, created_at, updated_at
+    )
+    select
+        id, tournament_id, type_tournoi, status, planning_data, total_matches,
+        start_time, end_time, ai_comments, created_at, updated_at
+    from jsonb_populate_record(null::public.ai_tournament_planning, p_planning)
+    returning * into v_planning;
+
+    insert into public.ai_generated_match (
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    )
+    select
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    from jsonb_populate_recordset(null::public.ai_generated_match, p_matches);
+
+    insert into public.ai_generated_poule (
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    )
+    select
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    from jsonb_populate_recordset(null::public.ai_generated_poule, p_poules);
+
+    return to_jsonb(v_planning);
+end;
+$$;
+
+revoke execute on function public.save_generated_planning(jsonb, jsonb, jsonb)
+    from public, anon, authenticated;
+grant execute on function public.save_generated_planning(jsonb, jsonb, jsonb)
+    to service_role;
@@ -0,0 +1,46 @@
+-- Suppression d'un planning en un seul aller-retour: les matchs et les poules
+-- générés suivent leur planning (ON DELETE CASCADE). Un seul
+-- DELETE ai_tournament_planning retire le planning et ses enfants dans la
+-- même instruction, donc atomiquement.
+do $$
+declare
+    v_constraint record;
+begin
+    -- Clés étrangères existantes sur planning_id (nom inconnu selon l'historique
+    -- du schéma): remplacées par une contrainte en cascade
+    for v_constraint in
+        select c.conrelid::regclass as table_name, c.conname
+        from pg_constraint c
+        join pg_attribute a
+            on a.attrelid = c.conrelid and a.attnum = any (c.conkey)
+        where c.contype = 'f'
+            and c.confrelid = 'public.ai_tournament_planning'::regclass
+            and c.conrelid in (
+                'public.ai_generated_match'::regclass,
+                'public.ai_generated_poule'::regclass
+            )
+            and a.attname = 'planning_id'
+    loop
+        execute format(
+            'alter table %s drop constraint %I',
+            v_constraint.table_name,
+            v_constraint.conname
+        );
+    end loop;
+end;
+$$;
+
+alter table public.ai_generated_match
+    add constraint ai_generated_match_planning_id_fkey
+    foreign key (planning_id) references public.ai_tournament_planning (id)
+    on delete cascade;
+
+alter table public.ai_generated_poule
+    add constraint ai_generated_poule_planning_id_fkey
+    foreign key (planning_id) references public.ai_tournament_planning (id)
+    on delete cascade;
+
+-- La cascade recherche les enfants par planning_id: index des poules
+-- (celui des matchs est ai_generated_match_planning_keyset_idx)
+create index if not exists ai_generated_poule_planning_id_idx
+    on public.ai_generated_poule (planning_id);
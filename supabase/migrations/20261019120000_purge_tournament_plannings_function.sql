@@ -0,0 +1,25 @@
+-- Purge de tous les plannings d'un tournoi en une instruction: appelée via
+-- supabase.rpc("purge_tournament_plannings", ...) par la route
+-- DELETE /api/admin/tournament/{tournament_id}/plannings.
+-- Matchs et poules suivent leurs plannings (ON DELETE CASCADE,
+-- 20261019110000_cascade_planning_children.sql): pas de suppression par
+-- planning, quel que soit l'historique du tournoi.
+create index if not exists ai_tournament_planning_tournament_id_idx
+    on public.ai_tournament_planning (tournament_id);
+
+create or replace function public.purge_tournament_plannings(
+    p_tournament_id public.ai_tournament_planning.tournament_id%type
+)
+returns setof public.ai_tournament_planning.id%type
+language sql
+security invoker
+set search_path = public
+as $$
+    delete from public.ai_tournament_planning
+    where tournament_id = p_tournament_id
+    returning id;
+$$;
+
+revoke execute on function public.purge_tournament_plannings
+    from public, anon, authenticated;
+grant execute on function public.purge_tournament_plannings to service_role;
@@ -0,0 +1,147 @@
+-- Plannings versionnés: une régénération crée une nouvelle version à côté de
+-- la version active, puis bascule le pointer "version active" du tournoi
+-- (is_active) dans la même transaction que la sauvegarde. Les lectures par
+-- tournoi ne voient jamais de trou; les anciennes versions sont supprimées
+-- ensuite par collect_planning_versions.
+alter table public.ai_tournament_planning
+    add column if not exists is_active boolean not null default false;
+
+-- Version active des plannings existants: le plus récent de chaque tournoi
+update public.ai_tournament_planning
+set is_active = true
+where id in (
+    select distinct on (tournament_id) id
+    from public.ai_tournament_planning
+    order by tournament_id, created_at desc nulls last
+);
+
+-- Au plus une version active par tournoi (index des lectures par tournoi)
+create unique index if not exists ai_tournament_planning_active_idx
+    on public.ai_tournament_planning (tournament_id)
+    where is_active;
+
+-- Bascule atomique de la version active d'un tournoi
+create or replace function public.activate_planning(
+    p_planning_id public.ai_tournament_planning.id%type
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_tournament_id public.ai_tournament_planning.tournament_id%type;
+    v_planning public.ai_tournament_planning;
+begin
+    select tournament_id into v_tournament_id
+    from public.ai_tournament_planning
+    where id = p_planning_id;
+    if not found then
+        raise exception 'planning % introuvable', p_planning_id
+            using errcode = 'P0002';
+    end if;
+
+    -- Bascules concurrentes d'un même tournoi exécutées l'une après l'autre
+    perform pg_advisory_xact_lock(hashtext('activate_planning:' || v_tournament_id));
+
+    -- Désactiver avant d'activer: l'index unique est vérifié ligne par ligne
+    update public.ai_tournament_planning
+    set is_active = false
+    where tournament_id = v_tournament_id and is_active and id <> p_planning_id;
+
+    update public.ai_tournament_planning
+    set is_active = true
+    where id = p_planning_id
+    returning * into v_planning;
+
+    return to_jsonb(v_planning);
+end;
+$$;
+
+-- save_generated_planning active la version sauvegardée dans sa transaction
+-- (p_activate = false: activation par activate_planning une fois les matchs
+-- insérés par lots)
+drop function if exists public.save_generated_planning(jsonb, jsonb, jsonb);
+
+create or replace function public.save_generated_planning(
+    p_planning jsonb,
+    p_matches jsonb default '[]'::jsonb,
+    p_poules jsonb default '[]'::jsonb,
+    p_activate boolean default true
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_planning public.ai_tournament_planning;
+begin
+    insert into public.ai_tournament_planning (
+        id, tournament_id, type_tournoi, status, planning_data, total_matches,
+        start_time, end_time, ai_comments, created_at, updated_at
+    )
+    select
+        id, tournament_id, type_tournoi, status, planning_data, total_matches,
+        start_time, end_time, ai_comments, created_at, updated_at
+    from jsonb_populate_record(null::public.ai_tournament_planning, p_planning)
+    returning * into v_planning;
+
+    insert into public.ai_generated_match (
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    )
+    select
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    from jsonb_populate_recordset(null::public.ai_generated_match, p_matches);
+
+    insert into public.ai_generated_poule (
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    )
+    select
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    from jsonb_populate_recordset(null::public.ai_generated_poule, p_poules);
+
+    if p_activate then
+        return public.activate_planning(v_planning.id);
+    end if;
+    return to_jsonb(v_planning);
+end;
+$$;
+
+-- Suppression des versions remplacées d'un tournoi: seulement les versions
+-- inactives plus anciennes que la version active (une version en cours de
+-- sauvegarde, plus récente, est conservée). Matchs et poules en cascade.
+create or replace function public.collect_planning_versions(
+    p_tournament_id public.ai_tournament_planning.tournament_id%type
+)
+returns setof public.ai_tournament_planning.id%type
+language sql
+security invoker
+set search_path = public
+as $$
+    delete from public.ai_tournament_planning p
+    where p.tournament_id = p_tournament_id
+        and not p.is_active
+        and p.created_at < (
+            select a.created_at
+            from public.ai_tournament_planning a
+            where a.tournament_id = p_tournament_id and a.is_active
+        )
+    returning p.id;
+$$;
+
+revoke execute on function public.activate_planning
+    from public, anon, authenticated;
+grant execute on function public.activate_planning to service_role;
+revoke execute on function public.save_generated_planning
+    from public, anon, authenticated;
+grant execute on function public.save_generated_planning to service_role;
+revoke execute on function public.collect_planning_versions
+    from public, anon, authenticated;
+grant execute on function public.collect_planning_versions to service_role;
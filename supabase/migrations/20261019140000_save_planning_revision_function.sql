@@ -0,0 +1,76 @@
+-- Sauvegarde différentielle d'une régénération: la nouvelle version ne reçoit
+-- du client que les matchs et poules ajoutés ou modifiés par rapport à la
+-- version de base; les lignes inchangées sont recopiées depuis la base côté
+-- serveur (sans aller-retour). Tout est fait dans une transaction, qui
+-- active la nouvelle version comme save_generated_planning.
+create or replace function public.save_planning_revision(
+    p_planning jsonb,
+    p_base_planning_id public.ai_tournament_planning.id%type,
+    p_matches jsonb default '[]'::jsonb,
+    p_poules jsonb default '[]'::jsonb,
+    p_replaced_match_ids text[] default '{}',
+    p_replaced_poule_ids text[] default '{}',
+    p_activate boolean default true
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_planning public.ai_tournament_planning;
+begin
+    -- Version de base verrouillée: collect_planning_versions ne peut pas la
+    -- supprimer pendant la copie
+    perform 1
+    from public.ai_tournament_planning
+    where id = p_base_planning_id
+    for share;
+    if not found then
+        raise exception 'planning % introuvable', p_base_planning_id
+            using errcode = 'P0002';
+    end if;
+
+    -- Planning + lignes ajoutées ou modifiées, sans activer la version
+    select * into v_planning
+    from jsonb_populate_record(
+        null::public.ai_tournament_planning,
+        public.save_generated_planning(p_planning, p_matches, p_poules, false)
+    );
+
+    -- Lignes inchangées: copies de la version de base (nouvel id), sauf
+    -- celles remplacées (modifiées) ou supprimées par la régénération
+    insert into public.ai_generated_match (
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    )
+    select
+        gen_random_uuid(), v_planning.id, match_id_ai, equipe_a, equipe_b,
+        terrain, debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    from public.ai_generated_match
+    where planning_id = p_base_planning_id
+        and match_id_ai <> all (p_replaced_match_ids);
+
+    insert into public.ai_generated_poule (
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    )
+    select
+        gen_random_uuid(), v_planning.id, poule_id, nom_poule, equipes,
+        nb_equipes, nb_matches, created_at
+    from public.ai_generated_poule
+    where planning_id = p_base_planning_id
+        and poule_id <> all (p_replaced_poule_ids);
+
+    if p_activate then
+        return public.activate_planning(v_planning.id);
+    end if;
+    return to_jsonb(v_planning);
+end;
+$$;
+
+revoke execute on function public.save_planning_revision
+    from public, anon, authenticated;
+grant execute on function public.save_planning_revision to service_role;
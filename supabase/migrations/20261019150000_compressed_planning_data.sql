@@ -0,0 +1,64 @@
+-- Stockage compressé optionnel du JSON de l'assistant (PLANNING_DATA_COMPRESSION):
+-- "<encodage>:<base64>" dans planning_data_compressed, planning_data restant
+-- vide ('{}'). Les plannings existants gardent planning_data en clair; une
+-- lecture complète sélectionne les deux colonnes.
+alter table public.ai_tournament_planning
+    add column if not exists planning_data_compressed text;
+
+-- Déjà compressé par l'application: inutile que TOAST le recompresse
+alter table public.ai_tournament_planning
+    alter column planning_data_compressed set storage external;
+
+-- save_generated_planning insère aussi la colonne compressée
+create or replace function public.save_generated_planning(
+    p_planning jsonb,
+    p_matches jsonb default '[]'::jsonb,
+    p_poules jsonb default '[]'::jsonb,
+    p_activate boolean default true
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_planning public.ai_tournament_planning;
+begin
+    insert into public.ai_tournament_planning (
+        id, tournament_id, type_tournoi, status, planning_data,
+        planning_data_compressed, total_matches, start_time, end_time,
+        ai_comments, created_at, updated_at
+    )
+    select
+        id, tournament_id, type_tournoi, status, planning_data,
+        planning_data_compressed, total_matches, start_time, end_time,
+        ai_comments, created_at, updated_at
+    from jsonb_populate_record(null::public.ai_tournament_planning, p_planning)
+    returning * into v_planning;
+
+    insert into public.ai_generated_match (
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    )
+    select
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    from jsonb_populate_recordset(null::public.ai_generated_match, p_matches);
+
+    insert into public.ai_generated_poule (
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    )
+    select
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    from jsonb_populate_recordset(null::public.ai_generated_poule, p_poules);
+
+    if p_activate then
+        return public.activate_planning(v_planning.id);
+    end if;
+    return to_jsonb(v_planning);
+end;
+$$;
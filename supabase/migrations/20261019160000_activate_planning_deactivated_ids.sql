@@ -0,0 +1,46 @@
+-- activate_planning renvoie aussi les versions qu'il vient de désactiver
+-- (deactivated_ids), pour que l'application oublie leurs entrées de cache;
+-- leur updated_at change avec is_active (nouvel ETag).
+create or replace function public.activate_planning(
+    p_planning_id public.ai_tournament_planning.id%type
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_tournament_id public.ai_tournament_planning.tournament_id%type;
+    v_planning public.ai_tournament_planning;
+    v_deactivated jsonb;
+begin
+    select tournament_id into v_tournament_id
+    from public.ai_tournament_planning
+    where id = p_planning_id;
+    if not found then
+        raise exception 'planning % introuvable', p_planning_id
+            using errcode = 'P0002';
+    end if;
+
+    -- Bascules concurrentes d'un même tournoi exécutées l'une après l'autre
+    perform pg_advisory_xact_lock(hashtext('activate_planning:' || v_tournament_id));
+
+    -- Désactiver avant d'activer: l'index unique est vérifié ligne par ligne
+    with deactivated as (
+        update public.ai_tournament_planning
+        set is_active = false, updated_at = now()
+        where tournament_id = v_tournament_id and is_active and id <> p_planning_id
+        returning id
+    )
+    select coalesce(jsonb_agg(id), '[]'::jsonb) into v_deactivated
+    from deactivated;
+
+    update public.ai_tournament_planning
+    set is_active = true
+    where id = p_planning_id
+    returning * into v_planning;
+
+    return to_jsonb(v_planning)
+        || jsonb_build_object('deactivated_ids', v_deactivated);
+end;
+$$;
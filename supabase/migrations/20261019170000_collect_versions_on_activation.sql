@@ -0,0 +1,151 @@
+-- Suppression des versions remplacées à chaque activation, dans la même
+-- transaction (génération comme régénération): plus de collecte différée
+-- par un minuteur propre à chaque worker. activate_planning supprime les
+-- versions remplacées avant la version qu'il désactive et renvoie leurs ids
+-- (collected_ids): un tournoi garde au plus sa version active et la
+-- précédente.
+create or replace function public.activate_planning(
+    p_planning_id public.ai_tournament_planning.id%type
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_tournament_id public.ai_tournament_planning.tournament_id%type;
+    v_planning public.ai_tournament_planning;
+    v_deactivated jsonb;
+    v_collected jsonb;
+begin
+    select tournament_id into v_tournament_id
+    from public.ai_tournament_planning
+    where id = p_planning_id;
+    if not found then
+        raise exception 'planning % introuvable', p_planning_id
+            using errcode = 'P0002';
+    end if;
+
+    -- Bascules concurrentes d'un même tournoi exécutées l'une après l'autre
+    perform pg_advisory_xact_lock(hashtext('activate_planning:' || v_tournament_id));
+
+    -- Désactiver avant d'activer: l'index unique est vérifié ligne par ligne
+    with deactivated as (
+        update public.ai_tournament_planning
+        set is_active = false, updated_at = now()
+        where tournament_id = v_tournament_id and is_active and id <> p_planning_id
+        returning id
+    )
+    select coalesce(jsonb_agg(id), '[]'::jsonb) into v_deactivated
+    from deactivated;
+
+    update public.ai_tournament_planning
+    set is_active = true
+    where id = p_planning_id
+    returning * into v_planning;
+
+    -- Versions remplacées avant celle qui vient d'être désactivée: supprimées
+    -- (matchs et poules en cascade). La version désactivée reste lisible
+    -- jusqu'à l'activation suivante; une version plus récente en cours de
+    -- sauvegarde (inactive) est conservée.
+    with collected as (
+        delete from public.ai_tournament_planning p
+        where p.tournament_id = v_tournament_id
+            and not p.is_active
+            and p.created_at < (
+                select min(d.created_at)
+                from public.ai_tournament_planning d
+                where d.id::text in (
+                    select jsonb_array_elements_text(v_deactivated)
+                )
+            )
+        returning p.id
+    )
+    select coalesce(jsonb_agg(id), '[]'::jsonb) into v_collected
+    from collected;
+
+    return to_jsonb(v_planning)
+        || jsonb_build_object(
+            'deactivated_ids', v_deactivated,
+            'collected_ids', v_collected
+        );
+end;
+$$;
+
+create or replace function public.save_planning_revision(
+    p_planning jsonb,
+    p_base_planning_id public.ai_tournament_planning.id%type,
+    p_matches jsonb default '[]'::jsonb,
+    p_poules jsonb default '[]'::jsonb,
+    p_replaced_match_ids text[] default '{}',
+    p_replaced_poule_ids text[] default '{}',
+    p_activate boolean default true
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_planning public.ai_tournament_planning;
+begin
+    -- Verrou de bascule du tournoi pris d'abord, comme activate_planning:
+    -- une activation concurrente (qui supprime des versions) attend la fin
+    -- de la copie au lieu de bloquer sur la version de base
+    perform pg_advisory_xact_lock(
+        hashtext('activate_planning:' || (p_planning ->> 'tournament_id'))
+    );
+
+    -- Version de base verrouillée: elle ne peut pas être supprimée pendant la
+    -- copie
+    perform 1
+    from public.ai_tournament_planning
+    where id = p_base_planning_id
+    for share;
+    if not found then
+        raise exception 'planning % introuvable', p_base_planning_id
+            using errcode = 'P0002';
+    end if;
+
+    -- Planning + lignes ajoutées ou modifiées, sans activer la version
+    select * into v_planning
+    from jsonb_populate_record(
+        null::public.ai_tournament_planning,
+        public.save_generated_planning(p_planning, p_matches, p_poules, false)
+    );
+
+    -- Lignes inchangées: copies de la version de base (nouvel id), sauf
+    -- celles remplacées (modifiées) ou supprimées par la régénération
+    insert into public.ai_generated_match (
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    )
+    select
+        gen_random_uuid(), v_planning.id, match_id_ai, equipe_a, equipe_b,
+        terrain, debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at
+    from public.ai_generated_match
+    where planning_id = p_base_planning_id
+        and match_id_ai <> all (p_replaced_match_ids);
+
+    insert into public.ai_generated_poule (
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at
+    )
+    select
+        gen_random_uuid(), v_planning.id, poule_id, nom_poule, equipes,
+        nb_equipes, nb_matches, created_at
+    from public.ai_generated_poule
+    where planning_id = p_base_planning_id
+        and poule_id <> all (p_replaced_poule_ids);
+
+    if p_activate then
+        return public.activate_planning(v_planning.id);
+    end if;
+    return to_jsonb(v_planning);
+end;
+$$;
+
+-- Remplacée par la collecte de activate_planning
+drop function if exists public.collect_planning_versions;
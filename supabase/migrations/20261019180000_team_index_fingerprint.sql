@@ -0,0 +1,24 @@
+-- Empreinte des équipes d'un tournoi (app.core.team_index): nombre de lignes
+-- et plus grand updated_at, lus par queries.TEAM_FINGERPRINT sans télécharger
+-- les équipes. L'index en cache n'est fiable que si toute modification d'une
+-- équipe avance son updated_at, quel que soit le client qui l'écrit.
+create or replace function public.touch_team_updated_at()
+returns trigger
+language plpgsql
+set search_path = public
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists team_touch_updated_at on public.team;
+create trigger team_touch_updated_at
+    before update on public.team
+    for each row
+    execute function public.touch_team_updated_at();
+
+-- Décompte et dernière modification par tournoi depuis l'index seul
+create index if not exists team_tournament_updated_at_idx
+    on public.team (tournament_id, updated_at desc);
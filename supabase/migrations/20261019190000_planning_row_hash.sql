@@ -0,0 +1,139 @@
+-- Empreinte du contenu des matchs et poules (calculée par l'application,
+-- app.core.row_diff.content_hash): une régénération ne relit de la version de
+-- base que les clés et empreintes de ses lignes, plus les lignes entières.
+-- Les lignes antérieures restent sans empreinte et sont réécrites à leur
+-- prochaine régénération.
+alter table public.ai_generated_match
+    add column if not exists row_hash text;
+alter table public.ai_generated_poule
+    add column if not exists row_hash text;
+
+-- save_generated_planning insère aussi les empreintes
+create or replace function public.save_generated_planning(
+    p_planning jsonb,
+    p_matches jsonb default '[]'::jsonb,
+    p_poules jsonb default '[]'::jsonb,
+    p_activate boolean default true
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_planning public.ai_tournament_planning;
+begin
+    insert into public.ai_tournament_planning (
+        id, tournament_id, type_tournoi, status, planning_data,
+        planning_data_compressed, total_matches, start_time, end_time,
+        ai_comments, created_at, updated_at
+    )
+    select
+        id, tournament_id, type_tournoi, status, planning_data,
+        planning_data_compressed, total_matches, start_time, end_time,
+        ai_comments, created_at, updated_at
+    from jsonb_populate_record(null::public.ai_tournament_planning, p_planning)
+    returning * into v_planning;
+
+    insert into public.ai_generated_match (
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at, row_hash
+    )
+    select
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at, row_hash
+    from jsonb_populate_recordset(null::public.ai_generated_match, p_matches);
+
+    insert into public.ai_generated_poule (
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at, row_hash
+    )
+    select
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at, row_hash
+    from jsonb_populate_recordset(null::public.ai_generated_poule, p_poules);
+
+    if p_activate then
+        return public.activate_planning(v_planning.id);
+    end if;
+    return to_jsonb(v_planning);
+end;
+$$;
+
+-- save_planning_revision recopie les empreintes des lignes inchangées
+create or replace function public.save_planning_revision(
+    p_planning jsonb,
+    p_base_planning_id public.ai_tournament_planning.id%type,
+    p_matches jsonb default '[]'::jsonb,
+    p_poules jsonb default '[]'::jsonb,
+    p_replaced_match_ids text[] default '{}',
+    p_replaced_poule_ids text[] default '{}',
+    p_activate boolean default true
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_planning public.ai_tournament_planning;
+begin
+    -- Verrou de bascule du tournoi pris d'abord, comme activate_planning:
+    -- une activation concurrente (qui supprime des versions) attend la fin
+    -- de la copie au lieu de bloquer sur la version de base
+    perform pg_advisory_xact_lock(
+        hashtext('activate_planning:' || (p_planning ->> 'tournament_id'))
+    );
+
+    -- Version de base verrouillée: elle ne peut pas être supprimée pendant la
+    -- copie
+    perform 1
+    from public.ai_tournament_planning
+    where id = p_base_planning_id
+    for share;
+    if not found then
+        raise exception 'planning % introuvable', p_base_planning_id
+            using errcode = 'P0002';
+    end if;
+
+    -- Planning + lignes ajoutées ou modifiées, sans activer la version
+    select * into v_planning
+    from jsonb_populate_record(
+        null::public.ai_tournament_planning,
+        public.save_generated_planning(p_planning, p_matches, p_poules, false)
+    );
+
+    -- Lignes inchangées: copies de la version de base (nouvel id), sauf
+    -- celles remplacées (modifiées) ou supprimées par la régénération
+    insert into public.ai_generated_match (
+        id, planning_id, match_id_ai, equipe_a, equipe_b, terrain,
+        debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at, row_hash
+    )
+    select
+        gen_random_uuid(), v_planning.id, match_id_ai, equipe_a, equipe_b,
+        terrain, debut_horaire, fin_horaire, phase, poule_id, journee, status,
+        resolved_equipe_a_id, resolved_equipe_b_id, created_at, row_hash
+    from public.ai_generated_match
+    where planning_id = p_base_planning_id
+        and match_id_ai <> all (p_replaced_match_ids);
+
+    insert into public.ai_generated_poule (
+        id, planning_id, poule_id, nom_poule, equipes, nb_equipes, nb_matches,
+        created_at, row_hash
+    )
+    select
+        gen_random_uuid(), v_planning.id, poule_id, nom_poule, equipes,
+        nb_equipes, nb_matches, created_at, row_hash
+    from public.ai_generated_poule
+    where planning_id = p_base_planning_id
+        and poule_id <> all (p_replaced_poule_ids);
+
+    if p_activate then
+        return public.activate_planning(v_planning.id);
+    end if;
+    return to_jsonb(v_planning);
+end;
+$$;
@@ -0,0 +1,99 @@
+-- Ordre des versions d'un planning attribué par la base: created_at vient du
+-- client (horloge de chaque worker) et ne suffit pas à dire quelle version
+-- est la plus ancienne. version est une identité (séquence), donc croissante
+-- dans l'ordre des insertions, quel que soit le worker qui sauvegarde.
+alter table public.ai_tournament_planning
+    add column if not exists version bigint;
+
+-- Versions existantes numérotées dans l'ordre de leur created_at
+update public.ai_tournament_planning p
+set version = ordered.version
+from (
+    select id, row_number() over (order by created_at, id) as version
+    from public.ai_tournament_planning
+) ordered
+where p.id = ordered.id and p.version is null;
+
+alter table public.ai_tournament_planning
+    alter column version set not null;
+alter table public.ai_tournament_planning
+    alter column version add generated by default as identity;
+select setval(
+    pg_get_serial_sequence('public.ai_tournament_planning', 'version'),
+    coalesce(max(version), 0) + 1,
+    false
+)
+from public.ai_tournament_planning;
+
+create index if not exists ai_tournament_planning_tournament_version_idx
+    on public.ai_tournament_planning (tournament_id, version);
+
+-- activate_planning: versions remplacées choisies par version, plus par
+-- created_at
+create or replace function public.activate_planning(
+    p_planning_id public.ai_tournament_planning.id%type
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_tournament_id public.ai_tournament_planning.tournament_id%type;
+    v_planning public.ai_tournament_planning;
+    v_deactivated jsonb;
+    v_collected jsonb;
+begin
+    select tournament_id into v_tournament_id
+    from public.ai_tournament_planning
+    where id = p_planning_id;
+    if not found then
+        raise exception 'planning % introuvable', p_planning_id
+            using errcode = 'P0002';
+    end if;
+
+    -- Bascules concurrentes d'un même tournoi exécutées l'une après l'autre
+    perform pg_advisory_xact_lock(hashtext('activate_planning:' || v_tournament_id));
+
+    -- Désactiver avant d'activer: l'index unique est vérifié ligne par ligne
+    with deactivated as (
+        update public.ai_tournament_planning
+        set is_active = false, updated_at = now()
+        where tournament_id = v_tournament_id and is_active and id <> p_planning_id
+        returning id
+    )
+    select coalesce(jsonb_agg(id), '[]'::jsonb) into v_deactivated
+    from deactivated;
+
+    update public.ai_tournament_planning
+    set is_active = true
+    where id = p_planning_id
+    returning * into v_planning;
+
+    -- Versions remplacées avant celle qui vient d'être désactivée: supprimées
+    -- (matchs et poules en cascade). La version désactivée reste lisible
+    -- jusqu'à l'activation suivante; une version plus récente en cours de
+    -- sauvegarde (inactive) est conservée.
+    with collected as (
+        delete from public.ai_tournament_planning p
+        where p.tournament_id = v_tournament_id
+            and not p.is_active
+            and p.version < (
+                select min(d.version)
+                from public.ai_tournament_planning d
+                where d.id::text in (
+                    select jsonb_array_elements_text(v_deactivated)
+                )
+            )
+        returning p.id
+    )
+    select coalesce(jsonb_agg(id), '[]'::jsonb) into v_collected
+    from collected;
+
+    return to_jsonb(v_planning)
+        || jsonb_build_object(
+            'deactivated_ids', v_deactivated,
+            'collected_ids', v_collected
+        );
+end;
+$$;
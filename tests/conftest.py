@@ -75,6 +75,31 @@ def mock_planning_data():
     }
 
 
+@pytest.fixture
+def planning_data():
+    """JSON d'assistant minimal: une poule de deux équipes, un match"""
+    return {
+        "type_tournoi": "poules",
+        "poules": [
+            {
+                "poule_id": "poule_a",
+                "nom_poule": "Poule A",
+                "equipes": ["Équipe 1", "Équipe 2"],
+                "matchs": [
+                    {
+                        "match_id": "poule_a_m1",
+                        "equipe_a": "Équipe 1",
+                        "equipe_b": "Équipe 2",
+                        "terrain": 1,
+                        "debut_horaire": "2024-06-15T09:00:00",
+                        "fin_horaire": "2024-06-15T09:20:00",
+                    }
+                ],
+            }
+        ],
+    }
+
+
 @pytest.fixture
 def mock_supabase_client():
     """Mock du client Supabase"""
@@ -150,7 +175,16 @@ def mock_ai_planning_service(mock_get_supabase):
         mock_instance.getPlanningStatus = Mock()
         mock_instance.regeneratePlanning = Mock()
         mock_instance._buildStaticPrompt = Mock()
-        mock_instance._deletePlanning = Mock()
         mock_instance._getPlanningById = Mock()
-        mock_instance._deletePlanningByTournamentId = Mock()
+        mock_instance.purgeTournamentPlannings = Mock()
         yield mock_instance
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Vide les caches mémoire entre chaque test"""
+    from app.core.cache import clear_all_caches
+
+    clear_all_caches()
+    yield
+    clear_all_caches()
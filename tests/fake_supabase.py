@@ -0,0 +1,402 @@
+"""
+Backend Supabase simulé pour les tests: un PostgREST minimal en mémoire
+derrière un vrai client supabase-py (transport httpx.MockTransport)
+
+Chaque requête HTTP est journalisée (un aller-retour = une entrée), ce qui
+permet de vérifier le nombre d'accès à la base d'un traitement.
+"""
+
+import itertools
+import json
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from supabase import AsyncClient, create_client
+from supabase.lib.client_options import AsyncClientOptions, SyncClientOptions
+
+SUPABASE_URL = "https://test.supabase.co"
+SUPABASE_KEY = "test-service-key"
+
+# Clés étrangères ON DELETE CASCADE: table parente -> [(table enfant, colonne)]
+# (supabase/migrations/20261019110000_cascade_planning_children.sql)
+CASCADES = {
+    "ai_tournament_planning": [
+        ("ai_generated_match", "planning_id"),
+        ("ai_generated_poule", "planning_id"),
+    ]
+}
+
+# Colonnes identité (séquence attribuée par la base): table -> colonne
+# (supabase/migrations/20261019200000_planning_version_order.sql)
+IDENTITIES = {"ai_tournament_planning": "version"}
+
+
+class FakeSupabase:
+    """
+    Tables en mémoire + fonctions Postgres appelées via rpc
+
+    Filtres supportés: eq.<valeur>, select (avec ressources embarquées
+    [alias:]table(colonnes) ou table(count), reliées par la clé de CASCADES
+    ou <table parente>_id), order et limit (aussi <alias>.order et
+    <alias>.limit sur une ressource embarquée), et le décompte
+    Prefer: count=exact (en-tête Content-Range).
+    Les fonctions rpc s'exécutent comme une transaction: en cas d'erreur,
+    aucune des tables n'est modifiée. Les suppressions suivent CASCADES.
+
+    Pannes simulées: failingTables (toute écriture refusée) ou failures
+    (table -> exceptions levées par les prochaines requêtes, une par requête).
+    """
+
+    def __init__(self, tables: Dict[str, List[dict]] = None):
+        self.tables: Dict[str, List[dict]] = {}
+        self._sequences = {table: itertools.count(1) for table in IDENTITIES}
+        for name, rows in (tables or {}).items():
+            self.tables[name] = [self._withIdentity(name, row) for row in rows]
+        self.requests: List[Tuple[str, str]] = []
+        self.failingTables: set = set()
+        self.failures: Dict[str, List[Exception]] = {}
+        self._lock = threading.Lock()
+        self.functions = {
+            "save_generated_planning": self._saveGeneratedPlanning,
+            "purge_tournament_plannings": self._purgeTournamentPlannings,
+            "activate_planning": self._activatePlanning,
+            "save_planning_revision": self._savePlanningRevision,
+        }
+
+    def client(self):
+        """Client supabase-py synchrone branché sur ce backend"""
+        return create_client(
+            SUPABASE_URL,
+            SUPABASE_KEY,
+            options=SyncClientOptions(
+                httpx_client=httpx.Client(transport=httpx.MockTransport(self.handle))
+            ),
+        )
+
+    def async_client(self):
+        """Client supabase-py asynchrone branché sur ce backend"""
+        return AsyncClient(
+            SUPABASE_URL,
+            SUPABASE_KEY,
+            options=AsyncClientOptions(
+                httpx_client=httpx.AsyncClient(
+                    transport=httpx.MockTransport(self.handle)
+                )
+            ),
+        )
+
+    def calls(self, method: str = None) -> List[Tuple[str, str]]:
+        """Requêtes reçues, éventuellement filtrées par méthode HTTP"""
+        return [call for call in self.requests if method in (None, call[0])]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            return self._handle(request)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/rest/v1/", 1)[-1]
+        self.requests.append((request.method, path))
+        single = "vnd.pgrst.object" in request.headers.get("accept", "")
+        prefer = request.headers.get("prefer", "")
+        headers = {}
+
+        try:
+            if self.failures.get(path):
+                raise self.failures[path].pop(0)
+            if path.startswith("rpc/"):
+                data = self._rpc(path[len("rpc/") :], json.loads(request.content))
+            elif request.method == "POST":
+                data = self._insert(
+                    path,
+                    json.loads(request.content),
+                    upsert="merge-duplicates" in prefer,
+                )
+            elif request.method == "GET":
+                data, total = self._select(path, request.url.params)
+                if "count=exact" in prefer:
+                    headers["content-range"] = f"0-{max(len(data) - 1, 0)}/{total}"
+            elif request.method == "PATCH":
+                data = self._update(
+                    path, request.url.params, json.loads(request.content)
+                )
+            elif request.method == "DELETE":
+                data = self._delete(path, request.url.params)
+            else:
+                return httpx.Response(405, json={"message": request.method})
+        except ValueError as e:
+            return httpx.Response(
+                400,
+                json={
+                    "code": "23502",
+                    "message": str(e),
+                    "hint": None,
+                    "details": None,
+                },
+            )
+
+        if "return=minimal" in prefer:
+            return httpx.Response(201)
+
+        if single:
+            if len(data) != 1:
+                return httpx.Response(
+                    406,
+                    json={
+                        "code": "PGRST116",
+                        "message": "not a single row",
+                        "hint": None,
+                        "details": None,
+                    },
+                )
+            data = data[0]
+        return httpx.Response(
+            200 if request.method == "GET" else 201, json=data, headers=headers
+        )
+
+    def _rpc(self, name: str, params: dict) -> Any:
+        snapshot = {table: list(rows) for table, rows in self.tables.items()}
+        try:
+            return self.functions[name](**params)
+        except Exception:
+            self.tables = snapshot
+            raise
+
+    def _insert(self, table: str, rows: Any, upsert: bool = False) -> List[dict]:
+        rows = rows if isinstance(rows, list) else [rows]
+        if not rows:
+            return rows
+        if table in self.failingTables:
+            raise ValueError(f"insertion refusée dans {table}")
+        rows = [self._withIdentity(table, row) for row in rows]
+        existing = self.tables.setdefault(table, [])
+        if upsert:
+            ids = {row.get("id") for row in rows}
+            existing[:] = [row for row in existing if row.get("id") not in ids]
+        existing.extend(rows)
+        return rows
+
+    def _withIdentity(self, table: str, row: dict) -> dict:
+        """Valeur par défaut d'une colonne identité (comme GENERATED BY DEFAULT)"""
+        column = IDENTITIES.get(table)
+        if column is None or row.get(column) is not None:
+            return row
+        return {**row, column: next(self._sequences[table])}
+
+    def _update(
+        self, table: str, params: httpx.QueryParams, values: dict
+    ) -> List[dict]:
+        updated = self._filter(self.tables.get(table, []), params)
+        for row in updated:
+            row.update(values)
+        return [dict(row) for row in updated]
+
+    def _delete(self, table: str, params: httpx.QueryParams) -> List[dict]:
+        deleted = self._filter(self.tables.get(table, []), params)
+        self._remove(table, deleted)
+        return deleted
+
+    def _remove(self, table: str, deleted: List[dict]) -> None:
+        self.tables[table] = [
+            row for row in self.tables.get(table, []) if row not in deleted
+        ]
+        ids = {row.get("id") for row in deleted}
+        for child, column in CASCADES.get(table, []):
+            self._remove(
+                child,
+                [row for row in self.tables.get(child, []) if row.get(column) in ids],
+            )
+
+    def _filter(self, rows: List[dict], params: httpx.QueryParams) -> List[dict]:
+        for column, condition in params.multi_items():
+            if column in ("select", "order", "limit", "offset") or "." in column:
+                continue
+            operator, _, value = condition.partition(".")
+            if operator == "eq":
+                rows = [row for row in rows if _equals(row.get(column), value)]
+        return rows
+
+    def _select(self, table: str, params: httpx.QueryParams) -> Tuple[List[dict], int]:
+        """Lignes projetées et nombre total de lignes filtrées (avant limit)"""
+        rows = self._filter(self.tables.get(table, []), params)
+        total = len(rows)
+        if "order" in params:
+            rows = _sort(rows, params["order"])
+        if "limit" in params:
+            rows = rows[: int(params["limit"])]
+
+        return [
+            self._project(table, row, params.get("select", "*"), params) for row in rows
+        ], total
+
+    def _project(
+        self, table: str, row: dict, columns: str, params: httpx.QueryParams
+    ) -> dict:
+        """Colonnes demandées d'une ligne, ressources embarquées comprises"""
+        if columns == "*":
+            return dict(row)
+        projected = {}
+        for column in _splitColumns(columns):
+            embedded, _, embeddedColumns = column.partition("(")
+            if not embeddedColumns:
+                # Colonne absente de la fixture: valeur par défaut du modèle
+                if column in row:
+                    projected[column] = row[column]
+                continue
+            alias, _, embedded = embedded.rpartition(":")
+            alias = alias or embedded
+            foreignKey = next(
+                (key for child, key in CASCADES.get(table, []) if child == embedded),
+                f"{table}_id",
+            )
+            children = [
+                child
+                for child in self.tables.get(embedded, [])
+                if child.get(foreignKey) == row.get("id")
+            ]
+            if embeddedColumns == "count)":
+                projected[alias] = [{"count": len(children)}]
+                continue
+            order = params.get(f"{alias}.order")
+            if order:
+                children = _sort(children, order)
+            if f"{alias}.limit" in params:
+                children = children[: int(params[f"{alias}.limit"])]
+            projected[alias] = [
+                self._project(embedded, child, embeddedColumns[:-1], params)
+                for child in children
+            ]
+        return projected
+
+    def _saveGeneratedPlanning(
+        self,
+        p_planning: dict,
+        p_matches: list = (),
+        p_poules: list = (),
+        p_activate: bool = True,
+    ) -> dict:
+        """Équivalent en mémoire de la fonction Postgres save_generated_planning"""
+        self._insert("ai_tournament_planning", {**p_planning, "is_active": False})
+        self._insert("ai_generated_match", list(p_matches))
+        self._insert("ai_generated_poule", list(p_poules))
+        if p_activate:
+            return self._activatePlanning(p_planning["id"])
+        return self._row("ai_tournament_planning", p_planning["id"])
+
+    def _savePlanningRevision(
+        self,
+        p_planning: dict,
+        p_base_planning_id: str,
+        p_matches: list = (),
+        p_poules: list = (),
+        p_replaced_match_ids: list = (),
+        p_replaced_poule_ids: list = (),
+        p_activate: bool = True,
+    ) -> dict:
+        """Équivalent en mémoire de la fonction Postgres save_planning_revision"""
+        if self._row("ai_tournament_planning", p_base_planning_id) is None:
+            raise ValueError(f"planning {p_base_planning_id} introuvable")
+        self._saveGeneratedPlanning(p_planning, p_matches, p_poules, p_activate=False)
+
+        for table, key, replaced in (
+            ("ai_generated_match", "match_id_ai", p_replaced_match_ids),
+            ("ai_generated_poule", "poule_id", p_replaced_poule_ids),
+        ):
+            self._insert(
+                table,
+                [
+                    {**row, "id": str(uuid.uuid4()), "planning_id": p_planning["id"]}
+                    for row in self.tables.get(table, [])
+                    if row.get("planning_id") == p_base_planning_id
+                    and row[key] not in replaced
+                ],
+            )
+
+        if p_activate:
+            return self._activatePlanning(p_planning["id"])
+        return self._row("ai_tournament_planning", p_planning["id"])
+
+    def _activatePlanning(self, p_planning_id: str) -> dict:
+        """Équivalent en mémoire de la fonction Postgres activate_planning"""
+        planning = self._row("ai_tournament_planning", p_planning_id)
+        if planning is None:
+            raise ValueError(f"planning {p_planning_id} introuvable")
+        deactivated = []
+        for row in self.tables["ai_tournament_planning"]:
+            if (
+                row is not planning
+                and row.get("tournament_id") == planning["tournament_id"]
+                and row.get("is_active")
+            ):
+                row["is_active"] = False
+                row["updated_at"] = datetime.now().isoformat()
+                deactivated.append(row["id"])
+        planning["is_active"] = True
+
+        # Versions remplacées avant celles qui viennent d'être désactivées
+        collected = []
+        if deactivated:
+            oldest = min(
+                self._row("ai_tournament_planning", planningId)["version"]
+                for planningId in deactivated
+            )
+            collected = [
+                row
+                for row in self.tables["ai_tournament_planning"]
+                if row.get("tournament_id") == planning["tournament_id"]
+                and not row.get("is_active")
+                and row["version"] < oldest
+            ]
+            self._remove("ai_tournament_planning", collected)
+        return {
+            **planning,
+            "deactivated_ids": deactivated,
+            "collected_ids": [row["id"] for row in collected],
+        }
+
+    def _row(self, table: str, rowId: str):
+        return next(
+            (row for row in self.tables.get(table, []) if row.get("id") == rowId), None
+        )
+
+    def _purgeTournamentPlannings(self, p_tournament_id: str) -> List[str]:
+        """Équivalent en mémoire de la fonction Postgres purge_tournament_plannings"""
+        deleted = [
+            row
+            for row in self.tables.get("ai_tournament_planning", [])
+            if row.get("tournament_id") == p_tournament_id
+        ]
+        self._remove("ai_tournament_planning", deleted)
+        return [row["id"] for row in deleted]
+
+
+def _equals(value: Any, text: str) -> bool:
+    """Filtre eq.<texte> (booléens comme Postgres: true, True, t, ...)"""
+    if isinstance(value, bool):
+        return text.lower() in (("true", "t", "1") if value else ("false", "f", "0"))
+    return str(value) == text
+
+
+def _sort(rows: List[dict], order: str) -> List[dict]:
+    """Tri <colonne>.<asc|desc>[.nullsfirst|.nullslast] (nulls en dernier par défaut)"""
+    key, _, direction = order.partition(".")
+    present = [row for row in rows if row.get(key) is not None]
+    nulls = [row for row in rows if row.get(key) is None]
+    present.sort(key=lambda row: row[key], reverse="desc" in direction)
+    return nulls + present if "nullsfirst" in direction else present + nulls
+
+
+def _splitColumns(columns: str) -> List[str]:
+    """Découpe un select PostgREST sur les virgules hors parenthèses"""
+    parts, depth, current = [], 0, ""
+    for char in columns:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current += char
+    parts.append(current)
+    return parts
@@ -0,0 +1,81 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.core.config import settings
+from main import app
+
+PURGE_URL = "/api/admin/tournament/tournament-1/plannings"
+METRICS_URL = "/api/metrics"
+
+
+class TestAdminRoutes:
+    """Tests des routes d'administration"""
+
+    @pytest.fixture
+    def client(self):
+        """Client de test FastAPI"""
+        return TestClient(app, base_url="http://localhost")
+
+    @pytest.fixture
+    def admin_key(self):
+        with patch.object(settings, "ADMIN_API_KEY", "admin-secret"):
+            yield "admin-secret"
+
+    @pytest.fixture
+    def mock_ai_planning_service(self):
+        with patch("app.api.routes.admin.aiPlanningService") as mock_service:
+            yield mock_service
+
+    def test_purge_tournament_plannings(
+        self, client, admin_key, mock_ai_planning_service
+    ):
+        """Test de la purge des plannings d'un tournoi"""
+        mock_ai_planning_service.purgeTournamentPlannings.return_value = [
+            "planning-1",
+            "planning-2",
+        ]
+
+        response = client.delete(PURGE_URL, headers={"X-API-Key": admin_key})
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {
+            "tournament_id": "tournament-1",
+            "deleted_planning_ids": ["planning-1", "planning-2"],
+        }
+        mock_ai_planning_service.purgeTournamentPlannings.assert_called_once_with(
+            "tournament-1"
+        )
+
+    def test_purge_error(self, client, admin_key, mock_ai_planning_service):
+        """Test d'une erreur de la base pendant la purge"""
+        mock_ai_planning_service.purgeTournamentPlannings.return_value = None
+
+        response = client.delete(PURGE_URL, headers={"X-API-Key": admin_key})
+
+        assert response.status_code == 500
+
+    def test_invalid_key_rejected(self, client, admin_key, mock_ai_planning_service):
+        """Test qu'une clé absente ou invalide est refusée"""
+        assert client.delete(PURGE_URL).status_code == 401
+        response = client.delete(PURGE_URL, headers={"X-API-Key": "wrong"})
+
+        assert response.status_code == 401
+        mock_ai_planning_service.purgeTournamentPlannings.assert_not_called()
+
+    def test_disabled_without_configured_key(self, client, mock_ai_planning_service):
+        """Test que les routes sont désactivées sans ADMIN_API_KEY"""
+        with patch.object(settings, "ADMIN_API_KEY", None):
+            response = client.delete(PURGE_URL, headers={"X-API-Key": "anything"})
+
+        assert response.status_code == 403
+        mock_ai_planning_service.purgeTournamentPlannings.assert_not_called()
+
+    def test_metrics_require_admin_key(self, client, admin_key):
+        """Test que les métriques internes ne sont servies qu'avec la clé"""
+        assert client.get(METRICS_URL).status_code == 401
+
+        response = client.get(METRICS_URL, headers={"X-API-Key": admin_key})
+
+        assert response.status_code == 200
+        assert set(response.json()["data"]) == {"supabase", "counters"}
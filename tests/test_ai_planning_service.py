@@ -1,11 +1,23 @@
+import asyncio
+import threading
 import uuid
 from datetime import date, datetime, time
 
 import pytest
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+from app.core.config import settings
+from app.core.events import planningEventBroker
+from app.core.unit_of_work import unit_of_work_scope
 from app.models.models import AITournamentPlanning, Team, Tournament
 from app.services.ai_planning_service import AIPlanningService
+from app.services.database_service import (
+    DatabaseService,
+    planningCache,
+    planningStatusCache,
+)
+from app.services.tournament_service import TournamentService
+from tests.fake_supabase import FakeSupabase
 
 
 class TestAIPlanningService:
@@ -33,10 +45,13 @@ class TestAIPlanningService:
         tournament.status = "ready"
 
         team1 = Mock(spec=Team)
+        team1.id = "team-1"
         team1.name = "Équipe 1"
         team2 = Mock(spec=Team)
+        team2.id = "team-2"
         team2.name = "Équipe 2"
         team3 = Mock(spec=Team)
+        team3.id = "team-3"
         team3.name = "Équipe 3"
 
         return {
@@ -105,7 +120,7 @@ class TestAIPlanningService:
         # Mock des services
         with patch.object(
             service.tournamentService,
-            "getTournamentWithTeams",
+            "getTournamentWithTeamIndex",
             return_value=mock_tournament_data,
         ):
             with patch.object(
@@ -118,30 +133,32 @@ class TestAIPlanningService:
                 ):
                     with patch.object(
                         service.databaseService,
-                        "savePlanning",
+                        "savePlanningWithDetails",
                         return_value=mock_planning_response,
-                    ):
-                        with patch.object(
-                            service.databaseService,
-                            "saveMatches",
-                            return_value=[Mock()],
-                        ):
-                            with patch.object(
-                                service.databaseService, "savePoules", return_value=[]
-                            ):
-                                result = service.generatePlanning(
-                                    "550e8400-e29b-41d4-a716-446655440000"
-                                )
-
-                                assert result is not None
-                                assert result == mock_planning_response
+                    ) as mock_save:
+                        result = service.generatePlanning(
+                            "550e8400-e29b-41d4-a716-446655440000"
+                        )
+
+                        assert result is not None
+                        mock_save.assert_called_once_with(
+                            "550e8400-e29b-41d4-a716-446655440000",
+                            mock_ai_response,
+                            "round_robin",
+                            {
+                                "Équipe 1": "team-1",
+                                "Équipe 2": "team-2",
+                                "Équipe 3": "team-3",
+                            },
+                        )
+                        assert result == mock_planning_response
 
     def test_generate_planning_no_tournament_data(self, service, mock_get_supabase):
         """Test de génération de planning sans données de tournoi"""
         mock_get_supabase_func, mock_client = mock_get_supabase
 
         with patch.object(
-            service.tournamentService, "getTournamentWithTeams", return_value=None
+            service.tournamentService, "getTournamentWithTeamIndex", return_value=None
         ):
             result = service.generatePlanning("550e8400-e29b-41d4-a716-446655440000")
 
@@ -155,7 +172,7 @@ class TestAIPlanningService:
 
         with patch.object(
             service.tournamentService,
-            "getTournamentWithTeams",
+            "getTournamentWithTeamIndex",
             return_value=mock_tournament_data,
         ):
             with patch.object(
@@ -175,7 +192,7 @@ class TestAIPlanningService:
 
         with patch.object(
             service.tournamentService,
-            "getTournamentWithTeams",
+            "getTournamentWithTeamIndex",
             return_value=mock_tournament_data,
         ):
             with patch.object(
@@ -198,7 +215,7 @@ class TestAIPlanningService:
 
         with patch.object(
             service.tournamentService,
-            "getTournamentWithTeams",
+            "getTournamentWithTeamIndex",
             return_value=mock_tournament_data,
         ):
             with patch.object(
@@ -210,7 +227,9 @@ class TestAIPlanningService:
                     return_value=mock_ai_response,
                 ):
                     with patch.object(
-                        service.databaseService, "savePlanning", return_value=None
+                        service.databaseService,
+                        "savePlanningWithDetails",
+                        return_value=None,
                     ):
                         result = service.generatePlanning(
                             "550e8400-e29b-41d4-a716-446655440000"
@@ -218,20 +237,13 @@ class TestAIPlanningService:
 
                         assert result is None
 
-    def test_generate_planning_save_matches_failure(
-        self,
-        service,
-        mock_get_supabase,
-        mock_tournament_data,
-        mock_ai_response,
-        mock_planning_response,
+    def test_generate_planning_save_failure_no_compensation(
+        self, service, mock_get_supabase, mock_tournament_data, mock_ai_response
     ):
-        """Test de génération de planning avec échec de sauvegarde des matchs"""
-        mock_get_supabase_func, mock_client = mock_get_supabase
-
+        """Test qu'un échec de la sauvegarde transactionnelle ne déclenche aucune suppression"""
         with patch.object(
             service.tournamentService,
-            "getTournamentWithTeams",
+            "getTournamentWithTeamIndex",
             return_value=mock_tournament_data,
         ):
             with patch.object(
@@ -244,66 +256,14 @@ class TestAIPlanningService:
                 ):
                     with patch.object(
                         service.databaseService,
-                        "savePlanning",
-                        return_value=mock_planning_response,
+                        "savePlanningWithDetails",
+                        return_value=None,
                     ):
-                        with patch.object(
-                            service.databaseService, "saveMatches", return_value=None
-                        ):
-                            with patch.object(
-                                service, "_deletePlanning", return_value=True
-                            ):
-                                result = service.generatePlanning(
-                                    "550e8400-e29b-41d4-a716-446655440000"
-                                )
-
-                                assert result is None
-
-    def test_generate_planning_save_poules_failure(
-        self,
-        service,
-        mock_get_supabase,
-        mock_tournament_data,
-        mock_ai_response,
-        mock_planning_response,
-    ):
-        """Test de génération de planning avec échec de sauvegarde des poules"""
-        mock_get_supabase_func, mock_client = mock_get_supabase
+                        result = service.generatePlanning(
+                            "550e8400-e29b-41d4-a716-446655440000"
+                        )
 
-        with patch.object(
-            service.tournamentService,
-            "getTournamentWithTeams",
-            return_value=mock_tournament_data,
-        ):
-            with patch.object(
-                service.tournamentService, "_validateTournamentData", return_value=True
-            ):
-                with patch.object(
-                    service.openAIService,
-                    "generate_planning",
-                    return_value=mock_ai_response,
-                ):
-                    with patch.object(
-                        service.databaseService,
-                        "savePlanning",
-                        return_value=mock_planning_response,
-                    ):
-                        with patch.object(
-                            service.databaseService,
-                            "saveMatches",
-                            return_value=[Mock()],
-                        ):
-                            with patch.object(
-                                service.databaseService, "savePoules", return_value=None
-                            ):
-                                with patch.object(
-                                    service, "_deletePlanning", return_value=True
-                                ):
-                                    result = service.generatePlanning(
-                                        "550e8400-e29b-41d4-a716-446655440000"
-                                    )
-
-                                    assert result is None
+                        assert result is None
 
     def test_generate_planning_exception(self, service, mock_get_supabase):
         """Test de génération de planning avec exception"""
@@ -311,7 +271,7 @@ class TestAIPlanningService:
 
         with patch.object(
             service.tournamentService,
-            "getTournamentWithTeams",
+            "getTournamentWithTeamIndex",
             side_effect=Exception("Test error"),
         ):
             result = service.generatePlanning("550e8400-e29b-41d4-a716-446655440000")
@@ -374,6 +334,34 @@ class TestAIPlanningService:
 
         assert result is None
 
+    def test_get_planning_status_from_cached_planning(self, service, mock_get_supabase):
+        """Test que le statut d'un planning déjà en cache ne relit pas la base"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+        planningCache.set(
+            ("planning", "planning-1"),
+            AITournamentPlanning(
+                id="planning-1",
+                tournament_id="tournament-1",
+                type_tournoi="round_robin",
+                status="published",
+            ),
+        )
+
+        assert service.getPlanningStatus("planning-1") == "published"
+        mock_client.table.assert_not_called()
+
+    def test_get_planning_status_not_found_is_cached(self, service, mock_get_supabase):
+        """Test que l'absence d'un planning est mise en cache (cache négatif)"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+        mock_execute = (
+            mock_client.table.return_value.select.return_value.eq.return_value.execute
+        )
+        mock_execute.return_value = Mock(data=[])
+
+        assert service.getPlanningStatus("planning-404") is None
+        assert service.getPlanningStatus("planning-404") is None
+        mock_execute.assert_called_once()
+
     def test_regenerate_planning_success(
         self,
         service,
@@ -390,16 +378,19 @@ class TestAIPlanningService:
         old_planning.tournament_id = "550e8400-e29b-41d4-a716-446655440000"
 
         with patch.object(service, "_getPlanningById", return_value=old_planning):
-            with patch.object(service, "_deletePlanning", return_value=True):
-                with patch.object(
-                    service, "generatePlanning", return_value=mock_planning_response
-                ):
-                    result = service.regeneratePlanning(
-                        "550e8400-e29b-41d4-a716-446655440001"
-                    )
+            with patch.object(
+                service, "generatePlanning", return_value=mock_planning_response
+            ) as mock_generate:
+                result = service.regeneratePlanning(
+                    "550e8400-e29b-41d4-a716-446655440001"
+                )
 
-                    assert result is not None
-                    assert result == mock_planning_response
+                assert result is not None
+                assert result == mock_planning_response
+                mock_generate.assert_called_once_with(
+                    "550e8400-e29b-41d4-a716-446655440000",
+                    basePlanningId="550e8400-e29b-41d4-a716-446655440001",
+                )
 
     def test_regenerate_planning_no_old_planning(self, service, mock_get_supabase):
         """Test de régénération de planning sans ancien planning"""
@@ -436,38 +427,6 @@ class TestAIPlanningService:
         assert "15" in result  # match_duration_minutes
         assert "5" in result  # break_duration_minutes
 
-    def test_delete_planning_success(self, service, mock_get_supabase):
-        """Test de suppression de planning"""
-        mock_get_supabase_func, mock_client = mock_get_supabase
-
-        # Mock des suppressions
-        mock_table = Mock()
-        mock_delete_matches = Mock()
-        mock_delete_poules = Mock()
-        mock_delete_planning = Mock()
-
-        mock_client.table.return_value = mock_table
-        mock_table.delete.return_value = mock_delete_matches
-        mock_delete_matches.eq.return_value = mock_delete_matches
-        mock_delete_matches.execute.return_value = Mock()
-
-        result = service._deletePlanning("550e8400-e29b-41d4-a716-446655440001")
-
-        assert result is True
-
-    def test_delete_planning_exception(self, service, mock_get_supabase):
-        """Test de suppression de planning avec exception"""
-        mock_get_supabase_func, mock_client = mock_get_supabase
-
-        # Mock d'exception
-        mock_table = Mock()
-        mock_client.table.return_value = mock_table
-        mock_table.delete.side_effect = Exception("Database error")
-
-        result = service._deletePlanning("550e8400-e29b-41d4-a716-446655440001")
-
-        assert result is False
-
     def test_get_planning_by_id_success(
         self, service, mock_get_supabase, mock_planning_response
     ):
@@ -540,31 +499,635 @@ class TestAIPlanningService:
 
         assert result is None
 
-    def test_delete_planning_by_tournament_id_success(self, service, mock_get_supabase):
-        """Test de suppression de planning par ID de tournoi"""
+    def test_purge_tournament_plannings_success(self, service, mock_get_supabase):
+        """Test de suppression de tous les plannings d'un tournoi en un appel rpc"""
         mock_get_supabase_func, mock_client = mock_get_supabase
+        mock_client.rpc.return_value.execute.return_value = Mock(
+            data=["planning-1", "planning-2"]
+        )
 
-        # Mock des transactions
-        mock_transaction = Mock()
-        mock_client.transaction.return_value = mock_transaction
-
-        result = service._deletePlanningByTournamentId(
+        result = service.purgeTournamentPlannings(
             "550e8400-e29b-41d4-a716-446655440000"
         )
 
-        assert result is True
+        assert result == ["planning-1", "planning-2"]
+        mock_client.rpc.assert_called_once_with(
+            "purge_tournament_plannings",
+            {"p_tournament_id": "550e8400-e29b-41d4-a716-446655440000"},
+        )
+        mock_client.table.assert_not_called()
 
-    def test_delete_planning_by_tournament_id_exception(
-        self, service, mock_get_supabase
-    ):
-        """Test de suppression de planning par tournoi avec exception"""
+    def test_purge_tournament_plannings_exception(self, service, mock_get_supabase):
+        """Test de suppression des plannings d'un tournoi avec exception"""
         mock_get_supabase_func, mock_client = mock_get_supabase
 
         # Mock d'exception
-        mock_client.transaction.side_effect = Exception("Database error")
+        mock_client.rpc.side_effect = Exception("Database error")
 
-        result = service._deletePlanningByTournamentId(
+        result = service.purgeTournamentPlannings(
             "550e8400-e29b-41d4-a716-446655440000"
         )
 
-        assert result is False
+        assert result is None
+
+    def test_get_planning_status_uses_cache(self, service, mock_get_supabase):
+        """Test que le statut est servi depuis le cache au second appel"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.execute.return_value = Mock(data=[{"status": "generated"}])
+
+        first = service.getPlanningStatus("550e8400-e29b-41d4-a716-446655440001")
+        second = service.getPlanningStatus("550e8400-e29b-41d4-a716-446655440001")
+
+        assert first == second == "generated"
+        mock_query.execute.assert_called_once()
+
+    def test_get_planning_statuses_single_query(self, service, mock_get_supabase):
+        """Test de la lecture groupée des statuts en une seule requête in.(...)"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+        cached_id = "550e8400-e29b-41d4-a716-446655440001"
+        found_id = "550e8400-e29b-41d4-a716-446655440002"
+        unknown_id = "550e8400-e29b-41d4-a716-446655440003"
+
+        planningStatusCache.set(cached_id, "published")
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        mock_query.in_.return_value = mock_query
+        mock_query.execute.return_value = Mock(
+            data=[{"id": found_id, "status": "generated"}]
+        )
+
+        result = service.getPlanningStatuses(
+            [cached_id, found_id, unknown_id, "not-a-uuid"]
+        )
+
+        assert result == {
+            cached_id: "published",
+            found_id: "generated",
+            unknown_id: None,
+            "not-a-uuid": None,
+        }
+        mock_query.in_.assert_called_once_with("id", [found_id, unknown_id])
+        mock_query.execute.assert_called_once()
+
+    def test_get_planning_statuses_exception(self, service, mock_get_supabase):
+        """Test de la lecture groupée des statuts avec exception"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        mock_client.table.side_effect = Exception("Database error")
+
+        result = service.getPlanningStatuses(["550e8400-e29b-41d4-a716-446655440001"])
+
+        assert result is None
+
+    def test_generate_plannings_bounded_concurrency(self, service, mock_get_supabase):
+        """Test de la génération groupée avec une concurrence bornée"""
+        lock = threading.Lock()
+        running = {"current": 0, "max": 0}
+
+        def fake_generate(tournamentId):
+            with lock:
+                running["current"] += 1
+                running["max"] = max(running["max"], running["current"])
+            threading.Event().wait(0.02)
+            with lock:
+                running["current"] -= 1
+            return None if tournamentId == "t-3" else Mock(id=f"p-{tournamentId}")
+
+        async def collect():
+            return [
+                result
+                async for result in service.generatePlannings(
+                    [f"t-{index}" for index in range(6)], concurrency=2
+                )
+            ]
+
+        with patch.object(service, "generatePlanning", side_effect=fake_generate):
+            results = asyncio.run(collect())
+
+        assert running["max"] == 2
+        assert sorted(tid for tid, _ in results) == [f"t-{i}" for i in range(6)]
+        assert dict(results)["t-3"] is None
+
+    def test_wait_for_status_change_returns_current_status(self, service):
+        """Test que l'attente se termine immédiatement si le statut a déjà changé"""
+        with patch.object(service, "getPlanningStatus", return_value="validated"):
+            status = asyncio.run(
+                service.waitForStatusChange("planning-1", "generated", timeout=5)
+            )
+
+        assert status == "validated"
+        assert planningEventBroker.subscriber_count("planning-1") == 0
+
+    def test_wait_for_status_change_woken_by_notification(self, service):
+        """Test que l'attente est réveillée par une notification, sans relecture DB"""
+
+        async def wait_and_publish():
+            waiter = asyncio.create_task(
+                service.waitForStatusChange("planning-1", "generated", timeout=5)
+            )
+            while planningEventBroker.subscriber_count("planning-1") == 0:
+                await asyncio.sleep(0)
+            # Notification émise depuis un autre thread (génération en arrière-plan)
+            await asyncio.to_thread(
+                planningEventBroker.publish, "planning-1", "validated"
+            )
+            return await waiter
+
+        with patch.object(
+            service, "getPlanningStatus", return_value="generated"
+        ) as mock_status:
+            status = asyncio.run(wait_and_publish())
+
+        assert status == "validated"
+        mock_status.assert_called_once_with("planning-1")
+
+    def test_wait_for_status_change_rechecks_stored_status(self, service):
+        """Test qu'un changement sans notification locale (autre worker) est relu"""
+        with (
+            patch.object(settings, "STATUS_WAIT_RECHECK_INTERVAL", 0.01),
+            patch.object(service, "getPlanningStatus", return_value="generated"),
+            patch.object(
+                service,
+                "_readPlanningStatus",
+                side_effect=[Exception("timeout"), "generated", "validated"],
+            ) as mock_read,
+        ):
+            status = asyncio.run(
+                service.waitForStatusChange("planning-1", "generated", timeout=5)
+            )
+
+        assert status == "validated"
+        assert mock_read.call_count == 3
+        assert planningEventBroker.subscriber_count("planning-1") == 0
+
+    def test_wait_for_status_change_timeout(self, service):
+        """Test que le statut connu est renvoyé à l'expiration du timeout"""
+        with patch.object(service, "getPlanningStatus", return_value="generated"):
+            status = asyncio.run(
+                service.waitForStatusChange("planning-1", "generated", timeout=0.01)
+            )
+
+        assert status == "generated"
+        assert planningEventBroker.subscriber_count("planning-1") == 0
+
+    def test_generate_planning_async(
+        self, service, mock_tournament_data, mock_ai_response, mock_planning_response
+    ):
+        """Test du pipeline de génération asynchrone"""
+        service.asyncTournamentService = Mock()
+        service.asyncTournamentService.getTournamentWithTeamIndex = AsyncMock(
+            return_value=mock_tournament_data
+        )
+        service.asyncDatabaseService = Mock()
+        service.asyncDatabaseService.savePlanningWithDetails = AsyncMock(
+            return_value=mock_planning_response
+        )
+
+        with (
+            patch.object(
+                service.tournamentService, "_validateTournamentData", return_value=True
+            ),
+            patch.object(
+                service.openAIService,
+                "generate_planning",
+                return_value=mock_ai_response,
+            ),
+        ):
+            planning = asyncio.run(service.generatePlanningAsync("tournament-1"))
+
+        assert planning is mock_planning_response
+        service.asyncDatabaseService.savePlanningWithDetails.assert_awaited_once_with(
+            "tournament-1",
+            mock_ai_response,
+            "round_robin",
+            {"Équipe 1": "team-1", "Équipe 2": "team-2", "Équipe 3": "team-3"},
+        )
+
+    def test_generate_planning_async_save_failure(
+        self, service, mock_tournament_data, mock_ai_response
+    ):
+        """Test qu'un échec de la sauvegarde transactionnelle renvoie None"""
+        service.asyncTournamentService = Mock()
+        service.asyncTournamentService.getTournamentWithTeamIndex = AsyncMock(
+            return_value=mock_tournament_data
+        )
+        service.asyncDatabaseService = Mock()
+        service.asyncDatabaseService.savePlanningWithDetails = AsyncMock(
+            return_value=None
+        )
+
+        with (
+            patch.object(
+                service.tournamentService, "_validateTournamentData", return_value=True
+            ),
+            patch.object(
+                service.openAIService,
+                "generate_planning",
+                return_value=mock_ai_response,
+            ),
+        ):
+            planning = asyncio.run(service.generatePlanningAsync("tournament-1"))
+
+        assert planning is None
+
+    def test_regenerate_planning_async_saves_revision(
+        self, service, mock_tournament_data, mock_ai_response, mock_planning_response
+    ):
+        """Test que la régénération asynchrone écrit en différentiel"""
+        service.asyncTournamentService = Mock()
+        service.asyncTournamentService.getTournamentWithTeamIndex = AsyncMock(
+            return_value=mock_tournament_data
+        )
+        service.asyncDatabaseService = Mock()
+        service.asyncDatabaseService.getPlanningWithDetailsByPlanningId = AsyncMock(
+            return_value={"id": "planning-0", "tournament_id": "tournament-1"}
+        )
+        service.asyncDatabaseService.savePlanningRevision = AsyncMock(
+            return_value=mock_planning_response
+        )
+
+        with (
+            patch.object(
+                service.tournamentService, "_validateTournamentData", return_value=True
+            ),
+            patch.object(
+                service.openAIService,
+                "generate_planning",
+                return_value=mock_ai_response,
+            ),
+        ):
+            planning = asyncio.run(service.regeneratePlanningAsync("planning-0"))
+
+        assert planning is mock_planning_response
+        service.asyncDatabaseService.savePlanningRevision.assert_awaited_once_with(
+            "planning-0",
+            "tournament-1",
+            mock_ai_response,
+            "round_robin",
+            {"Équipe 1": "team-1", "Équipe 2": "team-2", "Équipe 3": "team-3"},
+        )
+        service.asyncDatabaseService.savePlanningWithDetails.assert_not_called()
+
+    def test_regenerate_planning_async_unknown_planning(self, service):
+        """Test qu'un planning introuvable renvoie None sans génération"""
+        service.asyncDatabaseService = Mock()
+        service.asyncDatabaseService.getPlanningWithDetailsByPlanningId = AsyncMock(
+            return_value=None
+        )
+
+        with patch.object(service, "generatePlanningAsync") as mock_generate:
+            planning = asyncio.run(service.regeneratePlanningAsync("missing"))
+
+        assert planning is None
+        mock_generate.assert_not_called()
+
+
+class TestGeneratePlanningQueryCount:
+    """Garde-fou: nombre d'accès Supabase d'une génération (backend simulé)"""
+
+    NOW = "2024-06-01T00:00:00"
+
+    @pytest.fixture
+    def backend(self):
+        tournament = {
+            "id": "tournament-1",
+            "name": "Tournoi Test",
+            "description": None,
+            "tournament_type": "round_robin",
+            "max_teams": 8,
+            "courts_available": 2,
+            "start_date": "2024-06-15",
+            "start_time": "09:00:00",
+            "match_duration_minutes": 15,
+            "break_duration_minutes": 5,
+            "constraints": {},
+            "organizer_id": "organizer-1",
+            "status": "ready",
+            "created_at": self.NOW,
+            "updated_at": self.NOW,
+        }
+        teams = [
+            {
+                "id": f"team-{index}",
+                "name": f"Équipe {index}",
+                "description": "",
+                "tournament_id": "tournament-1",
+                "captain_id": None,
+                "status": "registered",
+                "contact_email": "contact@example.com",
+                "contact_phone": "0600000000",
+                "skill_level": "intermediate",
+                "notes": "",
+                "created_at": self.NOW,
+                "updated_at": self.NOW,
+            }
+            for index in (1, 2)
+        ]
+        return FakeSupabase({"tournament": [tournament], "team": teams})
+
+    @pytest.fixture
+    def service(self, backend):
+        client = backend.client()
+        with (
+            patch("app.services.ai_planning_service.getSupabase", return_value=client),
+            patch("app.services.database_service.getSupabase", return_value=client),
+        ):
+            service = AIPlanningService()
+            service.databaseService = DatabaseService()
+        service.tournamentService = TournamentService(supabase_client=client)
+        return service
+
+    @pytest.fixture
+    def ai_response(self):
+        return {
+            "type_tournoi": "round_robin",
+            "matchs_round_robin": [
+                {
+                    "match_id": "rr_1",
+                    "equipe_a": "Équipe 1",
+                    "equipe_b": "Équipe 2",
+                    "terrain": 1,
+                    "debut_horaire": "2024-06-15T09:00:00",
+                    "fin_horaire": "2024-06-15T09:15:00",
+                    "journee": 1,
+                }
+            ],
+            "poules": [],
+        }
+
+    def test_generate_planning_reads_each_row_once(self, service, backend, ai_response):
+        """Test qu'une génération lit le tournoi puis, une fois, l'index des équipes"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            planning = service.generatePlanning("tournament-1")
+
+        assert planning is not None
+        assert backend.calls() == [
+            ("GET", "tournament"),
+            ("GET", "team"),
+            ("POST", "rpc/save_generated_planning"),
+        ]
+        [match] = backend.tables["ai_generated_match"]
+        assert match["resolved_equipe_b_id"] == "team-2"
+
+    def test_step_by_step_save_reuses_loaded_rows(self, service, backend, ai_response):
+        """Test que saveMatches réutilise le planning et les équipes déjà connus"""
+
+        @unit_of_work_scope
+        def generate():
+            service.tournamentService.getTournamentWithTeams("tournament-1")
+            planning = service.databaseService.savePlanning(
+                "tournament-1", ai_response, "round_robin"
+            )
+            service.databaseService.saveMatches(planning.id, ai_response)
+
+        generate()
+
+        assert backend.calls() == [
+            ("GET", "tournament"),
+            ("POST", "ai_tournament_planning"),
+            ("POST", "ai_generated_match"),
+        ]
+
+    def test_each_generation_has_its_own_unit_of_work(
+        self, service, backend, ai_response
+    ):
+        """Test que chaque génération relit le tournoi, mais pas des équipes inchangées"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            service.generatePlanning("tournament-1")
+            service.generatePlanning("tournament-1")
+
+        assert backend.calls("GET") == [
+            ("GET", "tournament"),
+            ("GET", "team"),
+            ("GET", "tournament"),
+        ]
+
+    def test_team_index_reloaded_when_teams_change(self, service, backend, ai_response):
+        """Test qu'une équipe ajoutée ou renommée invalide l'index par son empreinte"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            service.generatePlanning("tournament-1")
+            backend.tables["team"][1].update(
+                name="Équipe Deux", updated_at="2024-06-02T00:00:00"
+            )
+            backend.requests.clear()
+            service.generatePlanning("tournament-1")
+
+        assert backend.calls("GET") == [("GET", "tournament"), ("GET", "team")]
+        # Le nom de l'IA ne correspond plus à aucune équipe
+        assert backend.tables["ai_generated_match"][-1]["resolved_equipe_b_id"] is None
+
+    def test_invalidate_team_index(self, service, backend, ai_response):
+        """Test du hook d'invalidation explicite"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            service.generatePlanning("tournament-1")
+            service.tournamentService.invalidateTeamIndex("tournament-1")
+            backend.requests.clear()
+            service.generatePlanning("tournament-1")
+
+        assert backend.calls("GET") == [("GET", "tournament"), ("GET", "team")]
+
+    def test_regenerate_swaps_versions_without_gap(self, service, backend, ai_response):
+        """Test que l'ancienne version reste servie jusqu'à la bascule atomique"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            old = service.generatePlanning("tournament-1")
+            backend.requests.clear()
+            new = service.regeneratePlanning(old.id)
+
+        assert new.id != old.id and new.is_active
+        # Aucune suppression avant la génération: bascule dans la sauvegarde
+        assert backend.calls() == [
+            ("GET", "ai_tournament_planning"),
+            ("GET", "tournament"),
+            ("GET", "ai_tournament_planning"),
+            ("POST", "rpc/save_planning_revision"),
+        ]
+        assert {
+            row["id"]: row["is_active"]
+            for row in backend.tables["ai_tournament_planning"]
+        } == {old.id: False, new.id: True}
+        assert (
+            service.databaseService.getPlanningWithDetailsByTournamentId(
+                "tournament-1"
+            ).id
+            == new.id
+        )
+
+    def test_reading_replaced_version_keeps_tournament_on_new_version(
+        self, service, backend, ai_response
+    ):
+        """Test que relire l'ancienne version ne ramène pas le tournoi sur elle"""
+        database = service.databaseService
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            old = service.generatePlanning("tournament-1")
+            new = service.regeneratePlanning(old.id)
+
+        replaced = database.getPlanningWithDetailsByPlanningId(old.id)
+
+        assert replaced.id == old.id and not replaced.is_active
+        assert replaced.updated_at != old.updated_at  # nouvel ETag
+        assert database.getPlanningVersionByTournamentId("tournament-1")["id"] == (
+            new.id
+        )
+        assert database.getPlanningWithDetailsByTournamentId("tournament-1").id == (
+            new.id
+        )
+
+    def test_regeneration_writes_only_changed_rows(self, service, backend, ai_response):
+        """Test qu'une régénération n'envoie que les matchs modifiés ou ajoutés"""
+        unchanged = {
+            **ai_response["matchs_round_robin"][0],
+            "match_id": "rr_2",
+            "debut_horaire": "2024-06-15T09:20:00",
+            "fin_horaire": "2024-06-15T09:35:00",
+        }
+        first = {
+            **ai_response,
+            "matchs_round_robin": ai_response["matchs_round_robin"] + [unchanged],
+        }
+        moved = {**ai_response["matchs_round_robin"][0], "terrain": 2}
+        added = {**unchanged, "match_id": "rr_3", "journee": 2}
+        second = {**ai_response, "matchs_round_robin": [moved, unchanged, added]}
+
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=first
+        ):
+            old = service.generatePlanning("tournament-1")
+        backend.requests.clear()
+        with (
+            patch.object(
+                service.openAIService, "generate_planning", return_value=second
+            ),
+            patch.dict(
+                backend.functions,
+                {
+                    "save_planning_revision": Mock(
+                        wraps=backend.functions["save_planning_revision"]
+                    )
+                },
+            ),
+        ):
+            new = service.regeneratePlanning(old.id)
+            params = backend.functions["save_planning_revision"].call_args.kwargs
+
+        assert sorted(match["match_id_ai"] for match in params["p_matches"]) == [
+            "rr_1",
+            "rr_3",
+        ]
+        assert params["p_replaced_match_ids"] == ["rr_1"]
+        matches = {
+            match["match_id_ai"]: match
+            for match in backend.tables["ai_generated_match"]
+            if match["planning_id"] == new.id
+        }
+        assert sorted(matches) == ["rr_1", "rr_2", "rr_3"]
+        assert matches["rr_1"]["terrain"] == 2
+        assert new.is_active
+
+    def test_failed_regeneration_keeps_active_version(
+        self, service, backend, ai_response
+    ):
+        """Test qu'un échec de génération laisse le tournoi avec sa version actuelle"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            old = service.generatePlanning("tournament-1")
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=None
+        ):
+            assert service.regeneratePlanning(old.id) is None
+
+        service.databaseService.invalidatePlanning(old.id)
+        planning = service.databaseService.getPlanningWithDetailsByTournamentId(
+            "tournament-1"
+        )
+        assert planning.id == old.id and planning.is_active
+
+    def test_each_activation_collects_replaced_versions(
+        self, service, backend, ai_response
+    ):
+        """Test que chaque génération supprime les versions remplacées avant la précédente"""
+        events = []
+        with (
+            patch.object(
+                service.openAIService, "generate_planning", return_value=ai_response
+            ),
+            patch(
+                "app.services.database_service.planningEventBroker.publish",
+                side_effect=lambda *args: events.append(args),
+            ),
+        ):
+            first, second = (service.generatePlanning("tournament-1") for _ in "12")
+            assert len(backend.tables["ai_tournament_planning"]) == 2
+            third = service.generatePlanning("tournament-1")
+
+        # La version précédente reste lisible; la plus ancienne est supprimée
+        assert {
+            row["id"]: row["is_active"]
+            for row in backend.tables["ai_tournament_planning"]
+        } == {second.id: False, third.id: True}
+        assert {
+            match["planning_id"] for match in backend.tables["ai_generated_match"]
+        } == {second.id, third.id}
+        assert (first.id, None, "tournament-1") in events
+        assert (
+            service.databaseService.getPlanningWithDetailsByPlanningId(first.id) is None
+        )
+
+    def test_collection_ignores_client_clock(self, service, backend, ai_response):
+        """Test que l'ordre des versions vient de la base, pas du created_at client"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            first = service.generatePlanning("tournament-1")
+            second = service.generatePlanning("tournament-1")
+            # Worker en retard: created_at de la deuxième version avant la première
+            backend._row("ai_tournament_planning", second.id)[
+                "created_at"
+            ] = "2000-01-01T00:00:00"
+            third = service.generatePlanning("tournament-1")
+
+        assert [row["id"] for row in backend.tables["ai_tournament_planning"]] == [
+            second.id,
+            third.id,
+        ]
+        assert first.id not in {
+            match["planning_id"] for match in backend.tables["ai_generated_match"]
+        }
+
+    def test_purge_removes_every_planning_in_one_request(
+        self, service, backend, ai_response
+    ):
+        """Test que la purge d'un tournoi supprime plannings, matchs et poules en un appel"""
+        with patch.object(
+            service.openAIService, "generate_planning", return_value=ai_response
+        ):
+            plannings = [service.generatePlanning("tournament-1") for _ in range(3)]
+        backend.requests.clear()
+
+        planningIds = service.purgeTournamentPlannings("tournament-1")
+
+        # La première version a déjà été supprimée par la troisième activation
+        assert sorted(planningIds) == sorted(planning.id for planning in plannings[1:])
+        assert backend.calls() == [("POST", "rpc/purge_tournament_plannings")]
+        assert backend.tables["ai_tournament_planning"] == []
+        assert backend.tables["ai_generated_match"] == []
+        assert (
+            service.databaseService.getPlanningWithDetailsByTournamentId("tournament-1")
+            is None
+        )
@@ -0,0 +1,194 @@
+import asyncio
+import inspect
+import json
+
+import httpx
+import pytest
+from supabase import AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.async_database_service import AsyncDatabaseService
+from app.services.database_service import DatabaseService, planningCache
+from tests.fake_supabase import FakeSupabase
+
+
+class TestAsyncDatabaseService:
+    """Tests unitaires pour AsyncDatabaseService"""
+
+    @pytest.fixture
+    def backend(self):
+        """PostgREST simulé: renvoie les lignes insérées et journalise les requêtes"""
+        requests = []
+        saved = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            table = request.url.path.rsplit("/", 1)[-1]
+            requests.append((request.method, table, request.url.query.decode()))
+            await asyncio.sleep(0.01)
+            if table == "save_generated_planning":
+                saved.update(json.loads(request.content)["p_planning"])
+                return httpx.Response(200, json=saved)
+            if table == "activate_planning":
+                return httpx.Response(200, json={**saved, "is_active": True})
+            if request.method == "POST":
+                rows = json.loads(request.content)
+                return httpx.Response(
+                    201, json=rows if isinstance(rows, list) else [rows]
+                )
+            return httpx.Response(200, json=[])
+
+        return requests, handler
+
+    @pytest.fixture
+    def service(self, backend):
+        _, handler = backend
+        client = AsyncClient(
+            "https://test.supabase.co",
+            "test-service-key",
+            options=AsyncClientOptions(
+                httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            ),
+        )
+        return AsyncDatabaseService(supabase_client=client)
+
+    def test_save_planning_with_details(self, service, backend, planning_data):
+        """Test de la sauvegarde planning + matchs + poules en un seul appel rpc"""
+        requests, _ = backend
+
+        planning = asyncio.run(
+            service.savePlanningWithDetails(
+                "tournament-1",
+                planning_data,
+                "poules",
+                {"Équipe 1": "team-1", "Équipe 2": "team-2"},
+            )
+        )
+
+        assert planning.tournament_id == "tournament-1"
+        assert [(method, table) for method, table, _ in requests] == [
+            ("POST", "save_generated_planning")
+        ]
+
+    def test_save_matches_in_chunks(self, service, backend, planning_data):
+        """Test de l'envoi des matchs par lots (upsert, réponse minimale) puis activation"""
+        requests, _ = backend
+        match = planning_data["poules"][0]["matchs"][0]
+        planning_data["poules"][0]["matchs"].append({**match, "match_id": "poule_a_m2"})
+
+        with patch.object(settings, "MATCH_INSERT_CHUNK_SIZE", 1):
+            planning = asyncio.run(
+                service.savePlanningWithDetails(
+                    "tournament-1",
+                    planning_data,
+                    "poules",
+                    {"Équipe 1": "team-1", "Équipe 2": "team-2"},
+                )
+            )
+
+        assert planning.is_active
+        assert [(method, table) for method, table, _ in requests] == [
+            ("POST", "save_generated_planning"),
+            ("POST", "ai_generated_match"),
+            ("POST", "ai_generated_match"),
+            ("POST", "activate_planning"),
+        ]
+
+    def test_same_public_api_as_sync_service(self):
+        """Test que chaque méthode de DatabaseService a sa variante coroutine"""
+        for name, method in vars(DatabaseService).items():
+            if callable(method) and not name.startswith("__"):
+                assert inspect.iscoroutinefunction(getattr(AsyncDatabaseService, name))
+
+
+class TestAsyncDatabaseServiceOnFakeBackend:
+    """Mêmes requêtes que DatabaseService sur le backend PostgREST simulé"""
+
+    MAPPING = {"Équipe 1": "team-1", "Équipe 2": "team-2"}
+
+    @pytest.fixture
+    def backend(self):
+        return FakeSupabase(
+            {
+                "tournament": [{"id": "tournament-1"}],
+                "team": [
+                    {"id": teamId, "name": name, "tournament_id": "tournament-1"}
+                    for name, teamId in self.MAPPING.items()
+                ],
+            }
+        )
+
+    @pytest.fixture
+    def services(self, backend):
+        with patch("app.services.database_service.getSupabase") as mock_get_supabase:
+            mock_get_supabase.return_value = backend.client()
+            yield (
+                DatabaseService(),
+                AsyncDatabaseService(supabase_client=backend.async_client()),
+            )
+
+    def test_revision_sends_only_changes(self, services, backend, planning_data):
+        """Test qu'une régénération identique ne renvoie aucune ligne (comme en sync)"""
+        service, asyncService = services
+        base = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "poules", self.MAPPING
+        )
+        backend.requests.clear()
+
+        planning = asyncio.run(
+            asyncService.savePlanningRevision(
+                base.id, "tournament-1", planning_data, "poules", self.MAPPING
+            )
+        )
+
+        assert planning.is_active
+        assert backend.calls() == [
+            ("GET", "ai_tournament_planning"),
+            ("POST", "rpc/save_planning_revision"),
+        ]
+        assert len(backend.tables["ai_generated_match"]) == 2
+
+    def test_reads_match_sync_service(self, services, backend, planning_data):
+        """Test que les lectures async renvoient ce que renvoie le service sync"""
+        service, asyncService = services
+        planning = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "poules", self.MAPPING
+        )
+        planningCache.clear()
+
+        async def read():
+            return await asyncio.gather(
+                asyncService.getPlanningWithDetailsByTournamentId("tournament-1"),
+                asyncService.getMatchesPage(planning.id, limit=10),
+                asyncService.getPlanningVersionByTournamentId("tournament-1"),
+            )
+
+        asyncPlanning, page, version = asyncio.run(read())
+
+        assert asyncPlanning.id == planning.id
+        assert [match.id for match in page["items"]] == [
+            match.id for match in service.getPlanningMatches(planning.id)
+        ]
+        assert page["next_cursor"] is None
+        assert version == service.getPlanningVersionByTournamentId("tournament-1")
+
+    def test_save_matches_and_poules_concurrently(
+        self, services, backend, planning_data
+    ):
+        """Test que matchs et poules s'écrivent par deux requêtes indépendantes"""
+        _, asyncService = services
+        backend.tables["ai_tournament_planning"] = [
+            {"id": "planning-1", "tournament_id": "tournament-1"}
+        ]
+
+        matches, poules = asyncio.run(
+            asyncService.saveMatchesAndPoules("planning-1", planning_data)
+        )
+
+        assert [match.resolved_equipe_a_id for match in matches] == ["team-1"]
+        assert [poule.nom_poule for poule in poules] == ["Poule A"]
+        assert sorted(backend.calls("POST")) == [
+            ("POST", "ai_generated_match"),
+            ("POST", "ai_generated_poule"),
+        ]
@@ -0,0 +1,127 @@
+import asyncio
+import inspect
+import json
+
+import httpx
+import pytest
+from supabase import AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
+
+from app.services.async_tournament_service import AsyncTournamentService
+from app.services.tournament_service import TournamentService
+
+
+class TestAsyncTournamentService:
+    """Tests unitaires pour AsyncTournamentService"""
+
+    @pytest.fixture
+    def tournament_row(self):
+        return {
+            "id": "tournament-1",
+            "name": "Tournoi Test",
+            "description": None,
+            "tournament_type": "round_robin",
+            "max_teams": 8,
+            "courts_available": 2,
+            "start_date": "2024-06-15",
+            "organizer_id": "organizer-1",
+            "status": "ready",
+            "created_at": "2024-06-01T10:00:00",
+            "updated_at": "2024-06-01T10:00:00",
+        }
+
+    @pytest.fixture
+    def team_rows(self):
+        return [
+            {
+                "id": f"team-{index}",
+                "name": f"Équipe {index}",
+                "description": "",
+                "tournament_id": "tournament-1",
+                "contact_email": "test@example.com",
+                "contact_phone": "0123456789",
+                "skill_level": "intermediate",
+                "notes": "",
+                "created_at": "2024-06-01T10:00:00",
+                "updated_at": "2024-06-01T10:00:00",
+            }
+            for index in (1, 2)
+        ]
+
+    @pytest.fixture
+    def backend(self, tournament_row, team_rows):
+        """PostgREST simulé qui journalise les tables lues"""
+        state = {"tables": []}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            table = request.url.path.rsplit("/", 1)[-1]
+            state["tables"].append(table)
+            if table == "tournament":
+                data = {
+                    **tournament_row,
+                    "team": team_rows,
+                    "team_count": [{"count": len(team_rows)}],
+                    "team_latest": [{"updated_at": team_rows[-1]["updated_at"]}],
+                }
+            else:
+                data = team_rows
+            return httpx.Response(200, content=json.dumps(data))
+
+        return state, handler
+
+    @pytest.fixture
+    def service(self, backend):
+        _, handler = backend
+        client = AsyncClient(
+            "https://test.supabase.co",
+            "test-service-key",
+            options=AsyncClientOptions(
+                httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            ),
+        )
+        return AsyncTournamentService(supabase_client=client)
+
+    def test_get_tournament_with_teams_single_request(self, service, backend):
+        """Test que le tournoi et ses équipes sont lus en une seule requête"""
+        state, _ = backend
+
+        result = asyncio.run(service.getTournamentWithTeams("tournament-1"))
+
+        assert result["tournament"].id == "tournament-1"
+        assert result["tournament"].registered_teams == 2
+        assert result["teams_count"] == 2
+        assert result["can_start"] is True
+        assert state["tables"] == ["tournament"]
+
+    def test_team_index_reused_while_fingerprint_unchanged(self, service, backend):
+        """Test que les équipes ne sont relues que si leur empreinte change"""
+        state, _ = backend
+
+        first = asyncio.run(service.getTournamentWithTeamIndex("tournament-1"))
+        second = asyncio.run(service.getTournamentWithTeamIndex("tournament-1"))
+
+        assert second["team_index"] is first["team_index"]
+        assert second["team_index"] == {"Équipe 1": "team-1", "Équipe 2": "team-2"}
+        assert second["tournament"].registered_teams == 2
+        assert state["tables"] == ["tournament", "team", "tournament"]
+
+    def test_get_tournament_by_id(self, service):
+        """Test de la lecture d'un tournoi avec son nombre d'équipes"""
+        tournament = asyncio.run(service.getTournamentById("tournament-1"))
+
+        assert tournament.name == "Tournoi Test"
+        assert tournament.registered_teams == 2
+
+    def test_validation_shared_with_sync_service(self, service):
+        """Test que la validation est celle du service synchrone"""
+        result = asyncio.run(service.getTournamentWithTeams("tournament-1"))
+
+        assert service._validateTournamentData(result) is True
+
+    def test_same_public_api_as_sync_service(self):
+        """Test que chaque lecture de TournamentService a sa variante coroutine"""
+        for name, method in vars(TournamentService).items():
+            if callable(method) and not name.startswith("__"):
+                assert inspect.iscoroutinefunction(
+                    getattr(AsyncTournamentService, name)
+                )
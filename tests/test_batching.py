@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from app.core.batching import (
+    async_call_with_retry,
+    call_with_retry,
+    chunked,
+    is_retryable,
+)
+
+
+class TestBatching:
+    """Tests des lots et des nouvelles tentatives"""
+
+    def test_chunked(self):
+        """Test du découpage en lots"""
+        assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+        assert chunked([], 2) == []
+
+    @pytest.mark.parametrize(
+        "error,retryable",
+        [
+            (httpx.ReadTimeout("timeout"), True),
+            (httpx.ConnectError("refused"), True),
+            (APIError({"code": "23505", "message": "duplicate key"}), False),
+            (APIError({"code": "22P02", "message": "invalid input"}), False),
+            (APIError({"code": "57014", "message": "statement timeout"}), True),
+            (APIError({"code": 502, "message": "bad gateway"}), True),
+            (APIError({"code": 400, "message": "bad request"}), False),
+            (ValueError("bug"), False),
+        ],
+    )
+    def test_is_retryable(self, error, retryable):
+        """Test de la classification des erreurs transitoires"""
+        assert is_retryable(error) is retryable
+
+    def test_call_with_retry_recovers(self):
+        """Test qu'une erreur transitoire est relancée jusqu'au succès"""
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise httpx.ReadTimeout("timeout")
+            return "ok"
+
+        assert call_with_retry(flaky, retries=2, delay=0) == "ok"
+        assert len(attempts) == 3
+
+    def test_call_with_retry_gives_up_on_permanent_error(self):
+        """Test qu'une erreur de contrainte n'est pas relancée"""
+        attempts = []
+
+        def failing():
+            attempts.append(1)
+            raise APIError({"code": "23502", "message": "null value"})
+
+        with pytest.raises(APIError):
+            call_with_retry(failing, retries=2, delay=0)
+        assert len(attempts) == 1
+
+    def test_async_call_with_retry_exhausted(self):
+        """Test que la dernière erreur est levée après toutes les tentatives"""
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            raise httpx.ReadTimeout("timeout")
+
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(async_call_with_retry(failing, retries=2, delay=0))
+        assert len(attempts) == 3
@@ -0,0 +1,125 @@
+from app.core.cache import MISSING, SQLiteCache, TTLCache, TwoTierCache
+from app.core.metrics import metrics
+
+
+class TestSQLiteCache:
+    """Tests du cache SQLite partagé entre processus"""
+
+    def test_set_get_delete(self, tmp_path):
+        """Test des opérations de base et des valeurs JSON"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"))
+
+        cache.set("planning:1", {"id": "1", "status": "generated"})
+        cache.set("planning:2", None)
+
+        assert cache.get("planning:1") == {"id": "1", "status": "generated"}
+        assert cache.get("planning:2") is None
+        cache.delete("planning:1")
+        assert cache.get("planning:1") is MISSING
+
+    def test_expiration(self, tmp_path):
+        """Test qu'une entrée expirée n'est plus renvoyée"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"))
+
+        cache.set("key", "value", ttl=-1)
+
+        assert cache.get("key") is MISSING
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test que deux instances (deux workers) partagent le même fichier"""
+        path = str(tmp_path / "cache.db")
+        first, second = SQLiteCache(path), SQLiteCache(path)
+
+        first.set("key", [1, 2])
+
+        assert second.get("key") == [1, 2]
+
+
+class TestTwoTierCache:
+    """Tests du cache mémoire + SQLite"""
+
+    def test_local_only(self):
+        """Test que sans second niveau le cache se comporte comme un TTLCache"""
+        cache = TwoTierCache("test", TTLCache(maxsize=2, ttl=None))
+
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is MISSING
+
+    def test_shared_tier_fills_local_tier(self, tmp_path):
+        """Test qu'une entrée écrite par un worker est lue par un autre"""
+        shared = SQLiteCache(str(tmp_path / "cache.db"))
+        worker_a = TwoTierCache("test", TTLCache(ttl=None), shared)
+        worker_b = TwoTierCache("test", TTLCache(ttl=None), SQLiteCache(shared.path))
+        metrics.reset()
+
+        worker_a.set(("planning", "1"), {"status": "generated"})
+
+        assert worker_b.get(("planning", "1")) == {"status": "generated"}
+        assert worker_b.local.get(("planning", "1"))[0] == {"status": "generated"}
+        assert metrics.get("cache.test.hits.shared") == 1
+
+    def test_delete_reaches_both_tiers(self, tmp_path):
+        """Test qu'une invalidation supprime l'entrée des deux niveaux"""
+        cache = TwoTierCache(
+            "test", TTLCache(ttl=None), SQLiteCache(str(tmp_path / "cache.db"))
+        )
+        cache.set("key", "value")
+
+        cache.delete("key")
+
+        assert cache.get("key") is MISSING
+        assert cache.shared.get("test:key") is MISSING
+
+    def test_delete_reaches_other_workers_local_tier(self, tmp_path):
+        """Test qu'une invalidation d'un worker périme le premier niveau des autres"""
+        shared = SQLiteCache(str(tmp_path / "cache.db"))
+        worker_a = TwoTierCache("test", TTLCache(ttl=None), shared)
+        worker_b = TwoTierCache("test", TTLCache(ttl=None), SQLiteCache(shared.path))
+        worker_a.set("key", "v1")
+        assert worker_b.get("key") == "v1"
+        metrics.reset()
+
+        worker_a.delete("key")
+
+        assert worker_b.get("key") is MISSING
+        assert metrics.get("cache.test.stale") == 1
+
+        worker_a.set("key", "v2")
+        assert worker_b.get("key") == "v2"
+
+    def test_local_hit_when_generation_unchanged(self, tmp_path):
+        """Test qu'une entrée locale reste servie tant que rien n'est invalidé"""
+        cache = TwoTierCache(
+            "test", TTLCache(ttl=None), SQLiteCache(str(tmp_path / "cache.db"))
+        )
+        cache.set("key", "value")
+        cache.shared.delete("test:key")
+        metrics.reset()
+
+        assert cache.get("key") == "value"
+        assert metrics.get("cache.test.hits.local") == 1
+
+    def test_encode_decode_for_shared_tier(self, tmp_path):
+        """Test que le second niveau stocke la forme JSON des valeurs"""
+        cache = TwoTierCache(
+            "test",
+            TTLCache(ttl=None),
+            SQLiteCache(str(tmp_path / "cache.db")),
+            encode=lambda value: sorted(value),
+            decode=set,
+        )
+        cache.set("key", {2, 1})
+        cache.local.clear()
+
+        assert cache.shared.get("test:key") == [1, 2]
+        assert cache.get("key") == {1, 2}
+
+    def test_short_ttl_applies_to_local_tier(self):
+        """Test qu'un TTL court (cache négatif) s'applique aussi au premier niveau"""
+        cache = TwoTierCache("test", TTLCache(ttl=60))
+
+        cache.set("key", None, ttl=-1)
+
+        assert cache.get("key") is MISSING
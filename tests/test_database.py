@@ -0,0 +1,82 @@
+import threading
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.core import database
+from app.core.metrics import metrics
+from app.core.queries import TEAM_NAMES
+
+
+class TestSupabaseClient:
+    """Tests du client Supabase partagé par le processus"""
+
+    @pytest.fixture(autouse=True)
+    def reset_client(self):
+        """Repart d'un client non initialisé et de compteurs vides"""
+        with (
+            patch.object(database, "supabase", None),
+            patch.object(database, "httpClient", None),
+        ):
+            metrics.reset()
+            yield
+            metrics.reset()
+
+    def test_get_supabase_is_singleton(self):
+        """Test qu'un seul client est créé, même avec des appels concurrents"""
+        with patch("app.core.database.create_client") as mock_create_client:
+            clients = []
+            threads = [
+                threading.Thread(target=lambda: clients.append(database.getSupabase()))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_create_client.assert_called_once()
+        assert all(client is clients[0] for client in clients)
+
+    def test_client_uses_pooled_http_client(self):
+        """Test que PostgREST utilise le client httpx partagé"""
+        client = database.getSupabase()
+
+        assert client.postgrest.session is database.httpClient
+        assert (
+            database.httpClient.timeout.connect
+            == database.settings.SUPABASE_CONNECT_TIMEOUT
+        )
+
+    def test_connection_metrics(self):
+        """Test du comptage des requêtes et des connexions réutilisées"""
+        client = database.getSupabase()
+        database.httpClient._transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json=[])
+        )
+
+        client.table("tournament").select("id").execute()
+        # Ouverture de connexion telle que signalée par la trace httpcore
+        database._traceConnection("connection.connect_tcp.complete", {})
+        client.table("tournament").select("id").execute()
+
+        connection_metrics = database.getConnectionMetrics()
+        assert connection_metrics["requests"] == 2
+        assert connection_metrics["connections_opened"] == 1
+        assert connection_metrics["connections_reused"] == 1
+
+    def test_query_payload_metrics(self):
+        """Test du comptage des octets reçus par requête du catalogue"""
+        client = database.getSupabase()
+        body = b'[{"id": "team-1", "name": "Equipe 1"}]'
+        database.httpClient._transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=body)
+        )
+
+        TEAM_NAMES.select(client).eq("tournament_id", "tournament-1").execute()
+        client.table("team").select("notes").execute()
+
+        assert metrics.get("supabase.queries.team.names.calls") == 1
+        assert metrics.get("supabase.queries.team.names.bytes") == len(body)
+        assert metrics.get("supabase.queries.team.adhoc.calls") == 1
@@ -1,9 +1,14 @@
 import uuid
 from datetime import date, datetime, time
 
+import httpx
 import pytest
 from unittest.mock import MagicMock, Mock, patch
 
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.pagination import decode_cursor
+from app.core.responses import planning_payload
 from app.models.models import (
     AIGeneratedMatch,
     AIGeneratedPoule,
@@ -11,7 +16,27 @@ from app.models.models import (
     AITournamentPlanning,
     Match,
 )
-from app.services.database_service import DatabaseService
+from app.services.database_service import DatabaseService, planningCache
+from tests.fake_supabase import FakeSupabase
+
+
+@pytest.fixture
+def backend_tables():
+    """Lignes initiales du backend simulé (surchargées par classe)"""
+    return {}
+
+
+@pytest.fixture
+def backend(backend_tables):
+    return FakeSupabase(backend_tables)
+
+
+@pytest.fixture
+def service(backend):
+    """DatabaseService branché sur le backend simulé"""
+    with patch("app.services.database_service.getSupabase") as mock_get_supabase:
+        mock_get_supabase.return_value = backend.client()
+        yield DatabaseService()
 
 
 class TestDatabaseService:
@@ -137,15 +162,29 @@ class TestDatabaseService:
             data={"tournament_id": "550e8400-e29b-41d4-a716-446655440000"}
         )
 
+        # Mock de l'empreinte des équipes (lue avant les équipes)
+        mock_fingerprint_select = Mock()
+        mock_fingerprint_select.order.return_value.limit.return_value.eq.return_value.single.return_value.execute.return_value = Mock(
+            data={
+                "id": "550e8400-e29b-41d4-a716-446655440000",
+                "team_count": [{"count": 2}],
+                "team_latest": [{"updated_at": "2024-01-01T00:00:00"}],
+            }
+        )
+
         # Mock de la récupération des équipes
         mock_teams_select = Mock()
         mock_teams_eq = Mock()
         mock_teams_execute = Mock()
 
         # Utiliser side_effect pour retourner différents mocks selon l'appel
-        mock_table.select.side_effect = [mock_planning_select, mock_teams_select]
+        mock_table.select.side_effect = [
+            mock_planning_select,
+            mock_fingerprint_select,
+            mock_teams_select,
+        ]
         mock_teams_select.eq.return_value = mock_teams_eq
-        mock_teams_eq.execute.return_value = Mock(
+        mock_teams_eq.order.return_value.execute.return_value = Mock(
             data=[
                 {"name": "Équipe 1", "id": "550e8400-e29b-41d4-a716-446655440002"},
                 {"name": "Équipe 2", "id": "550e8400-e29b-41d4-a716-446655440003"},
@@ -429,6 +468,7 @@ class TestDatabaseService:
         mock_client.table.return_value = mock_table
         mock_table.select.return_value = mock_select
         mock_select.eq.return_value = mock_eq
+        mock_eq.eq.return_value = mock_eq  # version active (is_active)
         mock_eq.limit.return_value = mock_limit
         mock_limit.execute.return_value = Mock(data=[mock_planning_response])
 
@@ -455,13 +495,16 @@ class TestDatabaseService:
         mock_client.table.return_value = mock_table
         mock_table.select.return_value = mock_select
         mock_select.eq.return_value = mock_eq
+        mock_eq.eq.return_value = mock_eq  # version active (is_active)
         mock_eq.limit.return_value = mock_limit
         mock_limit.execute.return_value = Mock(data=[])
 
-        with pytest.raises(Exception, match="Planning non trouve"):
+        assert (
             service.getPlanningWithDetailsByTournamentId(
                 "550e8400-e29b-41d4-a716-446655440999"
             )
+            is None
+        )
 
     def test_update_planning_status_success(self, service, mock_get_supabase):
         """Test de mise à jour du statut de planning"""
@@ -525,15 +568,29 @@ class TestDatabaseService:
             data={"tournament_id": "550e8400-e29b-41d4-a716-446655440000"}
         )
 
+        # Mock de l'empreinte des équipes (lue avant les équipes)
+        mock_fingerprint_select = Mock()
+        mock_fingerprint_select.order.return_value.limit.return_value.eq.return_value.single.return_value.execute.return_value = Mock(
+            data={
+                "id": "550e8400-e29b-41d4-a716-446655440000",
+                "team_count": [{"count": 2}],
+                "team_latest": [{"updated_at": "2024-01-01T00:00:00"}],
+            }
+        )
+
         # Mock de la récupération des équipes
         mock_teams_select = Mock()
         mock_teams_eq = Mock()
         mock_teams_execute = Mock()
 
         # Utiliser side_effect pour retourner différents mocks selon l'appel
-        mock_table.select.side_effect = [mock_planning_select, mock_teams_select]
+        mock_table.select.side_effect = [
+            mock_planning_select,
+            mock_fingerprint_select,
+            mock_teams_select,
+        ]
         mock_teams_select.eq.return_value = mock_teams_eq
-        mock_teams_eq.execute.return_value = Mock(
+        mock_teams_eq.order.return_value.execute.return_value = Mock(
             data=[
                 {"name": "Équipe 1", "id": "550e8400-e29b-41d4-a716-446655440002"},
                 {"name": "Équipe 2", "id": "550e8400-e29b-41d4-a716-446655440003"},
@@ -546,6 +603,12 @@ class TestDatabaseService:
             "Équipe 1": "550e8400-e29b-41d4-a716-446655440002",
             "Équipe 2": "550e8400-e29b-41d4-a716-446655440003",
         }
+        # Seules les colonnes utiles sont lues
+        assert [call.args for call in mock_table.select.call_args_list] == [
+            ("tournament_id",),
+            ("id,team_count:team(count),team_latest:team(updated_at)",),
+            ("id,name",),
+        ]
 
     def test_get_teams_mapping_exception(self, service, mock_get_supabase):
         """Test de récupération du mapping des équipes avec exception"""
@@ -702,3 +765,577 @@ class TestDatabaseService:
         )
 
         assert result == []
+
+    def test_get_planning_version_by_planning_id(self, service, mock_get_supabase):
+        """Test de la lecture de version (id + updated_at) sans planning_data"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.execute.return_value = Mock(
+            data=[{"id": "planning-1", "updated_at": "2024-01-01T10:00:00"}]
+        )
+
+        result = service.getPlanningVersionByPlanningId("planning-1")
+        cached = service.getPlanningVersionByPlanningId("planning-1")
+
+        assert result == {"id": "planning-1", "updated_at": "2024-01-01T10:00:00"}
+        assert cached == result
+        mock_client.table.return_value.select.assert_called_once_with("id,updated_at")
+        mock_query.execute.assert_called_once()
+
+    def test_get_planning_version_invalidated_by_status_update(
+        self, service, mock_get_supabase
+    ):
+        """Test que la mise à jour du statut invalide la version en cache"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        mock_client.table.return_value.update.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.execute.return_value = Mock(
+            data=[{"id": "planning-1", "updated_at": "2024-01-01T10:00:00"}]
+        )
+
+        service.getPlanningVersionByPlanningId("planning-1")
+        service.updatePlanningStatus("planning-1", "published")
+        service.getPlanningVersionByPlanningId("planning-1")
+
+        assert mock_client.table.return_value.select.call_count == 2
+
+    def test_get_planning_version_not_found(self, service, mock_get_supabase):
+        """Test de la lecture de version d'un planning inexistant"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.execute.return_value = Mock(data=[])
+
+        result = service.getPlanningVersionByTournamentId("tournament-1")
+
+        assert result is None
+
+    def test_get_planning_with_fields_projects_columns(
+        self, service, mock_get_supabase
+    ):
+        """Test que fields= est transformé en liste de colonnes PostgREST"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        row = {
+            "id": "planning-1",
+            "tournament_id": "tournament-1",
+            "updated_at": "2024-01-01T10:00:00",
+            "status": "generated",
+        }
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.single.return_value = mock_query
+        mock_query.execute.return_value = Mock(data=row)
+
+        result = service.getPlanningWithDetailsByPlanningId(
+            "planning-1", fields=["status"]
+        )
+
+        assert result == row
+        mock_client.table.return_value.select.assert_called_once_with(
+            "id,tournament_id,updated_at,status"
+        )
+
+    def test_get_matches_page_with_cursor(self, service, mock_get_supabase):
+        """Test de la pagination par clé (debut_horaire, id) des matchs"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        rows = [
+            {
+                "id": f"match-{index}",
+                "planning_id": "planning-1",
+                "match_id_ai": f"rr_{index}",
+                "equipe_a": "Équipe 1",
+                "equipe_b": "Équipe 2",
+                "terrain": 1,
+                "debut_horaire": f"2024-06-15T09:0{index}:00",
+                "fin_horaire": f"2024-06-15T09:1{index}:00",
+                "phase": "round_robin",
+            }
+            for index in range(3)
+        ]
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        for method in ("eq", "or_", "order", "limit"):
+            getattr(mock_query, method).return_value = mock_query
+        mock_query.execute.return_value = Mock(data=rows)
+
+        result = service.getMatchesPage(
+            "planning-1",
+            limit=2,
+            after=("2024-06-15T08:00:00", "match-0"),
+            phase="round_robin",
+            team="Équipe 1",
+        )
+
+        assert [match.id for match in result["items"]] == ["match-0", "match-1"]
+        assert decode_cursor(result["next_cursor"]) == (
+            "2024-06-15T09:01:00",
+            "match-1",
+        )
+        mock_query.limit.assert_called_once_with(3)
+        mock_query.eq.assert_any_call("phase", "round_robin")
+        mock_query.or_.assert_any_call('equipe_a.eq."Équipe 1",equipe_b.eq."Équipe 1"')
+        mock_query.or_.assert_any_call(
+            'debut_horaire.gt."2024-06-15T08:00:00",'
+            'and(debut_horaire.eq."2024-06-15T08:00:00",id.gt."match-0")'
+        )
+
+    def test_get_matches_page_last_page(self, service, mock_get_supabase):
+        """Test de la dernière page (pas de curseur suivant)"""
+        mock_get_supabase_func, mock_client = mock_get_supabase
+
+        mock_query = Mock()
+        mock_client.table.return_value.select.return_value = mock_query
+        for method in ("eq", "or_", "order", "limit"):
+            getattr(mock_query, method).return_value = mock_query
+        mock_query.execute.return_value = Mock(data=[])
+
+        result = service.getMatchesPage("planning-1")
+
+        assert result == {"items": [], "next_cursor": None}
+
+
+class TestSavePlanningWithDetails:
+    """Sauvegarde transactionnelle planning + matchs + poules (backend simulé)"""
+
+    def test_single_round_trip(self, service, backend, planning_data):
+        """Test que planning, matchs et poules partent en une seule requête rpc"""
+        planning = service.savePlanningWithDetails(
+            "tournament-1",
+            planning_data,
+            "poules",
+            {"Équipe 1": "team-1", "Équipe 2": "team-2"},
+        )
+
+        assert planning.tournament_id == "tournament-1"
+        assert backend.calls() == [("POST", "rpc/save_generated_planning")]
+        [match] = backend.tables["ai_generated_match"]
+        assert match["planning_id"] == planning.id
+        assert match["resolved_equipe_a_id"] == "team-1"
+        [poule] = backend.tables["ai_generated_poule"]
+        assert poule["planning_id"] == planning.id
+        # La version du planning créé est connue sans nouvelle requête
+        assert service.getPlanningVersionByPlanningId(planning.id) is not None
+        assert len(backend.calls()) == 1
+
+    def test_all_or_nothing(self, service, backend, planning_data):
+        """Test qu'un échec sur les poules n'enregistre ni le planning ni les matchs"""
+        backend.failingTables.add("ai_generated_poule")
+
+        planning = service.savePlanningWithDetails(
+            "tournament-1",
+            planning_data,
+            "poules",
+            {"Équipe 1": "team-1", "Équipe 2": "team-2"},
+        )
+
+        assert planning is None
+        assert backend.tables.get("ai_tournament_planning", []) == []
+        assert backend.tables.get("ai_generated_match", []) == []
+
+    def test_planning_data_validated_once(self, service, backend, planning_data):
+        """Test que le JSON de l'IA n'est validé qu'une fois pour les trois tables"""
+        original_init = AIPlanningData.__init__
+        validations = []
+
+        def counting_init(self, **data):
+            validations.append(1)
+            original_init(self, **data)
+
+        with patch.object(AIPlanningData, "__init__", counting_init):
+            parsed = AIPlanningData(**planning_data)
+            planning = service.savePlanningWithDetails(
+                "tournament-1",
+                parsed,
+                "poules",
+                {"Équipe 1": "team-1", "Équipe 2": "team-2"},
+            )
+
+        assert len(validations) == 1
+        assert planning.total_matches == 1
+        # Le JSON stocké est celui de l'objet validé (dates normalisées)
+        stored = backend.tables["ai_tournament_planning"][0]["planning_data"]
+        assert AIPlanningData(**stored) == parsed
+
+    def test_without_teams_no_request(self, service, backend, planning_data):
+        """Test qu'aucune requête n'est envoyée sans équipes à résoudre"""
+        planning = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "poules", {}
+        )
+
+        assert planning is None
+        assert backend.calls() == []
+
+    def test_revision_copies_unchanged_rows(self, service, backend, planning_data):
+        """Test qu'une régénération identique n'envoie aucune ligne de match ni de poule"""
+        mapping = {"Équipe 1": "team-1", "Équipe 2": "team-2"}
+        base = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "poules", mapping
+        )
+        backend.requests.clear()
+
+        with patch.dict(
+            backend.functions,
+            {
+                "save_planning_revision": Mock(
+                    wraps=backend.functions["save_planning_revision"]
+                )
+            },
+        ):
+            planning = service.savePlanningRevision(
+                base.id, "tournament-1", planning_data, "poules", mapping
+            )
+            params = backend.functions["save_planning_revision"].call_args.kwargs
+
+        assert backend.calls() == [
+            ("GET", "ai_tournament_planning"),
+            ("POST", "rpc/save_planning_revision"),
+        ]
+        assert params["p_matches"] == [] and params["p_poules"] == []
+        assert planning.is_active
+        assert [
+            match["planning_id"] for match in backend.tables["ai_generated_match"]
+        ] == [base.id, planning.id]
+
+    def test_revision_reads_only_keys_and_hashes(self, service, backend, planning_data):
+        """Test que la version de base n'est lue que par clés et empreintes"""
+        base = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "poules", {"Équipe 1": "team-1"}
+        )
+        [match] = backend.tables["ai_generated_match"]
+        [poule] = backend.tables["ai_generated_poule"]
+
+        assert service._getPlanningChildren(base.id) == {
+            "id": base.id,
+            "ai_generated_match": [
+                {"match_id_ai": "poule_a_m1", "row_hash": match["row_hash"]}
+            ],
+            "ai_generated_poule": [
+                {"poule_id": "poule_a", "row_hash": poule["row_hash"]}
+            ],
+        }
+
+    def test_revision_rewrites_changed_and_unhashed_rows(
+        self, service, backend, planning_data
+    ):
+        """Test qu'une ligne modifiée ou sans empreinte (avant migration) est réécrite"""
+        mapping = {"Équipe 1": "team-1", "Équipe 2": "team-2"}
+        base = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "poules", mapping
+        )
+        for poule in backend.tables["ai_generated_poule"]:
+            poule["row_hash"] = None
+        planning_data["poules"][0]["matchs"][0]["terrain"] = 2
+
+        with patch.dict(
+            backend.functions,
+            {
+                "save_planning_revision": Mock(
+                    wraps=backend.functions["save_planning_revision"]
+                )
+            },
+        ):
+            planning = service.savePlanningRevision(
+                base.id, "tournament-1", planning_data, "poules", mapping
+            )
+            params = backend.functions["save_planning_revision"].call_args.kwargs
+
+        assert [match["terrain"] for match in params["p_matches"]] == [2]
+        assert [poule["poule_id"] for poule in params["p_poules"]] == ["poule_a"]
+        assert params["p_replaced_match_ids"] == ["poule_a_m1"]
+        assert planning.total_matches == 1
+
+    def test_revision_with_duplicate_keys_saves_everything(
+        self, service, backend, planning_data
+    ):
+        """Test qu'un match_id en double donne une sauvegarde complète"""
+        mapping = {"Équipe 1": "team-1", "Équipe 2": "team-2"}
+        base = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "poules", mapping
+        )
+        backend.requests.clear()
+        matches = planning_data["poules"][0]["matchs"]
+        matches.append({**matches[0], "terrain": 2})
+
+        planning = service.savePlanningRevision(
+            base.id, "tournament-1", planning_data, "poules", mapping
+        )
+
+        assert planning.total_matches == 2
+        assert backend.calls() == [
+            ("GET", "ai_tournament_planning"),
+            ("POST", "rpc/save_generated_planning"),
+        ]
+        assert [
+            match["terrain"]
+            for match in backend.tables["ai_generated_match"]
+            if match["planning_id"] == planning.id
+        ] == [1, 2]
+
+    def test_revision_without_base_saves_everything(
+        self, service, backend, planning_data
+    ):
+        """Test qu'une version de base introuvable donne une sauvegarde complète"""
+        planning = service.savePlanningRevision(
+            "missing",
+            "tournament-1",
+            planning_data,
+            "poules",
+            {"Équipe 1": "team-1", "Équipe 2": "team-2"},
+        )
+
+        assert planning is not None
+        assert backend.calls() == [
+            ("GET", "ai_tournament_planning"),
+            ("POST", "rpc/save_generated_planning"),
+        ]
+
+    def test_compressed_planning_data(self, service, backend, planning_data):
+        """Test que planning_data est stocké compressé et relu tel quel"""
+        with patch.object(settings, "PLANNING_DATA_COMPRESSION", "gzip"):
+            planning = service.savePlanningWithDetails(
+                "tournament-1",
+                planning_data,
+                "poules",
+                {"Équipe 1": "team-1", "Équipe 2": "team-2"},
+            )
+
+        [row] = backend.tables["ai_tournament_planning"]
+        assert row["planning_data"] == {}
+        assert row["planning_data_compressed"].startswith("gzip:")
+        assert planning.get_planning_data() == planning_data
+
+        planningCache.clear()
+        cached = service.getPlanningWithDetailsByPlanningId(planning.id)
+        assert cached.planning_data == {}
+        assert cached.get_planning_data() == planning_data
+        # Lecture partielle de planning_data: colonne compressée incluse
+        partial = service.getPlanningWithDetailsByPlanningId(
+            planning.id, fields=["planning_data"]
+        )
+        assert planning_payload(partial)["planning_data"] == planning_data
+
+
+class TestInsertMatchesInChunks:
+    """Insertion des matchs par lots concurrents (backend simulé)"""
+
+    TEAMS = {"Équipe 1": "team-1", "Équipe 2": "team-2"}
+
+    @pytest.fixture
+    def backend_tables(self):
+        return {
+            "ai_tournament_planning": [
+                {"id": "planning-1", "tournament_id": "tournament-1"}
+            ],
+            "tournament": [{"id": "tournament-1"}],
+            "team": [
+                {"id": team_id, "name": name, "tournament_id": "tournament-1"}
+                for name, team_id in self.TEAMS.items()
+            ],
+        }
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self):
+        with (
+            patch.object(settings, "MATCH_INSERT_CHUNK_SIZE", 2),
+            patch.object(settings, "MATCH_INSERT_RETRY_DELAY", 0),
+        ):
+            yield
+
+    @pytest.fixture
+    def planning_data(self):
+        return {
+            "type_tournoi": "round_robin",
+            "matchs_round_robin": [
+                {
+                    "match_id": f"rr_{index}",
+                    "equipe_a": "Équipe 1",
+                    "equipe_b": "Équipe 2",
+                    "terrain": 1,
+                    "debut_horaire": f"2024-06-15T{9 + index:02d}:00:00",
+                    "fin_horaire": f"2024-06-15T{9 + index:02d}:15:00",
+                    "journee": 1,
+                }
+                for index in range(5)
+            ],
+        }
+
+    def match_posts(self, backend):
+        return [
+            call for call in backend.calls("POST") if call[1] == "ai_generated_match"
+        ]
+
+    def test_matches_sent_in_chunks(self, service, backend, planning_data):
+        """Test que 5 matchs partent en 3 requêtes de 2 lignes au plus"""
+        matches = service.saveMatches("planning-1", planning_data)
+
+        assert len(matches) == 5
+        assert len(self.match_posts(backend)) == 3
+        assert len(backend.tables["ai_generated_match"]) == 5
+
+    def test_transient_failure_retried_without_duplicates(
+        self, service, backend, planning_data
+    ):
+        """Test qu'un timeout sur un lot est relancé sans dupliquer de lignes"""
+        backend.failures["ai_generated_match"] = [httpx.ReadTimeout("timeout")]
+
+        matches = service.saveMatches("planning-1", planning_data)
+
+        assert len(matches) == 5
+        assert len(self.match_posts(backend)) == 4
+        assert len(backend.tables["ai_generated_match"]) == 5
+
+    def test_definitive_failure_rolls_back_all_chunks(
+        self, service, backend, planning_data
+    ):
+        """Test qu'un lot refusé annule les lots déjà insérés"""
+        backend.failures["ai_generated_match"] = [
+            ValueError("null value in column terrain")
+        ]
+
+        matches = service.saveMatches("planning-1", planning_data)
+
+        assert matches is None
+        assert backend.tables["ai_generated_match"] == []
+        assert ("DELETE", "ai_generated_match") in backend.calls()
+
+    def test_large_planning_saved_with_chunked_matches(
+        self, service, backend, planning_data
+    ):
+        """Test que la sauvegarde complète bascule sur les lots au-delà d'un lot"""
+        planning = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "round_robin", self.TEAMS
+        )
+
+        assert planning is not None
+        assert backend.calls("POST")[0] == ("POST", "rpc/save_generated_planning")
+        assert len(self.match_posts(backend)) == 3
+        assert len(backend.tables["ai_generated_match"]) == 5
+        # Version activée seulement une fois tous les lots insérés
+        assert backend.calls("POST")[-1] == ("POST", "rpc/activate_planning")
+        assert planning.is_active
+
+    def test_large_planning_rolled_back_on_chunk_failure(
+        self, service, backend, planning_data
+    ):
+        """Test que le planning est supprimé si ses matchs ne peuvent pas être insérés"""
+        backend.failingTables.add("ai_generated_match")
+
+        planning = service.savePlanningWithDetails(
+            "tournament-1", planning_data, "round_robin", self.TEAMS
+        )
+
+        assert planning is None
+        assert [row["id"] for row in backend.tables["ai_tournament_planning"]] == [
+            "planning-1"
+        ]
+        assert backend.tables["ai_generated_match"] == []
+
+
+class TestPlanningCache:
+    """Cache des plannings: lectures, cache négatif et invalidation (backend simulé)"""
+
+    NOW = "2024-06-01T10:00:00"
+
+    @pytest.fixture
+    def planning_row(self):
+        return {
+            "id": "planning-1",
+            "tournament_id": "tournament-1",
+            "type_tournoi": "round_robin",
+            "status": "generated",
+            "planning_data": {"type_tournoi": "round_robin"},
+            "total_matches": 0,
+            "start_time": None,
+            "end_time": None,
+            "ai_comments": None,
+            "is_active": True,
+            "created_at": self.NOW,
+            "updated_at": self.NOW,
+        }
+
+    @pytest.fixture
+    def backend_tables(self, planning_row):
+        return {"ai_tournament_planning": [planning_row]}
+
+    def test_read_by_id_is_cached(self, service, backend):
+        """Test qu'un planning relu est servi par le cache"""
+        first = service.getPlanningWithDetailsByPlanningId("planning-1")
+        second = service.getPlanningWithDetailsByPlanningId("planning-1")
+
+        assert first.id == second.id == "planning-1"
+        assert len(backend.calls("GET")) == 1
+
+    def test_read_by_tournament_shares_the_entry(self, service, backend):
+        """Test qu'une lecture par tournoi remplit aussi la lecture par ID"""
+        service.getPlanningWithDetailsByTournamentId("tournament-1")
+        planning = service.getPlanningWithDetailsByPlanningId("planning-1")
+        service.getPlanningWithDetailsByTournamentId("tournament-1")
+
+        assert planning.tournament_id == "tournament-1"
+        assert len(backend.calls("GET")) == 1
+
+    def test_fields_reads_bypass_cache(self, service, backend):
+        """Test que les lectures partielles (fields=) ne sont pas mises en cache"""
+        service.getPlanningWithDetailsByPlanningId("planning-1", fields=["status"])
+        service.getPlanningWithDetailsByPlanningId("planning-1", fields=["status"])
+
+        assert len(backend.calls("GET")) == 2
+
+    def test_missing_planning_is_negatively_cached(self, service, backend):
+        """Test qu'un 404 est mis en cache (planning et tournoi sans planning)"""
+        assert service.getPlanningWithDetailsByPlanningId("planning-404") is None
+        assert service.getPlanningWithDetailsByPlanningId("planning-404") is None
+        for _ in range(2):
+            assert (
+                service.getPlanningWithDetailsByTournamentId("tournament-404") is None
+            )
+
+        assert len(backend.calls("GET")) == 2
+
+    def test_status_update_invalidates(self, service, backend):
+        """Test que updatePlanningStatus invalide le planning en cache"""
+        service.getPlanningWithDetailsByPlanningId("planning-1")
+
+        assert service.updatePlanningStatus("planning-1", "published") is True
+        planning = service.getPlanningWithDetailsByPlanningId("planning-1")
+
+        assert planning.status == "published"
+        assert len(backend.calls("GET")) == 2
+
+    def test_save_replaces_negative_entry(self, service, backend):
+        """Test qu'une sauvegarde remplace le cache négatif du tournoi"""
+        assert service.getPlanningWithDetailsByTournamentId("tournament-2") is None
+
+        saved = service.savePlanningWithDetails(
+            "tournament-2",
+            {"type_tournoi": "round_robin"},
+            "round_robin",
+            {"Équipe 1": "team-1"},
+        )
+        planning = service.getPlanningWithDetailsByTournamentId("tournament-2")
+
+        assert planning.id == saved.id
+        assert len(backend.calls("GET")) == 1
+
+    def test_invalidate_drops_tournament_pointer(self, service, backend):
+        """Test qu'après invalidation, la lecture par tournoi relit la base"""
+        service.getPlanningWithDetailsByTournamentId("tournament-1")
+
+        service.invalidatePlanning("planning-1")
+        service.getPlanningWithDetailsByTournamentId("tournament-1")
+
+        assert len(backend.calls("GET")) == 2
@@ -0,0 +1,59 @@
+import asyncio
+
+from app.core.events import ALL_PLANNINGS, PlanningEventBroker
+
+
+class TestPlanningEventBroker:
+    """Tests de la diffusion des changements de statut"""
+
+    def test_publish_to_subscribers(self):
+        """Test qu'un événement est remis aux abonnés du planning et aux abonnés globaux"""
+        broker = PlanningEventBroker()
+
+        async def run():
+            planning_sub = broker.subscribe("planning-1")
+            other_sub = broker.subscribe("planning-2")
+            global_sub = broker.subscribe(ALL_PLANNINGS)
+
+            broker.publish("planning-1", "validated")
+
+            return (
+                await planning_sub.get(timeout=1),
+                await global_sub.get(timeout=1),
+                await other_sub.get(timeout=0.01),
+            )
+
+        planning_event, global_event, other_event = asyncio.run(run())
+
+        assert planning_event == {
+            "planning_id": "planning-1",
+            "status": "validated",
+            "tournament_id": None,
+        }
+        assert global_event == planning_event
+        assert other_event is None
+
+    def test_unsubscribe(self):
+        """Test qu'un abonnement retiré ne reçoit plus d'événements"""
+        broker = PlanningEventBroker()
+
+        async def run():
+            subscription = broker.subscribe("planning-1")
+            broker.unsubscribe(subscription)
+            broker.publish("planning-1", "validated")
+            return await subscription.get(timeout=0.01)
+
+        assert asyncio.run(run()) is None
+        assert broker.subscriber_count("planning-1") == 0
+
+    def test_publish_after_loop_closed(self):
+        """Test que les abonnés dont la boucle est fermée sont retirés"""
+        broker = PlanningEventBroker()
+
+        async def run():
+            broker.subscribe("planning-1")
+
+        asyncio.run(run())
+        broker.publish("planning-1", "validated")
+
+        assert broker.subscriber_count("planning-1") == 0
@@ -0,0 +1,132 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.responses import ORJSONResponse
+from unittest.mock import patch
+
+from app.core.cache import MISSING, TTLCache
+from app.core.compression import (
+    SUPPORTED_ENCODINGS,
+    compress_body,
+    compressed_response,
+    negotiate_encoding,
+)
+from app.core.http_cache import build_etag, etag_matches, not_modified_response
+
+
+class TestHttpCache:
+    """Tests pour les ETags, la compression et le cache mémoire"""
+
+    def test_build_etag_is_quoted_and_stable(self):
+        """Test qu'un ETag est fort (entre guillemets) et déterministe"""
+        etag = build_etag("planning-1", datetime(2024, 1, 1, 10, 0))
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == build_etag("planning-1", datetime(2024, 1, 1, 10, 0))
+
+    def test_build_etag_string_and_datetime_match(self):
+        """Test que la chaîne ISO de la DB et le datetime donnent le même ETag"""
+        from_db = build_etag("planning-1", "2024-01-01T10:00:00+00:00")
+        from_model = build_etag(
+            "planning-1", datetime.fromisoformat("2024-01-01T10:00:00+00:00")
+        )
+
+        assert from_db == from_model
+
+    def test_build_etag_changes_with_updated_at(self):
+        """Test que l'ETag change quand le planning est mis à jour"""
+        first = build_etag("planning-1", "2024-01-01T10:00:00")
+        second = build_etag("planning-1", "2024-01-01T10:00:01")
+
+        assert first != second
+
+    def test_etag_matches(self):
+        """Test de la comparaison If-None-Match"""
+        etag = build_etag("planning-1", "2024-01-01T10:00:00")
+
+        assert etag_matches(etag, etag) is True
+        assert etag_matches(f'"other", W/{etag}', etag) is True
+        assert etag_matches("*", etag) is True
+        assert etag_matches('"other"', etag) is False
+        assert etag_matches(None, etag) is False
+
+    def test_not_modified_response(self):
+        """Test de la réponse 304"""
+        response = not_modified_response('"abc"')
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"abc"'
+        assert response.body == b""
+
+    def test_ttl_cache_expiration(self):
+        """Test de l'expiration des entrées"""
+        cache = TTLCache(maxsize=10, ttl=5)
+
+        with patch("app.core.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("app.core.cache.time.monotonic", return_value=104.0):
+            assert cache.get("a") == 1
+        with patch("app.core.cache.time.monotonic", return_value=106.0):
+            assert cache.get("a") is MISSING
+
+    def test_ttl_cache_lru_eviction(self):
+        """Test de l'éviction LRU quand la taille max est atteinte"""
+        cache = TTLCache(maxsize=2, ttl=None)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is MISSING
+        assert cache.get("c") == 3
+
+    def test_ttl_cache_keeps_none_values(self):
+        """Test qu'une valeur None peut être mise en cache"""
+        cache = TTLCache(maxsize=2, ttl=None)
+        cache.set("a", None)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is MISSING
+
+    def test_negotiate_encoding(self):
+        """Test de la négociation Accept-Encoding"""
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding("*") in SUPPORTED_ENCODINGS
+
+    def test_compressed_response_below_threshold(self):
+        """Test qu'un petit corps n'est pas compressé"""
+        response = compressed_response(ORJSONResponse({"a": 1}), "gzip")
+
+        assert "content-encoding" not in response.headers
+
+    def test_compressed_response_cached(self):
+        """Test que le corps compressé est calculé une seule fois par clé"""
+        content = {"data": "x" * 5000}
+        headers = {"ETag": '"abc"'}
+
+        with patch(
+            "app.core.compression.compress_body", wraps=compress_body
+        ) as mock_compress:
+            first = compressed_response(
+                ORJSONResponse(content, headers=headers), "gzip", cache_key='"abc"'
+            )
+            second = compressed_response(
+                ORJSONResponse(content, headers=headers), "gzip", cache_key='"abc"'
+            )
+
+        assert mock_compress.call_count == 1
+        assert first.body == second.body
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"] == '"abc-gzip"'
+        assert json.loads(gzip.decompress(first.body)) == content
+
+    def test_etag_matches_compressed_variant(self):
+        """Test que l'ETag d'une représentation compressée est reconnu"""
+        assert etag_matches('"abc-gzip"', '"abc"') is True
+        assert etag_matches('"abc-br"', '"abc"') is True
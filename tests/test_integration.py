@@ -167,7 +167,6 @@ class TestIntegration:
         """Test du rollback en cas d'échec"""
         # Simuler un échec lors de la génération
         mock_ai_planning_service.generatePlanning.return_value = None
-        mock_ai_planning_service._deletePlanning.return_value = True
 
         result = mock_ai_planning_service.generatePlanning(
             "550e8400-e29b-41d4-a716-446655440000"
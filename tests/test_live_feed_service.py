@@ -0,0 +1,216 @@
+import asyncio
+from datetime import datetime
+
+import orjson
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.core.events import planningEventBroker
+from app.models.models import AIGeneratedMatch, AITournamentPlanning
+from app.services.live_feed_service import TournamentFeedHub, build_delta
+
+
+def make_match(match_id: str, **overrides) -> AIGeneratedMatch:
+    values = {
+        "id": match_id,
+        "planning_id": "planning-1",
+        "match_id_ai": match_id,
+        "equipe_a": "winner_quart_1",
+        "equipe_b": "winner_quart_2",
+        "terrain": 1,
+        "debut_horaire": datetime(2024, 1, 1, 10, 0),
+        "fin_horaire": datetime(2024, 1, 1, 10, 30),
+        "phase": "elimination",
+    }
+    values.update(overrides)
+    return AIGeneratedMatch(**values)
+
+
+class TestTournamentFeedHub:
+    """Tests du direct des plannings par tournoi"""
+
+    @pytest.fixture
+    def planning(self):
+        return AITournamentPlanning(
+            id="planning-1",
+            tournament_id="tournament-1",
+            type_tournoi="elimination",
+            status="generated",
+            planning_data={},
+            total_matches=2,
+            updated_at=datetime(2024, 1, 1, 9, 0),
+        )
+
+    @pytest.fixture
+    def hub(self, planning):
+        hub = TournamentFeedHub()
+        hub.databaseService = AsyncMock()
+        hub.databaseService.getPlanningVersionByTournamentId.return_value = {
+            "id": "planning-1",
+            "updated_at": "2024-01-01T09:00:00",
+        }
+        hub.databaseService.getPlanningWithDetailsByPlanningId.return_value = planning
+        hub.databaseService.getPlanningMatches.return_value = [
+            make_match("m-1"),
+            make_match("m-2"),
+        ]
+        return hub
+
+    def test_build_delta_changed_fields_only(self):
+        """Test que le delta ne contient que les champs et matchs modifiés"""
+        previous = {
+            "planning": {"id": "planning-1", "status": "generated"},
+            "matches": {"m-1": {"id": "m-1", "resolved_equipe_a_id": None}},
+        }
+        current = {
+            "planning": {"id": "planning-1", "status": "validated"},
+            "matches": {
+                "m-1": {"id": "m-1", "resolved_equipe_a_id": "team-1"},
+                "m-2": {"id": "m-2", "resolved_equipe_a_id": None},
+            },
+        }
+
+        delta = build_delta("tournament-1", previous, current)
+
+        assert delta["type"] == "delta"
+        assert delta["planning"] == {"status": "validated"}
+        assert delta["matches"]["upserted"] == list(current["matches"].values())
+        assert delta["matches"]["removed"] == []
+        assert build_delta("tournament-1", current, current) is None
+
+    def test_build_delta_replaced_planning(self):
+        """Test qu'un planning remplacé (régénération) produit un snapshot"""
+        previous = {"planning": {"id": "planning-1"}, "matches": {}}
+        current = {"planning": {"id": "planning-2"}, "matches": {}}
+
+        assert build_delta("tournament-1", previous, current)["type"] == "snapshot"
+
+    def test_snapshot_then_single_encoded_delta(self, hub):
+        """Test du snapshot initial puis d'un delta diffusé à tous les abonnés"""
+
+        async def run():
+            first = await hub.subscribe("tournament-1")
+            second = await hub.subscribe("tournament-1")
+            snapshots = [first.get_nowait(), second.get_nowait()]
+
+            hub.databaseService.getPlanningMatches.return_value = [
+                make_match("m-1", resolved_equipe_a_id="team-1"),
+                make_match("m-2"),
+            ]
+            planningEventBroker.publish("planning-1", "generated")
+
+            deltas = [
+                await asyncio.wait_for(first.get(), 1),
+                await asyncio.wait_for(second.get(), 1),
+            ]
+            hub.unsubscribe("tournament-1", first)
+            hub.unsubscribe("tournament-1", second)
+            return snapshots, deltas
+
+        snapshots, deltas = asyncio.run(run())
+
+        assert snapshots[0] is snapshots[1]
+        assert len(orjson.loads(snapshots[0])["matches"]) == 2
+        # Encodé une seule fois pour tous les abonnés
+        assert deltas[0] is deltas[1]
+        delta = orjson.loads(deltas[0])
+        assert delta["type"] == "delta"
+        assert delta["planning"] == {}
+        assert [m["id"] for m in delta["matches"]["upserted"]] == ["m-1"]
+        assert hub.channels == {}
+        assert planningEventBroker.subscriber_count() == 0
+        # Une seule lecture des matchs à la connexion et une par notification
+        assert hub.databaseService.getPlanningMatches.call_count == 2
+
+    def test_subscribe_error_closes_channel(self, hub):
+        """Test qu'une erreur de lecture de l'état initial ne laisse pas de canal ouvert"""
+        hub.databaseService.getPlanningMatches.side_effect = Exception("DB down")
+
+        async def run():
+            with pytest.raises(Exception, match="DB down"):
+                await hub.subscribe("tournament-1")
+            await asyncio.sleep(0)  # laisse l'écoute annulée se terminer
+
+        asyncio.run(run())
+
+        assert hub.channels == {}
+        assert hub._listener is None
+        assert planningEventBroker.subscriber_count() == 0
+
+    def test_subscribe_error_keeps_other_subscribers(self, hub):
+        """Test qu'un abonnement en échec ne ferme pas le canal des autres abonnés"""
+
+        async def run():
+            first = await hub.subscribe("tournament-1")
+            hub.channels["tournament-1"].state = None  # état à relire
+            hub.databaseService.getPlanningMatches.side_effect = Exception("DB down")
+            with pytest.raises(Exception):
+                await hub.subscribe("tournament-1")
+
+            subscribers = set(hub.channels["tournament-1"].subscribers)
+            hub.unsubscribe("tournament-1", first)
+            return first, subscribers
+
+        first, subscribers = asyncio.run(run())
+
+        assert subscribers == {first}
+        assert hub.channels == {}
+
+    def test_revalidation_detects_changes_from_other_workers(self, hub, planning):
+        """Test qu'un planning modifié hors de ce processus est diffusé sans notification"""
+
+        async def run():
+            queue = await hub.subscribe("tournament-1")
+            queue.get_nowait()
+            # Écriture d'un autre worker: aucune notification locale
+            hub.databaseService.getPlanningVersionByTournamentId.return_value = {
+                "id": "planning-1",
+                "updated_at": "2024-01-01T09:05:00",
+            }
+            hub.databaseService.getPlanningWithDetailsByPlanningId.return_value = (
+                planning.model_copy(update={"status": "published"})
+            )
+            delta = await asyncio.wait_for(queue.get(), 1)
+            hub.unsubscribe("tournament-1", queue)
+            await asyncio.sleep(0)
+            return delta
+
+        with patch.object(settings, "LIVE_FEED_REVALIDATE_INTERVAL", 0.01):
+            delta = orjson.loads(asyncio.run(run()))
+
+        assert delta["type"] == "delta"
+        assert delta["planning"] == {"status": "published"}
+        assert hub._revalidator is None
+
+    def test_unchanged_version_not_reloaded(self, hub):
+        """Test que la revalidation ne relit pas l'état si la version n'a pas changé"""
+
+        async def run():
+            queue = await hub.subscribe("tournament-1")
+            await asyncio.sleep(0.05)
+            hub.unsubscribe("tournament-1", queue)
+
+        with patch.object(settings, "LIVE_FEED_REVALIDATE_INTERVAL", 0.01):
+            asyncio.run(run())
+
+        assert hub.databaseService.getPlanningVersionByTournamentId.call_count > 1
+        assert hub.databaseService.getPlanningMatches.call_count == 1
+
+    def test_refresh_without_state_sends_snapshot(self, hub):
+        """Test qu'une relecture sans état diffusé envoie un snapshot complet"""
+
+        async def run():
+            queue = await hub.subscribe("tournament-1")
+            queue.get_nowait()
+            channel = hub.channels["tournament-1"]
+            channel.state = None
+            await hub._refresh(channel)
+            message = queue.get_nowait()
+            hub.unsubscribe("tournament-1", queue)
+            return message
+
+        message = orjson.loads(asyncio.run(run()))
+
+        assert message["type"] == "snapshot"
+        assert len(message["matches"]) == 2
@@ -3,6 +3,7 @@ import json
 import pytest
 from unittest.mock import MagicMock, Mock, patch
 
+from app.models.models import AIPlanningData
 from app.services.openai_service import OpenAIClientService
 
 
@@ -58,7 +59,9 @@ class TestOpenAIService:
 
                 result = service.generate_planning("Test prompt")
 
-                assert result == {"type_tournoi": "round_robin", "matches": []}
+                assert isinstance(result, AIPlanningData)
+                assert result.type_tournoi == "round_robin"
+                assert result.to_planning_data() == mock_parse.return_value
                 mock_openai_client.beta.threads.create.assert_called_once()
                 mock_openai_client.beta.threads.messages.create.assert_called_once_with(
                     thread_id="thread-123", role="user", content="Test prompt"
@@ -67,6 +70,19 @@ class TestOpenAIService:
                     thread_id="thread-123", assistant_id="test-assistant-id"
                 )
 
+    def test_generate_planning_invalid_planning(self, service, mock_openai_client):
+        """Test qu'un JSON ne respectant pas le format de planning est rejeté"""
+        with patch.object(service, "_wait_for_completion", return_value="{}"):
+            with patch.object(service, "_parse_response") as mock_parse:
+                mock_parse.return_value = {
+                    "type_tournoi": "round_robin",
+                    "matchs_round_robin": [{"match_id": "rr_1"}],
+                }
+
+                result = service.generate_planning("Test prompt")
+
+                assert result is None
+
     def test_generate_planning_exception(self, service, mock_openai_client):
         """Test de génération de planning avec exception"""
         mock_openai_client.beta.threads.create.side_effect = Exception("API Error")
@@ -0,0 +1,357 @@
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from app.core.http_cache import build_etag
+from app.core.responses import planning_response
+from app.models.models import AITournamentPlanning
+from app.schemas.response import PlanningResponse
+from app.services.database_service import DatabaseService
+from main import app
+from tests.fake_supabase import FakeSupabase
+
+
+class TestPlanningRoutes:
+    """Tests des routes de lecture de planning"""
+
+    @pytest.fixture
+    def client(self):
+        """Client de test FastAPI"""
+        return TestClient(app, base_url="http://localhost")
+
+    @pytest.fixture
+    def planning(self):
+        """Planning de test"""
+        return AITournamentPlanning(
+            id="planning-1",
+            tournament_id="tournament-1",
+            type_tournoi="round_robin",
+            status="generated",
+            planning_data={"type_tournoi": "round_robin"},
+            total_matches=1,
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-01T10:00:00",
+        )
+
+    @pytest.fixture
+    def mock_database_service(self):
+        """Mock du service Database utilisé par les routes"""
+        with patch("app.api.routes.planning.databaseService") as mock_service:
+            yield mock_service
+
+    def test_get_planning_sets_etag(self, client, planning, mock_database_service):
+        """Test que la lecture d'un planning renvoie un ETag"""
+        mock_database_service.getPlanningWithDetailsByPlanningId.return_value = planning
+
+        response = client.get("/api/planning/planning-1")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == build_etag("planning-1", planning.updated_at)
+        assert response.json()["data"]["id"] == "planning-1"
+
+    def test_get_planning_not_modified(self, client, mock_database_service):
+        """Test qu'un If-None-Match valide renvoie 304 sans charger planning_data"""
+        etag = build_etag("planning-1", "2024-01-01T10:00:00")
+        mock_database_service.getPlanningVersionByPlanningId.return_value = {
+            "id": "planning-1",
+            "updated_at": "2024-01-01T10:00:00",
+        }
+
+        response = client.get(
+            "/api/planning/planning-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        mock_database_service.getPlanningWithDetailsByPlanningId.assert_not_called()
+
+    def test_get_planning_stale_etag(self, client, planning, mock_database_service):
+        """Test qu'un ETag périmé renvoie le planning complet"""
+        mock_database_service.getPlanningVersionByPlanningId.return_value = {
+            "id": "planning-1",
+            "updated_at": "2024-01-01T10:00:00",
+        }
+        mock_database_service.getPlanningWithDetailsByPlanningId.return_value = planning
+
+        response = client.get(
+            "/api/planning/planning-1", headers={"If-None-Match": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        mock_database_service.getPlanningWithDetailsByPlanningId.assert_called_once()
+
+    def test_get_planning_by_tournament_not_modified(
+        self, client, mock_database_service
+    ):
+        """Test du 304 sur la lecture par tournoi"""
+        etag = build_etag("planning-1", "2024-01-01T10:00:00")
+        mock_database_service.getPlanningVersionByTournamentId.return_value = {
+            "id": "planning-1",
+            "updated_at": "2024-01-01T10:00:00",
+        }
+
+        response = client.get(
+            "/api/planning/tournament/tournament-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        mock_database_service.getPlanningWithDetailsByTournamentId.assert_not_called()
+
+    def test_fast_response_matches_planning_response(self, planning):
+        """Test que le chemin orjson produit le même JSON que PlanningResponse"""
+        expected = PlanningResponse(
+            success=True, message="Planning récupéré avec succès", data=planning
+        ).model_dump(mode="json")
+
+        response = planning_response("Planning récupéré avec succès", planning)
+
+        assert json.loads(response.body) == expected
+
+    def test_get_planning_sparse_fields(self, client, mock_database_service):
+        """Test que fields= est transmis au service et renvoie un planning partiel"""
+        mock_database_service.getPlanningWithDetailsByPlanningId.return_value = {
+            "id": "planning-1",
+            "tournament_id": "tournament-1",
+            "updated_at": "2024-01-01T10:00:00",
+            "status": "generated",
+            "total_matches": 12,
+        }
+
+        response = client.get(
+            "/api/planning/planning-1", params={"fields": "status,total_matches"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["total_matches"] == 12
+        assert "planning_data" not in response.json()["data"]
+        mock_database_service.getPlanningWithDetailsByPlanningId.assert_called_once_with(
+            "planning-1", fields=["status", "total_matches"]
+        )
+
+    def test_get_planning_unknown_fields(self, client, mock_database_service):
+        """Test qu'un champ inconnu est refusé avant tout accès à la base"""
+        response = client.get(
+            "/api/planning/tournament/tournament-1", params={"fields": "status,foo"}
+        )
+
+        assert response.status_code == 400
+        mock_database_service.getPlanningWithDetailsByTournamentId.assert_not_called()
+
+    def test_get_planning_storage_fields_rejected(self, client, mock_database_service):
+        """Test qu'une colonne de stockage (hors champs publics) est refusée"""
+        response = client.get(
+            "/api/planning/planning-1",
+            params={"fields": "status,planning_data_compressed"},
+        )
+
+        assert response.status_code == 400
+        assert "planning_data_compressed" in response.json()["detail"]
+        mock_database_service.getPlanningWithDetailsByPlanningId.assert_not_called()
+
+    def test_get_planning_matches_invalid_cursor(self, client, mock_database_service):
+        """Test qu'un curseur invalide est refusé"""
+        response = client.get(
+            "/api/planning/planning-1/matches", params={"cursor": "pas-un-curseur"}
+        )
+
+        assert response.status_code == 400
+        mock_database_service.getMatchesPage.assert_not_called()
+
+    def test_get_planning_matches_unknown_planning(self, client, mock_database_service):
+        """Test du 404 quand la première page est vide et le planning inexistant"""
+        mock_database_service.getMatchesPage.return_value = {
+            "items": [],
+            "next_cursor": None,
+        }
+        mock_database_service.getPlanningVersionByPlanningId.return_value = None
+
+        response = client.get("/api/planning/planning-1/matches")
+
+        assert response.status_code == 404
+
+    def test_get_planning_by_unknown_tournament_returns_404(self, client):
+        """Test qu'un tournoi sans planning donne 404, y compris depuis le cache négatif"""
+        backend = FakeSupabase()
+        with patch("app.services.database_service.getSupabase") as mock_get_supabase:
+            mock_get_supabase.return_value = backend.client()
+            service = DatabaseService()
+
+        with patch("app.api.routes.planning.databaseService", service):
+            responses = [
+                client.get("/api/planning/tournament/tournament-404") for _ in range(2)
+            ]
+
+        assert [response.status_code for response in responses] == [404, 404]
+        assert responses[1].json()["detail"] == "Planning non trouvé"
+
+    def test_get_planning_statuses(self, client):
+        """Test de la route de lecture groupée des statuts"""
+        with patch("app.api.routes.planning.aiPlanningService") as mock_service:
+            mock_service.getPlanningStatuses.return_value = {
+                "planning-1": "generated",
+                "planning-2": None,
+            }
+
+            response = client.post(
+                "/api/planning/status/batch",
+                json={"planning_ids": ["planning-1", "planning-2"]},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {
+            "planning-1": "generated",
+            "planning-2": None,
+        }
+        mock_service.getPlanningStatuses.assert_called_once_with(
+            ["planning-1", "planning-2"]
+        )
+
+    def test_get_planning_statuses_too_many_ids(self, client):
+        """Test que le nombre d'IDs par requête est borné"""
+        response = client.post(
+            "/api/planning/status/batch",
+            json={"planning_ids": [f"planning-{i}" for i in range(101)]},
+        )
+
+        assert response.status_code == 422
+
+    def test_generate_planning_uses_async_pipeline(self, client, planning):
+        """Test que la génération attend le pipeline asynchrone (boucle non bloquée)"""
+        with patch("app.api.routes.planning.aiPlanningService") as mock_service:
+            mock_service.generatePlanningAsync = AsyncMock(return_value=planning)
+
+            response = client.post(
+                "/api/planning/generate", json={"tournament_id": "tournament-1"}
+            )
+
+        assert response.status_code == 201
+        assert response.json()["data"]["id"] == "planning-1"
+        mock_service.generatePlanningAsync.assert_awaited_once_with("tournament-1")
+        mock_service.generatePlanning.assert_not_called()
+
+    def test_regenerate_planning_uses_async_pipeline(self, client, planning):
+        """Test que la régénération attend le pipeline asynchrone (boucle non bloquée)"""
+        with patch("app.api.routes.planning.aiPlanningService") as mock_service:
+            mock_service.regeneratePlanningAsync = AsyncMock(return_value=planning)
+
+            response = client.post("/api/planning/planning-0/regenerate")
+
+        assert response.status_code == 200
+        assert response.json()["data"]["id"] == "planning-1"
+        mock_service.regeneratePlanningAsync.assert_awaited_once_with("planning-0")
+        mock_service.regeneratePlanning.assert_not_called()
+
+    def test_generate_plannings_bulk_streams_ndjson(self, client, planning):
+        """Test que la génération groupée renvoie une ligne NDJSON par tournoi"""
+
+        async def fake_generate(tournament_ids, concurrency):
+            for tournament_id in tournament_ids:
+                yield tournament_id, planning if tournament_id == "t-1" else None
+
+        with patch("app.api.routes.planning.aiPlanningService") as mock_service:
+            mock_service.generatePlannings = fake_generate
+
+            response = client.post(
+                "/api/planning/generate:bulk",
+                json={"tournament_ids": ["t-1", "t-2", "t-1"]},
+            )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [line["tournament_id"] for line in lines] == ["t-1", "t-2"]
+        assert lines[0]["success"] is True
+        assert lines[0]["data"]["id"] == "planning-1"
+        assert lines[1]["success"] is False
+
+    def test_get_planning_compressed_body_cached(
+        self, client, planning, mock_database_service
+    ):
+        """Test qu'un planning compressé est resservi depuis le cache sans rechargement"""
+        planning.planning_data = {"commentaires": "x" * 5000}
+        mock_database_service.getPlanningWithDetailsByPlanningId.return_value = planning
+        mock_database_service.getPlanningVersionByPlanningId.return_value = {
+            "id": "planning-1",
+            "updated_at": planning.updated_at,
+        }
+
+        first = client.get(
+            "/api/planning/planning-1", headers={"Accept-Encoding": "gzip"}
+        )
+        second = client.get(
+            "/api/planning/planning-1", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert second.headers["content-encoding"] == "gzip"
+        assert first.json() == second.json()
+        assert second.json()["data"]["planning_data"] == planning.planning_data
+        mock_database_service.getPlanningWithDetailsByPlanningId.assert_called_once()
+
+    def test_get_status_long_poll(self, client):
+        """Test que wait= délègue à l'attente de changement de statut"""
+        with patch(
+            "app.api.routes.planning.aiPlanningService.waitForStatusChange",
+            new=AsyncMock(return_value="validated"),
+        ) as mock_wait:
+            response = client.get(
+                "/api/planning/planning-1/status",
+                params={"wait": "generated", "timeout": 10},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "validated"
+        mock_wait.assert_awaited_once_with("planning-1", "generated", 10.0)
+
+    def test_get_status_long_poll_timeout_too_long(self, client):
+        """Test qu'un timeout au-delà du maximum est refusé"""
+        response = client.get(
+            "/api/planning/planning-1/status",
+            params={"wait": "generated", "timeout": 3600},
+        )
+
+        assert response.status_code == 422
+
+    def test_live_feed_sends_snapshot(self, client, planning):
+        """Test que le direct WebSocket envoie un snapshot à la connexion"""
+        with patch(
+            "app.services.live_feed_service.tournamentFeedHub.databaseService",
+            new_callable=AsyncMock,
+        ) as mock_service:
+            mock_service.getPlanningVersionByTournamentId.return_value = {
+                "id": "planning-1",
+                "updated_at": "2024-01-01T10:00:00",
+            }
+            mock_service.getPlanningWithDetailsByPlanningId.return_value = planning
+            mock_service.getPlanningMatches.return_value = []
+
+            with client.websocket_connect(
+                "ws://localhost/api/planning/tournament/tournament-1/live"
+            ) as websocket:
+                message = websocket.receive_json()
+
+        assert message["type"] == "snapshot"
+        assert message["tournament_id"] == "tournament-1"
+        assert message["planning"]["id"] == "planning-1"
+        assert message["matches"] == []
+
+    def test_live_feed_closes_on_load_error(self, client):
+        """Test qu'une erreur de lecture de l'état ferme le WebSocket (code 1011)"""
+        with patch(
+            "app.services.live_feed_service.tournamentFeedHub.databaseService",
+            new_callable=AsyncMock,
+        ) as mock_service:
+            mock_service.getPlanningVersionByTournamentId.side_effect = Exception(
+                "DB down"
+            )
+
+            with client.websocket_connect(
+                "ws://localhost/api/planning/tournament/tournament-1/live"
+            ) as websocket:
+                with pytest.raises(WebSocketDisconnect) as disconnect:
+                    websocket.receive_json()
+
+        assert disconnect.value.code == 1011
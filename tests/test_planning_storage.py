@@ -0,0 +1,54 @@
+import pytest
+
+from app.core.planning_storage import decode_planning_data, encode_planning_data
+from app.core.responses import planning_payload
+from app.models.models import AITournamentPlanning
+
+
+class TestPlanningStorage:
+    """Tests du stockage compressé de planning_data"""
+
+    @pytest.fixture
+    def planning_data(self):
+        return {
+            "type_tournoi": "round_robin",
+            "matchs_round_robin": [{"match_id": f"rr_{n}"} for n in range(50)],
+            "commentaires": "Équipes réparties",
+        }
+
+    def test_round_trip_gzip(self, planning_data):
+        """Test qu'une valeur gzip se décompresse en JSON identique"""
+        value = encode_planning_data(planning_data, "gzip")
+
+        assert value.startswith("gzip:")
+        assert decode_planning_data(value) == planning_data
+
+    def test_zstd_falls_back_to_available_encoding(self, planning_data):
+        """Test que zstd (optionnel) donne toujours une valeur décodable"""
+        value = encode_planning_data(planning_data, "zstd")
+
+        assert value.split(":", 1)[0] in ("zstd", "gzip")
+        assert decode_planning_data(value) == planning_data
+
+    def test_unknown_encoding(self):
+        """Test qu'un encodage inconnu est refusé"""
+        with pytest.raises(ValueError):
+            decode_planning_data("lz4:AAAA")
+
+    def test_decompressed_only_on_demand(self, planning_data):
+        """Test que le modèle garde la forme compressée et la réponse le JSON"""
+        planning = AITournamentPlanning(
+            id="planning-1",
+            tournament_id="tournament-1",
+            type_tournoi="round_robin",
+            planning_data_compressed=encode_planning_data(planning_data, "gzip"),
+        )
+
+        assert planning.planning_data == {}
+        assert planning.get_planning_data() == planning_data
+        assert planning.planning_data == {}
+        assert "planning_data_compressed" not in planning.model_dump()
+
+        payload = planning_payload(planning)
+        assert payload["planning_data"] == planning_data
+        assert "planning_data_compressed" not in payload
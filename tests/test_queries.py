@@ -0,0 +1,38 @@
+import pytest
+
+from app.core.queries import (
+    TEAM_NAMES,
+    TOURNAMENT_WITH_TEAMS,
+    QueryCatalogue,
+    queries,
+)
+
+
+class TestQueryCatalogue:
+    """Tests du catalogue des lectures Supabase"""
+
+    def test_every_query_lists_its_columns(self):
+        """Test qu'aucune lecture du catalogue ne demande toutes les colonnes"""
+        for query in queries:
+            assert "*" not in query.columns
+            assert query.columns
+
+    def test_resolve_from_url_parameters(self):
+        """Test de l'identification d'une requête par table et colonnes"""
+        assert queries.resolve("team", "id,name") is TEAM_NAMES
+        assert queries.resolve("tournament", TOURNAMENT_WITH_TEAMS.columns) is (
+            TOURNAMENT_WITH_TEAMS
+        )
+        assert queries.resolve("team", "notes") is None
+
+    def test_register_rejects_star_and_duplicates(self):
+        """Test que le catalogue refuse "*" et les déclarations en double"""
+        catalogue = QueryCatalogue()
+        catalogue.register("team.names", "team", "id,name")
+
+        with pytest.raises(ValueError):
+            catalogue.register("team.all", "team", "*")
+        with pytest.raises(ValueError):
+            catalogue.register("team.names", "team", "id")
+        with pytest.raises(ValueError):
+            catalogue.register("team.ids_and_names", "team", "id,name")
@@ -0,0 +1,58 @@
+import pytest
+
+from app.core.row_diff import DuplicateKeyError, diff_rows
+
+
+class TestDiffRows:
+    """Tests de la comparaison de deux versions de lignes"""
+
+    def test_classifies_rows_by_key(self):
+        """Test des lignes ajoutées, modifiées, supprimées et inchangées"""
+        previous = [
+            {"key": "a", "value": 1},
+            {"key": "b", "value": 2},
+            {"key": "c", "value": 3},
+        ]
+        current = [
+            {"key": "a", "value": 1},
+            {"key": "b", "value": 20},
+            {"key": "d", "value": 4},
+        ]
+
+        diff = diff_rows(previous, current, "key")
+
+        assert diff.inserts == [{"key": "d", "value": 4}]
+        assert diff.updates == [{"key": "b", "value": 20}]
+        assert diff.deletes == ["c"]
+        assert diff.unchanged == ["a"]
+        assert diff.changed == [{"key": "d", "value": 4}, {"key": "b", "value": 20}]
+        assert diff.replaced == ["b", "c"]
+
+    def test_comparable_ignores_version_columns(self):
+        """Test que seules les colonnes de contenu sont comparées"""
+        previous = [{"key": "a", "id": "old", "value": 1}]
+        current = [{"key": "a", "id": "new", "value": 1}]
+
+        diff = diff_rows(previous, current, "key", lambda row: {"value": row["value"]})
+
+        assert diff.unchanged == ["a"]
+        assert not diff
+
+    def test_identical_versions_have_no_changes(self):
+        """Test qu'une version identique ne produit aucune écriture"""
+        rows = [{"key": "a", "value": 1}]
+
+        diff = diff_rows(rows, [dict(row) for row in rows], "key")
+
+        assert not diff
+        assert diff.changed == [] and diff.replaced == []
+
+    def test_duplicate_keys_rejected(self):
+        """Test qu'une clé en double (base ou nouvelle version) n'est pas écrasée"""
+        rows = [{"key": "a", "value": 1}]
+        duplicated = [{"key": "a", "value": 1}, {"key": "a", "value": 2}]
+
+        with pytest.raises(DuplicateKeyError):
+            diff_rows(duplicated, rows, "key")
+        with pytest.raises(DuplicateKeyError):
+            diff_rows(rows, duplicated, "key")
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from app.core.server import get_server_config, get_worker_count
+
+
+class TestServerConfig:
+    """Tests de la configuration uvicorn"""
+
+    def test_development_config(self):
+        """Test qu'en développement on garde un seul processus avec reload"""
+        config = get_server_config("development", "127.0.0.1", 8003)
+
+        assert config["reload"] is True
+        assert "workers" not in config
+
+    def test_other_environment_without_reload(self):
+        """Test qu'un environnement autre que development ne recharge pas"""
+        config = get_server_config("staging", "127.0.0.1", 8003)
+
+        assert "reload" not in config
+        assert "workers" not in config
+
+    def test_production_config(self, monkeypatch):
+        """Test du profil de production"""
+        monkeypatch.setenv("WEB_CONCURRENCY", "3")
+
+        with patch("app.core.server.has_module", return_value=True):
+            config = get_server_config("production", "0.0.0.0", 8003)
+
+        assert "reload" not in config
+        assert config["workers"] == 3
+        assert config["loop"] == "uvloop"
+        assert config["http"] == "httptools"
+        assert config["timeout_graceful_shutdown"] > 120
+
+    def test_production_config_without_optional_modules(self):
+        """Test du repli sur asyncio/h11 si uvloop et httptools sont absents"""
+        with patch("app.core.server.has_module", return_value=False):
+            config = get_server_config("production", "0.0.0.0", 8003)
+
+        assert config["loop"] == "asyncio"
+        assert config["http"] == "h11"
+
+    def test_worker_count_defaults_to_available_cores(self, monkeypatch):
+        """Test qu'un worker est lancé par cœur disponible"""
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+
+        with patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+            assert get_worker_count() == 4
@@ -0,0 +1,127 @@
+from app.core.metrics import metrics
+from app.core.team_index import (
+    TeamIndex,
+    cache_team_index,
+    cached_team_index,
+    embedded_team_fingerprint,
+    invalidate_team_index,
+    load_team_index,
+    normalize_team_name,
+    team_fingerprint,
+)
+from tests.fake_supabase import FakeSupabase
+
+
+class TestTeamIndex:
+    """Tests de l'index des équipes d'un tournoi"""
+
+    ROWS = [
+        {"id": "team-1", "name": "Les Éclairs", "updated_at": "2024-06-01T10:00:00"},
+        {"id": "team-2", "name": "Tigres", "updated_at": "2024-06-02T10:00:00"},
+        {"id": "team-3", "name": "Ours", "updated_at": None},
+    ]
+
+    def test_normalize_team_name(self):
+        """Test de la normalisation (accents, casse, espaces)"""
+        assert normalize_team_name("  Les   ÉCLAIRS ") == "les eclairs"
+        assert normalize_team_name("Équipe 1") == normalize_team_name("equipe 1")
+
+    def test_fingerprint(self):
+        """Test de l'empreinte: nombre de lignes et dernier updated_at"""
+        assert team_fingerprint(self.ROWS) == (3, "2024-06-02T10:00:00")
+        assert team_fingerprint([]) == (0, None)
+
+    def test_embedded_fingerprint(self):
+        """Test de l'empreinte lue avec le tournoi (queries.TEAM_FINGERPRINT)"""
+        row = {
+            "id": "tournament-1",
+            "team_count": [{"count": 3}],
+            "team_latest": [{"updated_at": "2024-06-02T10:00:00"}],
+        }
+
+        assert embedded_team_fingerprint(row) == team_fingerprint(self.ROWS)
+        assert embedded_team_fingerprint(
+            {"team_count": [{"count": 0}], "team_latest": []}
+        ) == (0, None)
+
+    def test_from_rows(self):
+        """Test de la construction depuis des lignes d'équipes"""
+        index = TeamIndex.from_rows(self.ROWS)
+
+        assert index == {"Les Éclairs": "team-1", "Tigres": "team-2", "Ours": "team-3"}
+        assert index.count == 3
+        assert [team.name for team in index.teams] == ["Les Éclairs", "Tigres", "Ours"]
+        assert index.fingerprint == (3, "2024-06-02T10:00:00")
+
+    def test_resolve(self):
+        """Test de la résolution exacte puis par nom normalisé"""
+        index = TeamIndex.from_rows(self.ROWS)
+
+        assert index.resolve("Tigres") == "team-2"
+        assert index.resolve("les eclairs") == "team-1"
+        assert index.resolve("winner_1") is None
+        assert index.resolve("") is None
+
+
+class TestTeamIndexCache:
+    """Index en cache revalidé par empreinte (backend simulé)"""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def backend(self):
+        return FakeSupabase(
+            {
+                "tournament": [{"id": "tournament-1"}],
+                "team": [
+                    {
+                        "id": "team-2",
+                        "name": "Équipe 2",
+                        "tournament_id": "tournament-1",
+                        "updated_at": "2024-06-01T11:00:00+00:00",
+                    },
+                    {
+                        "id": "team-1",
+                        "name": "Équipe 1",
+                        "tournament_id": "tournament-1",
+                        "updated_at": "2024-06-01T10:00:00+00:00",
+                    },
+                ],
+            }
+        )
+
+    def test_cached_index_checked_against_fingerprint(self):
+        """Test qu'un index en cache n'est rendu que si l'empreinte correspond"""
+        index = cache_team_index("tournament-1", [], (0, None))
+
+        assert cached_team_index("tournament-1", (0, None)) is index
+        assert cached_team_index("tournament-1", (1, None)) is None
+        invalidate_team_index("tournament-1")
+        assert cached_team_index("tournament-1", (0, None)) is None
+
+        assert metrics.get("cache.team_index.hits") == 1
+        assert metrics.get("cache.team_index.stale") == 1
+        assert metrics.get("cache.team_index.misses") == 1
+
+    def test_load_reads_teams_only_when_fingerprint_changes(self):
+        """Test que seule l'empreinte est relue tant que les équipes ne changent pas"""
+        backend = self.backend()
+        client = backend.client()
+
+        first = load_team_index(client, "tournament-1")
+        second = load_team_index(client, "tournament-1")
+
+        assert second is first
+        assert [team.id for team in first.teams] == ["team-1", "team-2"]
+        assert first.fingerprint == (2, "2024-06-01T11:00:00+00:00")
+        assert backend.calls() == [
+            ("GET", "tournament"),
+            ("GET", "team"),
+            ("GET", "tournament"),
+        ]
+
+        backend.tables["team"].pop()
+        backend.requests.clear()
+
+        assert load_team_index(client, "tournament-1") == {"Équipe 2": "team-2"}
+        assert backend.calls() == [("GET", "tournament"), ("GET", "team")]
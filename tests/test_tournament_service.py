@@ -56,67 +56,27 @@ class TestTournamentService:
         }
 
     def test_get_tournament_by_id_success(
-        self, service, mock_get_supabase, mock_tournament_data
+        self, service, mock_get_supabase, mock_tournament_data, mock_team_data
     ):
         """Test de récupération d'un tournoi par ID avec succès"""
         mock_get_supabase_func, mock_client, mock_table = mock_get_supabase
 
         tournament_id = "550e8400-e29b-41d4-a716-446655440000"
 
-        # Créer un objet simple qui simule la réponse de Supabase
-        class MockSupabaseResponse:
-            def __init__(self, data):
-                self.data = data
-
-                # Créer un mock qui retourne directement les bonnes données
-
-        def mock_execute(*args, **kwargs):
-            return MockSupabaseResponse(mock_tournament_data)
-
-        def mock_single(*args, **kwargs):
-            return type("MockSingle", (), {"execute": mock_execute})()
-
-        def mock_eq(*args, **kwargs):
-            return type("MockEq", (), {"single": mock_single})()
-
-        def mock_select(*args, **kwargs):
-            return type("MockSelect", (), {"eq": mock_eq})()
-
-        def mock_table(*args, **kwargs):
-            return type("MockTable", (), {"select": mock_select})()
-
-        # Configurer le mock client pour retourner les bonnes données
-        def table_side_effect(table_name):
-            if table_name == "tournament":
-                return mock_table()
-            elif table_name == "team":
-                # Mock pour les équipes (vide)
-                def mock_teams_execute(*args, **kwargs):
-                    return MockSupabaseResponse([])
-
-                def mock_teams_order(*args, **kwargs):
-                    return type("MockOrder", (), {"execute": mock_teams_execute})()
-
-                def mock_teams_eq(*args, **kwargs):
-                    return type("MockEq", (), {"order": mock_teams_order})()
-
-                def mock_teams_select(*args, **kwargs):
-                    return type("MockSelect", (), {"eq": mock_teams_eq})()
-
-                def mock_teams_table(*args, **kwargs):
-                    return type("MockTable", (), {"select": mock_teams_select})()
-
-                return mock_teams_table()
-            return MagicMock()
-
-        mock_client.table.side_effect = table_side_effect
+        # Équipes embarquées dans la ligne du tournoi
+        mock_result = Mock()
+        mock_result.data = {**mock_tournament_data, "team": [mock_team_data]}
+        mock_client.table.return_value.select.return_value.eq.return_value.order.return_value.single.return_value.execute.return_value = (
+            mock_result
+        )
 
         result = service.getTournamentById(tournament_id)
 
         assert result is not None
         assert result.name == "Tournoi Test"
         assert result.tournament_type == "round_robin"
-        assert result.registered_teams == 0
+        assert result.registered_teams == 1
+        mock_client.table.assert_called_once_with("tournament")
 
     def test_get_tournament_by_id_not_found(self, service, mock_get_supabase):
         """Test de récupération d'un tournoi inexistant"""
@@ -135,8 +95,11 @@ class TestTournamentService:
         def mock_single():
             return type("MockSingle", (), {"execute": mock_execute})()
 
+        def mock_order(*args, **kwargs):
+            return type("MockOrder", (), {"single": mock_single})()
+
         def mock_eq(*args):
-            return type("MockEq", (), {"single": mock_single})()
+            return type("MockEq", (), {"order": mock_order})()
 
         def mock_select(*args):
             return type("MockSelect", (), {"eq": mock_eq})()
@@ -267,58 +230,17 @@ class TestTournamentService:
     def test_get_tournament_with_teams_success(
         self, service, mock_get_supabase, mock_tournament_data, mock_team_data
     ):
-        """Test de récupération d'un tournoi avec ses équipes"""
+        """Test de récupération d'un tournoi avec ses équipes en une requête"""
         mock_get_supabase_func, mock_client, mock_table = mock_get_supabase
 
         tournament_id = "550e8400-e29b-41d4-a716-446655440000"
 
-        class MockSupabaseResponse:
-            def __init__(self, data):
-                self.data = data
-
-        # Configurer les mocks pour retourner les bonnes structures
-        def table_side_effect(table_name):
-            if table_name == "tournament":
-                # Mock pour la requête tournoi
-                def mock_execute(*args, **kwargs):
-                    return MockSupabaseResponse(mock_tournament_data)
-
-                def mock_single(*args, **kwargs):
-                    return type("MockSingle", (), {"execute": mock_execute})()
-
-                def mock_eq(*args, **kwargs):
-                    return type("MockEq", (), {"single": mock_single})()
-
-                def mock_select(*args, **kwargs):
-                    return type("MockSelect", (), {"eq": mock_eq})()
-
-                def mock_table(*args, **kwargs):
-                    return type("MockTable", (), {"select": mock_select})()
-
-                return mock_table()
-
-            elif table_name == "team":
-                # Mock pour la requête équipes
-                def mock_execute(*args, **kwargs):
-                    return MockSupabaseResponse([mock_team_data])
-
-                def mock_order(*args, **kwargs):
-                    return type("MockOrder", (), {"execute": mock_execute})()
-
-                def mock_eq(*args, **kwargs):
-                    return type("MockEq", (), {"order": mock_order})()
-
-                def mock_select(*args, **kwargs):
-                    return type("MockSelect", (), {"eq": mock_eq})()
-
-                def mock_table(*args, **kwargs):
-                    return type("MockTable", (), {"select": mock_select})()
-
-                return mock_table()
-
-            return MagicMock()
-
-        mock_client.table.side_effect = table_side_effect
+        mock_result = Mock()
+        mock_result.data = {**mock_tournament_data, "team": [mock_team_data]}
+        mock_query = mock_client.table.return_value.select.return_value
+        mock_query.eq.return_value.order.return_value.single.return_value.execute.return_value = (
+            mock_result
+        )
 
         result = service.getTournamentWithTeams(tournament_id)
 
@@ -326,6 +248,17 @@ class TestTournamentService:
         assert "tournament" in result
         assert "teams" in result
         assert result["teams_count"] == 1
+        assert result["tournament"].registered_teams == 1
+        assert result["teams"][0].name == "Équipe Test"
+
+        # Une seule requête: tournoi + équipes embarquées, colonnes projetées
+        mock_client.table.assert_called_once_with("tournament")
+        [select] = mock_client.table.return_value.select.call_args.args
+        assert "team(" in select
+        assert "*" not in select
+        mock_query.eq.return_value.order.assert_called_once_with(
+            "name", foreign_table="team"
+        )
 
     def test_get_tournament_with_teams_no_tournament(self, service, mock_get_supabase):
         """Test de récupération d'un tournoi inexistant avec équipes"""
@@ -337,18 +270,16 @@ class TestTournamentService:
         mock_select = Mock()
         mock_eq = Mock()
         mock_single = Mock()
-        mock_execute = Mock()
 
         mock_result = Mock()
         mock_result.data = None
-        mock_execute.return_value = mock_result
 
         def table_side_effect(table_name):
             mock_table = Mock()
             mock_table.select.return_value = mock_select
             mock_select.eq.return_value = mock_eq
-            mock_eq.single.return_value = mock_single
-            mock_single.execute.return_value = mock_execute
+            mock_eq.order.return_value.single.return_value = mock_single
+            mock_single.execute.return_value = mock_result
             return mock_table
 
         mock_client.table.side_effect = table_side_effect
@@ -365,45 +296,11 @@ class TestTournamentService:
 
         tournament_id = "550e8400-e29b-41d4-a716-446655440000"
 
-        # Mock de la requête tournoi
-        mock_tournament_select = Mock()
-        mock_tournament_eq = Mock()
-        mock_tournament_single = Mock()
-        mock_tournament_execute = Mock()
-
-        # Mock de la requête équipes vide
-        mock_teams_select = Mock()
-        mock_teams_eq = Mock()
-        mock_teams_order = Mock()
-        mock_teams_execute = Mock()
-
-        # Configurer les chaînes de mocks
-        mock_tournament_result = Mock()
-        mock_tournament_result.data = mock_tournament_data
-        mock_tournament_execute.return_value = mock_tournament_result
-
-        mock_teams_result = Mock()
-        mock_teams_result.data = []
-        mock_teams_execute.return_value = mock_teams_result
-
-        def table_side_effect(table_name):
-            if table_name == "tournament":
-                mock_table = Mock()
-                mock_table.select.return_value = mock_tournament_select
-                mock_tournament_select.eq.return_value = mock_tournament_eq
-                mock_tournament_eq.single.return_value = mock_tournament_single
-                mock_tournament_single.execute.return_value = mock_tournament_execute
-                return mock_table
-            elif table_name == "team":
-                mock_table = Mock()
-                mock_table.select.return_value = mock_teams_select
-                mock_teams_select.eq.return_value = mock_teams_eq
-                mock_teams_eq.order.return_value = mock_teams_order
-                mock_teams_order.execute.return_value = mock_teams_execute
-                return mock_table
-            return Mock()
-
-        mock_client.table.side_effect = table_side_effect
+        mock_result = Mock()
+        mock_result.data = {**mock_tournament_data, "team": []}
+        mock_client.table.return_value.select.return_value.eq.return_value.order.return_value.single.return_value.execute.return_value = (
+            mock_result
+        )
 
         result = service.getTournamentWithTeams(tournament_id)
 
@@ -0,0 +1,89 @@
+import asyncio
+
+from app.core.metrics import metrics
+from app.core.unit_of_work import (
+    current_unit_of_work,
+    fetch_once,
+    fetch_once_async,
+    remember,
+    unit_of_work,
+    unit_of_work_scope,
+)
+
+
+class TestUnitOfWork:
+    """Tests de l'identity map par traitement"""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_fetch_once_in_scope(self):
+        """Test qu'une même clé n'est chargée qu'une fois dans une unité de travail"""
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return {"id": "tournament-1"}
+
+        with unit_of_work():
+            first = fetch_once("tournament", "tournament-1", loader)
+            second = fetch_once("tournament", "tournament-1", loader)
+
+        assert first is second
+        assert len(loads) == 1
+        assert metrics.get("unit_of_work.hits") == 1
+
+    def test_fetch_once_without_scope(self):
+        """Test que hors unité de travail chaque appel recharge la valeur"""
+        loads = []
+
+        fetch_once("team", "tournament-1", lambda: loads.append(1))
+        fetch_once("team", "tournament-1", lambda: loads.append(1))
+
+        assert len(loads) == 2
+        assert current_unit_of_work() is None
+
+    def test_failed_load_not_remembered(self):
+        """Test qu'une lecture en erreur sera retentée"""
+        with unit_of_work():
+            try:
+                fetch_once("tournament", "t-1", lambda: 1 / 0)
+            except ZeroDivisionError:
+                pass
+            assert fetch_once("tournament", "t-1", lambda: "ok") == "ok"
+
+    def test_nested_scopes_share_rows(self):
+        """Test qu'un traitement imbriqué réutilise l'unité de travail englobante"""
+
+        @unit_of_work_scope
+        def inner():
+            return fetch_once("tournament", "t-1", lambda: "reloaded")
+
+        with unit_of_work():
+            remember("tournament", "t-1", "cached")
+            assert inner() == "cached"
+
+        assert current_unit_of_work() is None
+
+    def test_async_scopes_are_isolated(self):
+        """Test que deux traitements concurrents ont chacun leur unité de travail"""
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            await asyncio.sleep(0)
+            return len(loads)
+
+        @unit_of_work_scope
+        async def handle():
+            first = await fetch_once_async("team", "t-1", loader)
+            second = await fetch_once_async("team", "t-1", loader)
+            assert first == second
+            return first
+
+        async def main():
+            return await asyncio.gather(handle(), handle())
+
+        asyncio.run(main())
+
+        assert len(loads) == 2